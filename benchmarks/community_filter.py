@@ -0,0 +1,88 @@
+"""Benchmark structured output community filtering.
+
+Filters the communities of a generated route table against a number of deny patterns, once by
+calling `re.match()` for every pattern (as hyperglass did prior to precompiling patterns), and
+once with the compiled `CommunityMatcher`, memoized per unique community as route tables are.
+
+Usage:
+    python benchmarks/community_filter.py --patterns 200 --routes 10000 --communities 30
+"""
+
+# Standard Library
+import re
+import time
+import random
+import argparse
+import typing as t
+
+# Project
+from hyperglass.models.config.structured import CommunityMatcher
+
+
+def generate_patterns(count: int) -> t.List[str]:
+    """Generate a mix of literal and regular expression patterns."""
+    patterns = []
+    for index in range(count):
+        asn = 64512 + index
+        if index % 2 == 0:
+            patterns.append(f"{asn}:")
+        else:
+            patterns.append(f"^{asn}:(1|2)[0-9]{{2}}$")
+    return patterns
+
+
+def generate_routes(routes: int, communities: int) -> t.List[t.List[str]]:
+    """Generate community lists for a number of routes, drawn from a shared pool."""
+    rand = random.Random(0)
+    pool = [f"{rand.randint(64000, 65535)}:{rand.randint(0, 999)}" for _ in range(5000)]
+    return [rand.sample(pool, communities) for _ in range(routes)]
+
+
+def filter_legacy(patterns: t.List[str], routes: t.List[t.List[str]]) -> int:
+    """Filter communities with a `re.match()` call per pattern."""
+    allowed = 0
+    for communities in routes:
+        for community in communities:
+            valid = True
+            for pattern in patterns:
+                if re.match(pattern, community):
+                    valid = False
+                    break
+            allowed += valid
+    return allowed
+
+
+def filter_compiled(patterns: t.List[str], routes: t.List[t.List[str]]) -> int:
+    """Filter communities with a compiled matcher, memoized per unique community."""
+    matcher = CommunityMatcher(patterns)
+    cache: t.Dict[str, bool] = {}
+    allowed = 0
+    for communities in routes:
+        for community in communities:
+            if community not in cache:
+                cache[community] = not matcher(community)
+            allowed += cache[community]
+    return allowed
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--patterns", type=int, default=200)
+    parser.add_argument("--routes", type=int, default=10_000)
+    parser.add_argument("--communities", type=int, default=30)
+    args = parser.parse_args()
+
+    patterns = generate_patterns(args.patterns)
+    routes = generate_routes(args.routes, args.communities)
+    print(f"{args.patterns} patterns, {args.routes} routes, {args.communities} communities each")
+    print(f"{'filter':<10}{'seconds':>12}{'allowed':>12}")
+    for name, func in (("legacy", filter_legacy), ("compiled", filter_compiled)):
+        start = time.perf_counter()
+        allowed = func(patterns, routes)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<10}{elapsed:>12.3f}{allowed:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Benchmark startup configuration validation.
+
+Generates a configuration with a number of devices, some addressed by hostname and some with
+avatars, then validates it as hyperglass does at startup (without a configuration snapshot), and
+reports the time taken by each step. Device avatars are validated twice, to show the effect of
+avatars already processed by a previous startup.
+
+Requires a running Redis server, as hyperglass itself does.
+
+Usage:
+    python benchmarks/config_validation.py --devices 5000 --hostnames 500 --avatars 20
+"""
+
+# Standard Library
+import time
+import typing as t
+import argparse
+import tempfile
+from pathlib import Path
+
+# Third Party
+from PIL import Image
+
+# Project
+from hyperglass.state import use_state
+from hyperglass.settings import Settings
+from hyperglass.configuration import validate
+from hyperglass.defaults.directives import init_builtin_directives
+
+DEVICE = """
+  - name: Router {index}
+    address: {address}
+    platform: {platform}
+    credential:
+      username: hyperglass
+      password: hyperglass
+    attrs:
+      source4: 192.0.2.1
+      source6: 2001:db8::1
+"""
+
+PLATFORMS = ("juniper", "arista_eos", "cisco_ios", "cisco_xr", "frr", "bird", "mikrotik_routeros")
+
+
+def write_config(directory: Path, *, devices: int, hostnames: int, avatars: int) -> None:
+    """Write a configuration with generated devices & avatar images."""
+    (directory / "config.yaml").write_text("org_name: Benchmark\n")
+    images = []
+    for index in range(avatars):
+        path = directory / f"avatar{index}.png"
+        Image.new("RGB", (1024, 768), color=(index * 10 % 256, 64, 128)).save(path)
+        images.append(path)
+
+    with (directory / "devices.yaml").open("w") as f:
+        f.write("devices:\n")
+        for index in range(devices):
+            # `localhost` is resolvable everywhere; each name is still resolved separately.
+            address = "localhost" if index < hostnames else f"192.0.2.{index % 254 + 1}"
+            f.write(
+                DEVICE.format(
+                    index=index, address=address, platform=PLATFORMS[index % len(PLATFORMS)]
+                )
+            )
+            if images:
+                f.write(f"    avatar: {images[index % len(images)]}\n")
+
+
+def timed(func: t.Callable[[], t.Any]) -> t.Tuple[t.Any, float]:
+    """Call a function and get its result and runtime."""
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=5000)
+    parser.add_argument("--hostnames", type=int, default=500)
+    parser.add_argument("--avatars", type=int, default=20)
+    args = parser.parse_args()
+
+    state = use_state()
+    with tempfile.TemporaryDirectory() as directory:
+        Settings.app_path = Path(directory)
+        write_config(
+            Settings.app_path,
+            devices=args.devices,
+            hostnames=args.hostnames,
+            avatars=args.avatars,
+        )
+        print(f"{args.devices} devices, {args.hostnames} hostnames, {args.avatars} avatars")
+        print(f"{'step':<16}{'seconds':>12}")
+
+        _, elapsed = timed(validate.init_files)
+        params, elapsed = timed(validate.init_params)
+        print(f"{'params':<16}{elapsed:>12.3f}")
+        directives, elapsed = timed(lambda: init_builtin_directives() + validate.init_directives())
+        print(f"{'directives':<16}{elapsed:>12.3f}")
+        state.cache.set("params", params)
+        state.cache.set("directives", directives)
+
+        for run in ("devices", "devices (warm)"):
+            devices, elapsed = timed(lambda: validate.init_devices(directives))
+            print(f"{run:<16}{elapsed:>12.3f}")
+
+        _, elapsed = timed(lambda: validate.init_ui_params(params=params, devices=devices))
+        print(f"{'ui params':<16}{elapsed:>12.3f}")
+    state.clear()
+
+
+if __name__ == "__main__":
+    main()
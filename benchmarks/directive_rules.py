@@ -0,0 +1,102 @@
+"""Benchmark directive rule matching.
+
+Validates query targets against a directive with a large number of IP rules, once by evaluating
+each rule in order (as hyperglass did prior to compiling rules), and once with the directive's
+compiled `RuleEngine`.
+
+Usage:
+    python benchmarks/directive_rules.py --rules 2000 --targets 10000
+"""
+
+# Standard Library
+import time
+import random
+import argparse
+import typing as t
+from ipaddress import ip_network
+
+# Project
+from hyperglass.models.directive import Directive
+from hyperglass.exceptions.private import InputValidationError
+
+
+def generate_rules(count: int) -> t.List[t.Dict[str, t.Any]]:
+    """Generate IPv4 & IPv6 rules of varying prefix lengths, with a catch-all pattern rule."""
+    rand = random.Random(0)
+    rules = []
+    for index in range(count):
+        if index % 4 == 3:
+            address = f"2001:db8:{rand.randint(0, 0xFFFF):x}::/{rand.randint(32, 48)}"
+        else:
+            address = f"{rand.randint(1, 223)}.{rand.randint(0, 255)}.0.0/{rand.randint(8, 24)}"
+        rules.append(
+            {
+                "condition": str(ip_network(address, strict=False)),
+                "action": "deny" if index % 10 == 0 else "permit",
+                "command": "show route {target}",
+            }
+        )
+    rules.append({"condition": "*", "command": "show route community {target}"})
+    return rules
+
+
+def generate_targets(count: int) -> t.List[str]:
+    """Generate IPv4 host targets."""
+    rand = random.Random(1)
+    return [
+        f"{rand.randint(1, 223)}.{rand.randint(0, 255)}.{rand.randint(0, 255)}.1"
+        for _ in range(count)
+    ]
+
+
+def match_ordered(directive: Directive, targets: t.List[str]) -> int:
+    """Evaluate each rule in order."""
+    permitted = 0
+    for target in targets:
+        for rule in directive.rules:
+            try:
+                if rule.validate_target(target, multiple=False) is True:
+                    permitted += 1
+                    break
+            except InputValidationError:
+                break
+    return permitted
+
+
+def match_compiled(directive: Directive, targets: t.List[str]) -> int:
+    """Match targets with the compiled rule engine."""
+    permitted = 0
+    for target in targets:
+        try:
+            directive.validate_target(target)
+            permitted += 1
+        except InputValidationError:
+            pass
+    return permitted
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=int, default=2000)
+    parser.add_argument("--targets", type=int, default=10_000)
+    args = parser.parse_args()
+
+    directive = Directive(
+        id="benchmark",
+        name="Benchmark",
+        rules=generate_rules(args.rules),
+        field={"description": "Benchmark"},
+    )
+    targets = generate_targets(args.targets)
+    print(f"{args.rules} rules, {args.targets} targets")
+    print(f"{'matcher':<10}{'seconds':>12}{'permitted':>12}")
+    for name, func in (("ordered", match_ordered), ("compiled", match_compiled)):
+        start = time.perf_counter()
+        permitted = func(directive, targets)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<10}{elapsed:>12.3f}{permitted:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Benchmark the streaming Juniper XML route parser against a DOM-based parser.
+
+Builds a large fixture by repeating the `rt` elements of `.samples/juniper_route_aspath.xml`,
+then parses it in a fresh process with each parser and reports elapsed time and peak memory
+growth. The DOM-based parser is the previous implementation: scrub every line, build a complete
+`xmltodict` document, convert all keys, and validate the whole table at once.
+
+Requires a running Redis server, since parsed routes are validated against configuration
+parameters in hyperglass's state.
+
+Usage:
+    python benchmarks/juniper_parser.py --routes 100000
+"""
+
+# Standard Library
+import re
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+from pathlib import Path
+
+SAMPLE = Path(__file__).parent.parent / ".samples" / "juniper_route_aspath.xml"
+
+
+def build_fixture(path: Path, routes: int) -> int:
+    """Write a response with at least `routes` rt elements, and return the actual count."""
+    sample = SAMPLE.read_text()
+    head, rest = sample.split("<rt ", 1)
+    body, tail = ("<rt " + rest).rsplit("</rt>", 1)
+    body += "</rt>"
+    per_sample = body.count("<rt ")
+    copies = -(-routes // per_sample)
+    with path.open("w") as f:
+        f.write(head)
+        for _ in range(copies):
+            f.write(body)
+        f.write(tail)
+    return copies * per_sample
+
+
+def parse_dom(response: str):
+    """Parse a response the way hyperglass did prior to the streaming parser."""
+    # Third Party
+    import xmltodict
+
+    # Project
+    from hyperglass.models.parsing.juniper import JuniperBGPTable
+
+    lines = (re.sub(r"\{.+\}", "", line.strip()) for line in response.splitlines())
+    cleaned = "\n".join(line for line in lines if line and line != "\n")
+    parsed = xmltodict.parse(cleaned, force_list=("rt", "rt-entry", "community"))
+    table = parsed["rpc-reply"]["route-information"]["route-table"]
+    return JuniperBGPTable(**table).bgp_table()
+
+
+def parse_stream(response: str):
+    """Parse a response with the streaming parser."""
+    # Project
+    from hyperglass.plugins._builtin.bgp_route_juniper import parse_juniper
+
+    return parse_juniper([response])
+
+
+def run(parser: str, path: Path) -> None:
+    """Parse the fixture with a single parser and print results as JSON."""
+    # Third Party
+    from loguru import logger
+
+    # Project
+    from hyperglass.state import use_state
+    from hyperglass.models.directive import Directives
+    from hyperglass.models.config.params import Params
+
+    logger.remove()
+    state = use_state()
+    state.cache.set("params", Params())
+    state.cache.set("directives", Directives())
+
+    func = {"dom": parse_dom, "stream": parse_stream}[parser]
+    response = path.read_text()
+    # Import everything the parser needs before measuring.
+    func(SAMPLE.read_text())
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    table = func(response)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    result = {"seconds": elapsed, "peak_mib": (peak - baseline) / 1024, "routes": len(table.routes)}
+    print(json.dumps(result))
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--routes", type=int, default=100_000)
+    parser.add_argument("--run", choices=("dom", "stream"), help=argparse.SUPPRESS)
+    parser.add_argument("--fixture", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run is not None:
+        run(args.run, args.fixture)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        fixture = Path(directory) / "juniper_routes.xml"
+        count = build_fixture(fixture, args.routes)
+        size = fixture.stat().st_size / 1024**2
+        print(f"{count} rt elements, {size:.1f} MiB")
+        print(f"{'parser':<10}{'seconds':>12}{'peak growth (MiB)':>20}{'routes':>10}")
+        for name in ("dom", "stream"):
+            result = subprocess.run(
+                [sys.executable, __file__, "--run", name, "--fixture", str(fixture)],
+                capture_output=True,
+                check=True,
+                text=True,
+            )
+            data = json.loads(result.stdout.strip().splitlines()[-1])
+            print(
+                f"{name:<10}{data['seconds']:>12.2f}{data['peak_mib']:>20.1f}{data['routes']:>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
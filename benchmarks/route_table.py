@@ -0,0 +1,148 @@
+"""Benchmark memory usage and throughput of model-based and compact route tables.
+
+Builds a route table from generated routes, shaped like a large AS path query response (long AS
+paths, many communities shared between routes), then exports it to JSON. Reports the memory
+held by the table once built, the time taken to build it, and the best time taken to export it.
+
+- `model` constructs a `BGPRoute` model per route, in a `BGPRouteTable`
+- `compact` fills a `CompactRouteTable`, as the built-in parsers do
+
+Requires a running Redis server, since parsed routes are filtered against configuration
+parameters in hyperglass's state.
+
+Usage:
+    python benchmarks/route_table.py --routes 10000 100000 --repeat 5
+"""
+
+# Standard Library
+import gc
+import time
+import random
+import argparse
+import tracemalloc
+import typing as t
+
+# Third Party
+from loguru import logger
+
+# Project
+from hyperglass.state import use_state
+from hyperglass.models.data import BGPRouteTable, CompactRouteTable
+from hyperglass.models.data.bgp_route import BGPRoute
+from hyperglass.models.config.params import Params
+
+
+def generate_routes(count: int) -> t.List[t.Dict[str, t.Any]]:
+    """Generate route data as parsers produce it."""
+    rand = random.Random(0)
+    communities = [f"{rand.randint(64512, 65534)}:{rand.randint(0, 999)}" for _ in range(200)]
+    next_hops = [f"192.0.2.{i}" for i in range(1, 9)]
+    routes = []
+    for index in range(count):
+        routes.append(
+            {
+                "prefix": f"{10 + index // 65536 % 200}.{index // 256 % 256}.{index % 256}.0/24",
+                "active": index % 4 == 0,
+                "age": rand.randint(0, 10_000_000),
+                "weight": 170,
+                "med": rand.randint(0, 1000),
+                "local_preference": 100,
+                "as_path": [rand.randint(1, 400_000) for _ in range(rand.randint(3, 12))],
+                "communities": rand.sample(communities, rand.randint(5, 30)),
+                "next_hop": rand.choice(next_hops),
+                "source_as": 65000,
+                "source_rid": "192.0.2.1",
+                "peer_rid": rand.choice(next_hops),
+                "rpki_state": 3,
+            }
+        )
+    return routes
+
+
+def build_model(routes: t.List[t.Dict[str, t.Any]]) -> BGPRouteTable:
+    """Build a table of route models, without validating each route again."""
+    return BGPRouteTable.model_construct(
+        vrf="default",
+        count=len(routes),
+        routes=[BGPRoute.model_construct(**route) for route in routes],
+        winning_weight="low",
+    )
+
+
+def build_compact(routes: t.List[t.Dict[str, t.Any]]) -> CompactRouteTable:
+    """Build a compact table."""
+    return CompactRouteTable.from_parsed(
+        vrf="default", count=len(routes), routes=routes, winning_weight="low"
+    )
+
+
+def copy_routes(routes: t.List[t.Dict[str, t.Any]]) -> t.List[t.Dict[str, t.Any]]:
+    """Copy route data, so a table doesn't share lists or strings with the generated data."""
+    return [
+        {
+            **route,
+            "prefix": "".join(route["prefix"]),
+            "as_path": list(route["as_path"]),
+            "communities": ["".join(c) for c in route["communities"]],
+        }
+        for route in routes
+    ]
+
+
+def measure(
+    build: t.Callable[[t.List[t.Dict[str, t.Any]]], t.Any],
+    routes: t.List[t.Dict[str, t.Any]],
+    repeat: int,
+) -> t.Dict[str, float]:
+    """Measure memory held by a built table, and the time taken to build & export it."""
+    data = copy_routes(routes)
+    gc.collect()
+    start = time.perf_counter()
+    table = build(data)
+    built = time.perf_counter() - start
+
+    # Route data is released once a table is built, so it isn't held while the table is exported.
+    del data
+    gc.collect()
+    exported = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        table.export_json()
+        exported = min(exported, time.perf_counter() - start)
+    del table
+
+    # Memory is measured separately, since tracing allocations slows everything down.
+    data = copy_routes(routes)
+    gc.collect()
+    tracemalloc.start()
+    table = build(data)
+    del data
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return {"mib": held / 1024**2, "build": built, "export": exported}
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--routes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5, help="Exports timed per table")
+    args = parser.parse_args()
+
+    logger.remove()
+    use_state().cache.set("params", Params())
+
+    print(f"{'routes':>8}{'table':>10}{'held (MiB)':>14}{'build (s)':>12}{'export (s)':>12}")
+    for count in args.routes:
+        routes = generate_routes(count)
+        for name, build in (("model", build_model), ("compact", build_compact)):
+            result = measure(build, routes, args.repeat)
+            print(
+                f"{count:>8}{name:>10}{result['mib']:>14.1f}"
+                f"{result['build']:>12.2f}{result['export']:>12.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
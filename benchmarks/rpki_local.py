@@ -0,0 +1,96 @@
+"""Benchmark local RPKI validation from a VRP file.
+
+Generates a VRP export in rpki-client's JSON format, loads it, and validates a number of
+random prefix/origin pairs. About half of the pairs are covered by a VRP, and of those, about
+half have a matching origin ASN.
+
+Usage:
+    python benchmarks/rpki_local.py --vrps 500000 --pairs 1000000
+"""
+
+# Standard Library
+import json
+import time
+import random
+import argparse
+import tempfile
+import typing as t
+from pathlib import Path
+from ipaddress import IPv4Network, IPv6Network, ip_network
+
+# Project
+from hyperglass.external.vrp import VRPTable, read_vrps
+
+Pair = t.Tuple[t.Union[IPv4Network, IPv6Network], int]
+
+
+def generate_vrps(count: int, rand: random.Random) -> t.List[t.Dict[str, t.Any]]:
+    """Generate VRPs for IPv4 /16-/24 and IPv6 /32-/48 prefixes."""
+    vrps = []
+    for index in range(count):
+        asn = rand.randint(1, 400_000)
+        if index % 4 == 0:
+            length = rand.randint(32, 48)
+            address = rand.getrandbits(length) << (128 - length)
+            prefix = IPv6Network((address, length))
+            max_length = min(length + rand.choice((0, 0, 4, 8)), 128)
+        else:
+            length = rand.randint(16, 24)
+            address = rand.getrandbits(length) << (32 - length)
+            prefix = IPv4Network((address, length))
+            max_length = min(length + rand.choice((0, 0, 0, 2)), 32)
+        vrps.append({"asn": asn, "prefix": str(prefix), "maxLength": max_length, "ta": "bench"})
+    return vrps
+
+
+def generate_pairs(
+    vrps: t.List[t.Dict[str, t.Any]], count: int, rand: random.Random
+) -> t.List[Pair]:
+    """Generate prefix/origin pairs to validate."""
+    pairs = []
+    for _ in range(count):
+        if rand.random() < 0.5:
+            vrp = rand.choice(vrps)
+            asn = vrp["asn"] if rand.random() < 0.5 else rand.randint(1, 400_000)
+            pairs.append((ip_network(vrp["prefix"]), asn))
+        else:
+            length = rand.randint(16, 24)
+            pairs.append((IPv4Network((rand.getrandbits(length) << (32 - length), length)), 65000))
+    return pairs
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vrps", type=int, default=500_000)
+    parser.add_argument("--pairs", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rand = random.Random(0)
+    vrps = generate_vrps(args.vrps, rand)
+    pairs = generate_pairs(vrps, args.pairs, rand)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "vrps.json"
+        path.write_text(json.dumps({"metadata": {}, "roas": vrps}))
+        start = time.perf_counter()
+        table = VRPTable(read_vrps(path))
+        loaded = time.perf_counter() - start
+
+    print(f"Loaded {table.count} VRPs in {loaded:.2f}s")
+
+    states = [0, 0, 0]
+    start = time.perf_counter()
+    for prefix, asn in pairs:
+        states[table.state(prefix, asn)] += 1
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"Validated {len(pairs)} pairs in {elapsed:.2f}s "
+        f"({elapsed / len(pairs) * 1e6:.2f}µs per pair)"
+    )
+    print(f"valid={states[1]} invalid={states[0]} not found={states[2]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Benchmark worker time-to-ready and memory usage, with and without preloading.
+
+Generates a configuration with a number of devices, starts hyperglass once with regular uvicorn
+workers and once with `HYPERGLASS_PRELOAD=true`, and reports:
+
+- Time until the first successful API response
+- Time until every worker has finished starting (CPU time is no longer increasing)
+- RSS, USS, and PSS of each worker. Memory shared copy-on-write with the preloading process
+  counts toward RSS, but not USS; PSS divides shared memory evenly between processes.
+
+Requires a running Redis server and NodeJS, as hyperglass itself does.
+
+Usage:
+    python benchmarks/worker_startup.py --devices 1000 --workers 4
+"""
+
+# Standard Library
+import os
+import sys
+import time
+import typing as t
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+# Third Party
+import httpx
+import psutil
+
+DEVICE = """
+  - name: Router {index}
+    address: 192.0.2.{octet}
+    platform: juniper
+    credential:
+      username: hyperglass
+      password: hyperglass
+    attrs:
+      source4: 192.0.2.1
+      source6: 2001:db8::1
+"""
+
+
+def write_config(directory: Path, devices: int) -> None:
+    """Write a configuration with `devices` devices."""
+    (directory / "config.yaml").write_text("org_name: Benchmark\n")
+    with (directory / "devices.yaml").open("w") as f:
+        f.write("devices:\n")
+        for index in range(devices):
+            f.write(DEVICE.format(index=index, octet=index % 254 + 1))
+
+
+def workers_of(process: psutil.Process) -> t.List[psutil.Process]:
+    """Get all worker processes, excluding the multiprocessing resource tracker."""
+    return [
+        p
+        for p in process.children(recursive=True)
+        if not any("resource_tracker" in arg for arg in p.cmdline())
+    ]
+
+
+def wait_ready(
+    url: str, process: psutil.Process, workers: int, timeout: int
+) -> t.Tuple[float, float]:
+    """Wait for the first successful response, then for all workers to go idle."""
+    start = time.perf_counter()
+    first = None
+    while first is None:
+        if time.perf_counter() - start > timeout:
+            raise TimeoutError("hyperglass did not start within {} seconds".format(timeout))
+        try:
+            if httpx.get(url, timeout=1).status_code == 200:
+                first = time.perf_counter() - start
+        except httpx.HTTPError:
+            time.sleep(0.05)
+
+    previous = None
+    while True:
+        children = workers_of(process)
+        cpu = tuple(sum(p.cpu_times()[:2]) for p in children)
+        if len(children) == workers and cpu == previous:
+            return first, time.perf_counter() - start - 0.25
+        previous = cpu
+        time.sleep(0.25)
+
+
+def run(
+    *, app_path: Path, workers: int, preload: bool, port: int, timeout: int
+) -> t.Dict[str, t.Any]:
+    """Start hyperglass and measure worker startup."""
+    env = {
+        **os.environ,
+        "HYPERGLASS_APP_PATH": str(app_path),
+        "HYPERGLASS_DISABLE_UI": "true",
+        "HYPERGLASS_HOST": "127.0.0.1",
+        "HYPERGLASS_PORT": str(port),
+        "HYPERGLASS_PRELOAD": str(preload).lower(),
+    }
+    command = [sys.executable, "-m", "hyperglass.console", "start", "--workers", str(workers)]
+    proc = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        process = psutil.Process(proc.pid)
+        first, ready = wait_ready(f"http://127.0.0.1:{port}/api/info", process, workers, timeout)
+        memory = [p.memory_full_info() for p in workers_of(process)]
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+    mib = 1024**2
+    return {
+        "first": first,
+        "ready": ready,
+        "rss": sum(m.rss for m in memory) / len(memory) / mib,
+        "uss": sum(m.uss for m in memory) / len(memory) / mib,
+        "pss": sum(m.pss for m in memory) / len(memory) / mib,
+    }
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--timeout", type=int, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        app_path = Path(directory)
+        write_config(app_path, args.devices)
+        print(f"{args.devices} devices, {args.workers} workers")
+        print(
+            f"{'mode':<10}{'first (s)':>12}{'ready (s)':>12}"
+            f"{'RSS (MiB)':>12}{'USS (MiB)':>12}{'PSS (MiB)':>12}"
+        )
+        for preload in (False, True):
+            result = run(
+                app_path=app_path,
+                workers=args.workers,
+                preload=preload,
+                port=args.port,
+                timeout=args.timeout,
+            )
+            print(
+                f"{'preload' if preload else 'spawn':<10}"
+                f"{result['first']:>12.2f}{result['ready']:>12.2f}"
+                f"{result['rss']:>12.1f}{result['uss']:>12.1f}{result['pss']:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
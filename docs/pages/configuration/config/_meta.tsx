@@ -1,6 +1,7 @@
 export default {
     "api-docs": "API Docs",
     caching: "Caching",
+    dns: "DNS",
     logging: "Logging & Webhooks",
     messages: "Messages",
     "structured-output": "Structured Output",
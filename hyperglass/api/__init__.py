@@ -1,7 +1,7 @@
 """hyperglass API."""
 
 # Standard Library
-import logging
+import typing as t
 
 # Third Party
 from litestar import Litestar
@@ -15,58 +15,77 @@ from hyperglass.constants import __version__
 from hyperglass.exceptions import HyperglassError
 
 # Local
-from .events import check_redis
-from .routes import info, query, device, devices, queries
+from .admin import admin_router
+from .events import check_redis, stop_parse_workers, stop_device_sessions
+from .routes import info, query, device, devices, queries, ui_props, device_directives
 from .middleware import COMPRESSION_CONFIG, create_cors_config
 from .error_handlers import app_handler, http_handler, default_handler, validation_handler
 
-__all__ = ("app",)
-
-STATE = use_state()
-
-UI_DIR = STATE.settings.static_path / "ui"
-IMAGES_DIR = STATE.settings.static_path / "images"
-
-
-OPEN_API = OpenAPIConfig(
-    title=STATE.params.docs.title.format(site_title=STATE.params.site_title),
-    version=__version__,
-    description=STATE.params.docs.description,
-    path=STATE.params.docs.path,
-    root_schema_site="elements",
-)
-
-HANDLERS = [
-    device,
-    devices,
-    queries,
-    info,
-    query,
-]
-
-if not STATE.settings.disable_ui:
-    HANDLERS = [
-        *HANDLERS,
-        create_static_files_router(
-            path="/images", directories=[IMAGES_DIR], name="images", include_in_schema=False
-        ),
-        create_static_files_router(
-            path="/", directories=[UI_DIR], name="ui", html_mode=True, include_in_schema=False
-        ),
+__all__ = ("app", "create_app")
+
+
+def create_app() -> Litestar:
+    """Create the hyperglass application from configuration state."""
+    state = use_state()
+
+    ui_dir = state.settings.static_path / "ui"
+    images_dir = state.settings.static_path / "images"
+
+    open_api = OpenAPIConfig(
+        title=state.params.docs.title.format(site_title=state.params.site_title),
+        version=__version__,
+        description=state.params.docs.description,
+        path=state.params.docs.path,
+        root_schema_site="elements",
+    )
+
+    handlers = [
+        device,
+        device_directives,
+        devices,
+        queries,
+        info,
+        ui_props,
+        query,
     ]
 
+    if state.settings.admin_key is not None:
+        handlers = [*handlers, admin_router]
+
+    if not state.settings.disable_ui:
+        handlers = [
+            *handlers,
+            create_static_files_router(
+                path="/images", directories=[images_dir], name="images", include_in_schema=False
+            ),
+            create_static_files_router(
+                path="/", directories=[ui_dir], name="ui", html_mode=True, include_in_schema=False
+            ),
+        ]
+
+    return Litestar(
+        route_handlers=handlers,
+        exception_handlers={
+            HTTPException: http_handler,
+            HyperglassError: app_handler,
+            ValidationException: validation_handler,
+            Exception: default_handler,
+        },
+        on_startup=[check_redis],
+        on_shutdown=[stop_parse_workers, stop_device_sessions],
+        debug=state.settings.debug,
+        cors_config=create_cors_config(state=state),
+        compression_config=COMPRESSION_CONFIG,
+        openapi_config=open_api if state.params.docs.enable else None,
+    )
+
+
+def __getattr__(name: str) -> t.Any:
+    """Create the application once it's first used, rather than when the package is imported.
 
-app = Litestar(
-    route_handlers=HANDLERS,
-    exception_handlers={
-        HTTPException: http_handler,
-        HyperglassError: app_handler,
-        ValidationException: validation_handler,
-        Exception: default_handler,
-    },
-    on_startup=[check_redis],
-    debug=STATE.settings.debug,
-    cors_config=create_cors_config(state=STATE),
-    compression_config=COMPRESSION_CONFIG,
-    openapi_config=OPEN_API if STATE.params.docs.enable else None,
-)
+    Configuration state needn't exist to import API modules (for example, in tests).
+    """
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
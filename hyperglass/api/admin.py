@@ -0,0 +1,94 @@
+"""Administrative API Routes."""
+
+# Standard Library
+import typing as t
+import asyncio
+import secrets
+
+# Third Party
+from litestar import Router, get, post, delete
+from litestar.di import Provide
+from litestar.exceptions import ValidationException, NotAuthorizedException
+
+# Project
+from hyperglass.log import log
+from hyperglass.exceptions import HyperglassError
+from hyperglass.state import QueryCache, use_state
+from hyperglass.state.cache import CacheStats, CacheEntryMeta
+from hyperglass.configuration.reload import reload_user_config
+
+# Local
+from .state import get_query_cache
+
+if t.TYPE_CHECKING:
+    # Third Party
+    from litestar.connection import ASGIConnection
+    from litestar.handlers.base import BaseRouteHandler
+
+__all__ = ("admin_router",)
+
+
+def admin_guard(connection: "ASGIConnection", _: "BaseRouteHandler") -> None:
+    """Ensure requests to administrative routes carry the configured admin key."""
+    settings = use_state().settings
+    if settings.admin_key is None:
+        raise NotAuthorizedException()
+
+    scheme, _, token = connection.headers.get("authorization", "").partition(" ")
+    expected = settings.admin_key.get_secret_value()
+
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token, expected):
+        log.bind(path=connection.url.path).warning("Unauthorized administrative request")
+        raise NotAuthorizedException()
+
+
+@get("/cache")
+async def cache_stats(query_cache: QueryCache, top: int = 10) -> CacheStats:
+    """Retrieve query cache statistics."""
+    return query_cache.stats(top=top)
+
+
+@get("/cache/entries")
+async def cache_entries(
+    query_cache: QueryCache,
+    device: t.Optional[str] = None,
+    directive: t.Optional[str] = None,
+    target: t.Optional[str] = None,
+) -> t.List[CacheEntryMeta]:
+    """List query cache entries, optionally filtered by device, directive, or target prefix."""
+    return query_cache.entries(device=device, directive=directive, target=target)
+
+
+@delete("/cache", status_code=200)
+async def cache_evict(
+    query_cache: QueryCache,
+    device: t.Optional[str] = None,
+    directive: t.Optional[str] = None,
+    target: t.Optional[str] = None,
+) -> t.Dict[str, int]:
+    """Evict query cache entries, optionally filtered by device, directive, or target prefix."""
+    evicted = query_cache.evict(device=device, directive=directive, target=target)
+    log.bind(device=device, directive=directive, target=target, evicted=evicted).info(
+        "Evicted cache entries"
+    )
+    return {"evicted": evicted}
+
+
+@post("/reload", status_code=200)
+async def config_reload() -> t.Dict[str, t.Any]:
+    """Reload changed configuration files without restarting."""
+    try:
+        result = await asyncio.to_thread(reload_user_config)
+    except HyperglassError as err:
+        # The current configuration remains in use.
+        raise ValidationException(detail=str(err)) from err
+    return {"changed": result.changed, **result._asdict()}
+
+
+admin_router = Router(
+    path="/api/admin",
+    route_handlers=[cache_stats, cache_entries, cache_evict, config_reload],
+    dependencies={"query_cache": Provide(get_query_cache)},
+    guards=[admin_guard],
+    include_in_schema=False,
+)
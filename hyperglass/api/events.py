@@ -8,11 +8,23 @@ from litestar import Litestar
 
 # Project
 from hyperglass.state import use_state
+from hyperglass.plugins._executor import shutdown_parse_pool
+from hyperglass.execution.drivers._session import shutdown_session_pool
 
-__all__ = ("check_redis",)
+__all__ = ("check_redis", "stop_parse_workers", "stop_device_sessions")
 
 
 async def check_redis(_: Litestar) -> t.NoReturn:
     """Ensure Redis is running before starting server."""
     cache = use_state("cache")
     cache.check()
+
+
+async def stop_parse_workers(_: Litestar) -> None:
+    """Stop parse worker processes, if any were started."""
+    shutdown_parse_pool()
+
+
+async def stop_device_sessions(_: Litestar) -> None:
+    """Stop device session threads once their sessions finish."""
+    shutdown_session_pool()
@@ -7,13 +7,18 @@ import typing as t
 from litestar.config.cors import CORSConfig
 from litestar.config.compression import CompressionConfig
 
+# Local
+from .precomputed import PRECOMPUTED_OPT
+
 if t.TYPE_CHECKING:
     # Project
     from hyperglass.state import HyperglassState
 
 __all__ = ("create_cors_config", "COMPRESSION_CONFIG")
 
-COMPRESSION_CONFIG = CompressionConfig(backend="brotli", brotli_gzip_fallback=True)
+COMPRESSION_CONFIG = CompressionConfig(
+    backend="brotli", brotli_gzip_fallback=True, exclude_opt_key=PRECOMPUTED_OPT
+)
 
 REQUEST_LOG_MESSAGE = "REQ"
 RESPONSE_LOG_MESSAGE = "RES"
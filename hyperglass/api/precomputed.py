@@ -0,0 +1,115 @@
+"""Response bodies serialized & compressed once per configuration version."""
+
+# Standard Library
+import gzip
+import typing as t
+import hashlib
+import weakref
+
+# Third Party
+import brotli
+from litestar import Request, Response
+from litestar.serialization import encode_json
+
+__all__ = ("PRECOMPUTED_OPT", "PrecomputedBody", "Precomputed")
+
+# Route handler option used to exclude precomputed responses from response compression, since
+# they're already compressed.
+PRECOMPUTED_OPT = "precomputed"
+
+# Clients may cache responses, but must revalidate them, since configuration can be reloaded at
+# any time. Revalidation is cheap: an unchanged response is a bodiless 304.
+CACHE_CONTROL = "public, no-cache"
+
+# Supported content codings, in order of preference.
+ENCODINGS = ("br", "gzip")
+
+
+def _accepted_encodings(accept_encoding: str) -> t.Set[str]:
+    """Get the content codings accepted by a client, from its `Accept-Encoding` header."""
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = params.strip().partition("=")[2] if params.strip().startswith("q=") else "1"
+        try:
+            if float(quality) > 0:
+                accepted.add(coding.strip().lower())
+        except ValueError:
+            continue
+    return accepted
+
+
+def _etags(if_none_match: str) -> t.Set[str]:
+    """Get entity tags from an `If-None-Match` header. Weak tags match by opaque value."""
+    return {tag.strip().removeprefix("W/") for tag in if_none_match.split(",") if tag.strip()}
+
+
+class PrecomputedBody(t.NamedTuple):
+    """A JSON response body, with each of its compressed variants."""
+
+    # Representations by content coding; `identity` is the uncompressed body.
+    content: t.Dict[str, bytes]
+    # Strong entity tags by content coding, as each coding is a distinct representation.
+    etags: t.Dict[str, str]
+
+    @classmethod
+    def new(cls, data: t.Any) -> "PrecomputedBody":
+        """Serialize & compress a response body."""
+        identity = encode_json(data)
+        content = {
+            "identity": identity,
+            "br": brotli.compress(identity),
+            # A fixed mtime keeps compressed output (and its entity tag) identical in each process.
+            "gzip": gzip.compress(identity, mtime=0),
+        }
+        digest = hashlib.sha256(identity).hexdigest()[:32]
+        etags = {
+            coding: f'"{digest}"' if coding == "identity" else f'"{digest}-{coding}"'
+            for coding in content
+        }
+        return cls(content=content, etags=etags)
+
+    def response(self, request: Request) -> Response:
+        """Respond with the representation the client prefers, or 304 if it has it already."""
+        accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+        coding = next((c for c in ENCODINGS if c in accepted), "identity")
+        etag = self.etags[coding]
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+
+        if_none_match = _etags(request.headers.get("if-none-match", ""))
+        if etag in if_none_match or "*" in if_none_match:
+            return Response(content=b"", status_code=304, headers=headers)
+
+        if coding != "identity":
+            headers["Content-Encoding"] = coding
+        return Response(content=self.content[coding], media_type="application/json", headers=headers)
+
+
+class Precomputed:
+    """Precomputed response bodies, derived from a configuration object.
+
+    Configuration objects are replaced (rather than modified) when configuration changes, so
+    bodies are computed once for each configuration object and reused until it's replaced.
+    """
+
+    __slots__ = ("_source", "_bodies")
+
+    _source: t.Optional["weakref.ReferenceType[t.Any]"]
+    _bodies: t.Dict[t.Hashable, PrecomputedBody]
+
+    def __init__(self) -> None:
+        """Set up cache."""
+        self._source = None
+        self._bodies = {}
+
+    def get(
+        self, source: t.Any, key: t.Hashable, data: t.Callable[[], t.Any]
+    ) -> PrecomputedBody:
+        """Get a precomputed body for `source`, computing it from `data()` if needed."""
+        if self._source is None or self._source() is not source:
+            self._source = weakref.ref(source)
+            self._bodies = {}
+        body = self._bodies.get(key)
+        if body is None:
+            body = self._bodies[key] = PrecomputedBody.new(data())
+        return body
@@ -4,11 +4,13 @@
 import json
 import time
 import typing as t
-from datetime import UTC, datetime
+from datetime import datetime
 
 # Third Party
-from litestar import Request, Response, get, post
+import msgspec
+from litestar import Request, Response, MediaType, get, post
 from litestar.di import Provide
+from litestar.exceptions import NotFoundException
 from litestar.background_tasks import BackgroundTask
 
 # Project
@@ -16,137 +18,307 @@ from hyperglass.log import log
 from hyperglass.state import HyperglassState
 from hyperglass.exceptions import HyperglassError
 from hyperglass.models.api import Query
+from hyperglass.models.ui import UIParameters, UIDirectiveDetail
 from hyperglass.models.data import OutputDataModel
+from hyperglass.models.data.bgp_route import prefix_sort_key
 from hyperglass.util.typing import is_type
-from hyperglass.execution.main import execute
+from hyperglass.execution.main import execute, execute_many
 from hyperglass.models.api.response import QueryResponse
 from hyperglass.models.config.params import Params, APIParams
-from hyperglass.models.config.devices import Devices, APIDevice
+from hyperglass.models.config.devices import Device, Devices, APIDevice
 
 # Local
-from .state import get_state, get_params, get_devices
+from .state import get_state, get_params, get_devices, get_ui_params
 from .tasks import send_webhook
 from .fake_output import fake_output
+from .precomputed import PRECOMPUTED_OPT, Precomputed
 
 __all__ = (
     "device",
+    "device_directives",
     "devices",
     "queries",
     "info",
+    "ui_props",
     "query",
 )
 
 
-@get("/api/devices/{id:str}", dependencies={"devices": Provide(get_devices)})
-async def device(devices: Devices, id: str) -> APIDevice:
-    """Retrieve a device by ID."""
-    return devices[id].export_api()
+def encode_output(output: t.Union[OutputDataModel, str]) -> bytes:
+    """Serialize a query's output as the JSON value of a response's `output` field.
+
+    Outputs are cached serialized, so cached responses are served without serializing them again.
+    """
+    if is_type(output, OutputDataModel):
+        return output.export_json().encode()
+    return msgspec.json.encode(str(output))
+
+
+def page_routes(output: bytes, *, offset: int, limit: t.Optional[int]) -> bytes:
+    """Get a page of routes from structured output, along with the total number of routes.
+
+    Only the top level of the output and its list of routes are parsed; routes are copied from the
+    serialized output as-is. Output that isn't paged (no offset or limit), and structured output
+    without routes, are returned unchanged.
+    """
+    if offset == 0 and limit is None:
+        return output
+    table = msgspec.json.decode(output, type=t.Dict[str, msgspec.Raw])
+    if "routes" not in table:
+        return output
+    routes = msgspec.json.decode(table["routes"], type=t.List[msgspec.Raw])
+    end = None if limit is None else offset + limit
+    return msgspec.json.encode(
+        {
+            **table,
+            "routes": routes[offset:end],
+            "total": len(routes),
+            "offset": offset,
+            "limit": limit,
+        }
+    )
 
 
-@get("/api/devices", dependencies={"devices": Provide(get_devices)})
-async def devices(devices: Devices) -> t.List[APIDevice]:
-    """Retrieve all devices."""
-    return devices.export_api()
+def _device(devices: Devices, id: str) -> Device:
+    try:
+        return devices[id]
+    except IndexError as err:
+        raise NotFoundException(f"Device '{id}' not found") from err
 
 
-@get("/api/queries", dependencies={"devices": Provide(get_devices)})
-async def queries(devices: Devices) -> t.List[str]:
-    """Retrieve all directive names."""
-    return devices.directive_names()
+# Device & parameter responses only change when configuration is reloaded, so they're serialized
+# & compressed once per configuration version, and served with entity tags.
+DEVICES = Precomputed()
+PARAMS = Precomputed()
+UI_PARAMS = Precomputed()
 
 
-@get("/api/info", dependencies={"params": Provide(get_params)})
-async def info(params: Params) -> APIParams:
-    """Retrieve looking glass parameters."""
-    return params.export_api()
-
+@get(
+    "/api/devices/{id:str}",
+    dependencies={"devices": Provide(get_devices)},
+    opt={PRECOMPUTED_OPT: True},
+)
+async def device(request: Request, devices: Devices, id: str) -> Response[APIDevice]:
+    """Retrieve a device by ID."""
+    return DEVICES.get(devices, ("device", id), _device(devices, id).export_api).response(request)
 
-@post("/api/query", dependencies={"_state": Provide(get_state)})
-async def query(_state: HyperglassState, request: Request, data: Query) -> QueryResponse:
-    """Ingest request data pass it to the backend application to perform the query."""
 
-    timestamp = datetime.now(UTC)
+@get(
+    "/api/devices/{id:str}/directives",
+    dependencies={"devices": Provide(get_devices)},
+    opt={PRECOMPUTED_OPT: True},
+)
+async def device_directives(
+    request: Request, devices: Devices, id: str
+) -> Response[t.List[UIDirectiveDetail]]:
+    """Retrieve a device's directives, including the details the UI loads once it's selected."""
+    _directives = _device(devices, id).directives
 
-    # Initialize cache
-    cache = _state.redis
+    def export() -> t.List[t.Dict[str, t.Any]]:
+        return [
+            UIDirectiveDetail(**directive.frontend()).export_dict(by_alias=True)
+            for directive in _directives
+        ]
 
-    # Use hashed `data` string as key for for k/v cache store so
-    # each command output value is unique.
-    cache_key = f"hyperglass.query.{data.digest()}"
+    return DEVICES.get(devices, ("directives", id), export).response(request)
 
-    _log = log.bind(query=data.summary())
 
-    _log.info("Starting query execution")
+@get("/api/devices", dependencies={"devices": Provide(get_devices)}, opt={PRECOMPUTED_OPT: True})
+async def devices(request: Request, devices: Devices) -> Response[t.List[APIDevice]]:
+    """Retrieve all devices."""
+    return DEVICES.get(devices, "devices", devices.export_api).response(request)
 
-    cache_response = cache.get_map(cache_key, "output")
-    json_output = False
-    cached = False
-    runtime = 65535
 
-    if cache_response:
-        _log.bind(cache_key=cache_key).debug("Cache hit")
+@get("/api/queries", dependencies={"devices": Provide(get_devices)}, opt={PRECOMPUTED_OPT: True})
+async def queries(request: Request, devices: Devices) -> Response[t.List[str]]:
+    """Retrieve all directive names."""
+    return DEVICES.get(devices, "queries", devices.directive_names).response(request)
 
-        # If a cached response exists, reset the expiration time.
-        cache.expire(cache_key, expire_in=_state.params.cache.timeout)
 
-        cached = True
-        runtime = 0
-        timestamp = cache.get_map(cache_key, "timestamp")
+@get("/api/info", dependencies={"params": Provide(get_params)}, opt={PRECOMPUTED_OPT: True})
+async def info(request: Request, params: Params) -> Response[APIParams]:
+    """Retrieve looking glass parameters."""
+    return PARAMS.get(params, "info", params.export_api).response(request)
 
-    elif not cache_response:
-        _log.bind(cache_key=cache_key).debug("Cache miss")
 
-        timestamp = data.timestamp
+@get(
+    "/api/ui/props",
+    dependencies={"ui_params": Provide(get_ui_params)},
+    opt={PRECOMPUTED_OPT: True},
+    include_in_schema=False,
+)
+async def ui_props(request: Request, ui_params: UIParameters) -> Response[t.Dict[str, t.Any]]:
+    """Retrieve the current UI configuration, which changes when configuration is reloaded."""
+
+    def export() -> t.Dict[str, t.Any]:
+        return ui_params.export_dict(mode="json", by_alias=True)
+
+    return UI_PARAMS.get(ui_params, "ui_props", export).response(request)
+
+
+def _route_identity(route: t.Dict[str, t.Any]) -> str:
+    # Overlapping targets can have the same routes, though their outputs may be parsed (and each
+    # route's age determined) at different times.
+    return json.dumps({k: v for k, v in route.items() if k != "age"}, sort_keys=True)
+
+
+def merge_outputs(
+    targets: t.Sequence[str], outputs: t.Sequence[t.Union[t.Dict[str, t.Any], str, None]]
+) -> t.Union[t.Dict[str, t.Any], str]:
+    """Merge the outputs of a query run separately for each target.
+
+    Structured outputs are merged into a single route table, sorted by prefix, with each route
+    included once. Otherwise, each target's output is a section of the text output. Targets without
+    output are omitted.
+    """
+    if len(targets) == 1:
+        return outputs[0]
+    present = [(target, output) for target, output in zip(targets, outputs) if output is not None]
+    if all(isinstance(output, t.Dict) and "routes" in output for _, output in present):
+        first = present[0][1]
+        unique = {}
+        for _, output in present:
+            for route in output["routes"]:
+                unique.setdefault(_route_identity(route), route)
+        routes = sorted(unique.values(), key=lambda route: prefix_sort_key(route["prefix"]))
+        return {**first, "count": len(routes), "routes": routes}
+    return "\n\n".join(
+        f"{target}\n{output if isinstance(output, str) else json.dumps(output)}"
+        for target, output in present
+    )
 
-        starttime = time.time()
 
-        if _state.params.fake_output:
-            # Return fake, static data for development purposes, if enabled.
-            output = await fake_output(
-                query_type=data.query_type,
-                structured=data.device.structured_output or False,
-            )
+async def run_queries(
+    _state: HyperglassState, queries: t.Sequence[Query]
+) -> t.List[t.Tuple[t.Optional[bytes], datetime, bool, float]]:
+    """Get each query's output from the cache, or execute the queries that aren't cached.
+
+    Returns each query's serialized output, timestamp, whether it was cached, and its runtime in
+    seconds.
+    """
+    cache = _state.query_cache
+    results = [None] * len(queries)
+    missing = []
+    for index, data in enumerate(queries):
+        cache_key = cache.key(data)
+        cache_response = cache.get(data, timeout=_state.params.cache.timeout)
+        if cache_response is not None:
+            log.bind(query=data.summary(), cache_key=cache_key).debug("Cache hit")
+            output, timestamp = cache_response
+            if not isinstance(output, bytes):
+                # Outputs cached by previous versions aren't serialized.
+                output = msgspec.json.encode(output)
+            results[index] = (output, timestamp, True, 0)
         else:
-            # Pass request to execution module
-            output = await execute(data)
+            log.bind(query=data.summary(), cache_key=cache_key).debug("Cache miss")
+            missing.append(index)
 
-        endtime = time.time()
-        elapsedtime = round(endtime - starttime, 4)
-        _log.debug("Runtime: {!s} seconds", elapsedtime)
+    if not missing:
+        return results
 
+    starttime = time.time()
+
+    if _state.params.fake_output:
+        # Return fake, static data for development purposes, if enabled.
+        outputs = [
+            await fake_output(
+                query_type=queries[index].query_type,
+                structured=queries[index].device.structured_output or False,
+            )
+            for index in missing
+        ]
+    elif len(missing) == 1:
+        # Pass request to execution module
+        outputs = [await execute(queries[missing[0]])]
+    else:
+        # Targets not already cached are executed concurrently.
+        outputs = await execute_many([queries[index] for index in missing])
+
+    endtime = time.time()
+    elapsedtime = round(endtime - starttime, 4)
+    log.debug("Runtime: {!s} seconds", elapsedtime)
+
+    for index, output in zip(missing, outputs):
+        data = queries[index]
         if output is None:
-            raise HyperglassError(message=_state.params.messages.general, alert="danger")
+            results[index] = (None, data.timestamp, False, elapsedtime)
+            continue
 
-        json_output = is_type(output, OutputDataModel)
+        cache_response = encode_output(output)
+        cache.set(
+            data,
+            output=cache_response,
+            timestamp=data.timestamp,
+            timeout=_state.params.cache.timeout,
+        )
+        log.bind(query=data.summary(), cache_timeout=_state.params.cache.timeout).debug(
+            "Response cached"
+        )
+        results[index] = (cache_response, data.timestamp, False, elapsedtime)
 
-        if json_output:
-            # Export structured output as JSON string to guarantee value
-            # is serializable, then convert it back to a dict.
-            as_json = output.export_json()
-            raw_output = json.loads(as_json)
-        else:
-            raw_output = str(output)
+    return results
+
+
+@post("/api/query", dependencies={"_state": Provide(get_state)})
+async def query(_state: HyperglassState, request: Request, data: Query) -> Response[QueryResponse]:
+    """Ingest request data pass it to the backend application to perform the query."""
 
-        cache.set_map_item(cache_key, "output", raw_output)
-        cache.set_map_item(cache_key, "timestamp", timestamp)
-        cache.expire(cache_key, expire_in=_state.params.cache.timeout)
+    # Resolve hostname targets and apply input plugins before the query target is used, including
+    # in the cache key.
+    await data.resolve_query_target()
+    await data.apply_input_plugins()
 
-        _log.bind(cache_timeout=_state.params.cache.timeout).debug("Response cached")
+    # Use hashed `data` string as key for for k/v cache store so
+    # each command output value is unique.
+    cache_key = _state.query_cache.key(data)
+
+    _log = log.bind(query=data.summary())
+
+    _log.info("Starting query execution")
+
+    if data.per_target:
+        # Each target is cached & executed separately, and the outputs are merged.
+        queries = data.split_targets()
+        results = await run_queries(_state, queries)
+        outputs = [output for output, *_ in results]
+        cache_response = outputs[0]
+        if len(outputs) > 1 and any(output is not None for output in outputs):
+            # Outputs are merged as data, so each target's output is deserialized.
+            merged = merge_outputs(
+                [q.query_target for q in queries],
+                [None if output is None else msgspec.json.decode(output) for output in outputs],
+            )
+            cache_response = msgspec.json.encode(merged)
+        # The response is as old as its oldest part.
+        timestamp = min(timestamp for _, timestamp, *_ in results)
+        cached = all(cached for *_, cached, _ in results)
+        elapsedtime = max(elapsedtime for *_, elapsedtime in results)
+    else:
+        ((cache_response, timestamp, cached, elapsedtime),) = await run_queries(_state, [data])
 
-        runtime = int(round(elapsedtime, 0))
+    if cache_response is None:
+        raise HyperglassError(message=_state.params.messages.general, alert="danger")
 
-    # If it does, return the cached entry
-    cache_response = cache.get_map(cache_key, "output")
+    runtime = int(round(elapsedtime, 0))
 
-    json_output = is_type(cache_response, t.Dict)
+    # Structured output is serialized as a JSON object; text output as a JSON string.
+    json_output = cache_response.startswith(b"{")
     response_format = "text/plain"
+    output = cache_response
 
     if json_output:
         response_format = "application/json"
+        limits = (data.limit, _state.params.structured.max_routes)
+        output = page_routes(
+            output,
+            offset=data.offset,
+            limit=min((limit for limit in limits if limit is not None), default=None),
+        )
     _log.info("Execution completed")
 
+    # The serialized output is included in the response as-is.
     response = {
-        "output": cache_response,
+        "output": msgspec.Raw(output),
         "id": cache_key,
         "cached": cached,
         "runtime": runtime,
@@ -158,7 +330,8 @@ async def query(_state: HyperglassState, request: Request, data: Query) -> Query
     }
 
     return Response(
-        response,
+        msgspec.json.encode(response),
+        media_type=MediaType.JSON,
         background=BackgroundTask(
             send_webhook,
             params=_state.params,
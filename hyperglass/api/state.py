@@ -25,3 +25,8 @@ async def get_devices():
 async def get_ui_params():
     """Get hyperglass ui_params as FastAPI dependency."""
     return use_state("ui_params")
+
+
+async def get_query_cache():
+    """Get hyperglass query cache as FastAPI dependency."""
+    return use_state("query_cache")
@@ -0,0 +1,78 @@
+# Standard Library
+import typing as t
+import tempfile
+from pathlib import Path
+
+# Third Party
+import pytest
+from litestar.testing import TestClient
+
+# Project
+from hyperglass.state import HyperglassState
+from hyperglass.settings import Settings
+from hyperglass.configuration import init_user_config
+
+DEVICES = """
+devices:
+  - name: Router 1
+    address: 192.0.2.1
+    platform: juniper
+    credential: {username: hyperglass, password: hyperglass}
+    attrs: {source4: 192.0.2.10, source6: "2001:db8::10"}
+    directives: [ping]
+  - name: Router 2
+    address: 192.0.2.2
+    platform: juniper
+    credential: {username: hyperglass, password: hyperglass}
+    attrs: {source4: 192.0.2.10, source6: "2001:db8::10"}
+    directives: [ping, select]
+"""
+
+DIRECTIVES = """
+ping:
+  name: Ping
+  field:
+    description: IP Address
+    validation: ^[0-9.]+$
+  info: INFO_FILE
+  rules:
+    - condition: 0.0.0.0/0
+      command: ping {target}
+select:
+  name: Select
+  field:
+    description: Select
+    options:
+      - value: one
+        description: One
+  rules:
+    - condition: one
+      command: show {target}
+"""
+
+
+@pytest.fixture
+def config(
+    monkeypatch, isolated_state: HyperglassState
+) -> t.Generator[HyperglassState, None, None]:
+    """Load test configuration into isolated state."""
+    with tempfile.TemporaryDirectory() as directory_name:
+        directory = Path(directory_name)
+        monkeypatch.setattr(Settings, "app_path", directory)
+        (directory / "config.yaml").write_text("org_name: Test\n")
+        info_file = directory / "ping.md"
+        info_file.write_text("Ping a target.\n")
+        (directory / "directives.yaml").write_text(DIRECTIVES.replace("INFO_FILE", str(info_file)))
+        (directory / "devices.yaml").write_text(DEVICES)
+        init_user_config(snapshot=False)
+        yield isolated_state
+
+
+@pytest.fixture
+def client(config: HyperglassState) -> t.Generator[TestClient, None, None]:
+    """Provide a test client for the API, with test configuration loaded."""
+    # Project
+    from hyperglass.api import app
+
+    with TestClient(app=app) as _client:
+        yield _client
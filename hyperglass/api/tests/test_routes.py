@@ -0,0 +1,189 @@
+"""Test API routes."""
+
+# Standard Library
+import json
+import typing as t
+import asyncio
+
+# Third Party
+from litestar.testing import TestClient
+
+# Project
+from hyperglass.state import HyperglassState
+from hyperglass.models.api import Query
+
+# Local
+from .. import routes
+from ._fixtures import config, client  # noqa: F401
+
+PRECOMPUTED_PATHS = ("/api/devices", "/api/info", "/api/devices/router_1", "/api/ui/props")
+
+
+def _get(client: TestClient, path: str, encoding: str, etag: t.Optional[str] = None) -> t.Any:
+    headers = {"Accept-Encoding": encoding}
+    if etag is not None:
+        headers["If-None-Match"] = etag
+    return client.get(path, headers=headers)
+
+
+def test_precomputed(client: TestClient):  # noqa: F811
+    for path in PRECOMPUTED_PATHS:
+        identity = _get(client, path, "identity")
+        assert identity.status_code == 200, path
+        assert "content-encoding" not in identity.headers
+        assert identity.headers["cache-control"] == "public, no-cache"
+        assert identity.headers["vary"] == "Accept-Encoding"
+
+        for accept, coding in (
+            ("br", "br"),
+            ("gzip, deflate", "gzip"),
+            ("gzip;q=0.5, br;q=0", "gzip"),
+            ("br;q=0, gzip;q=0", None),
+            ("", None),
+        ):
+            response = _get(client, path, accept)
+            assert response.status_code == 200, (path, accept)
+            # Compressed once, rather than compressed again by compression middleware.
+            assert response.headers.get("content-encoding") == coding, (path, accept)
+            assert response.content == identity.content, (path, accept)
+            # Each representation has its own entity tag.
+            etag = response.headers["etag"]
+            assert (etag == identity.headers["etag"]) is (coding is None), (path, accept)
+
+            # Unchanged representations aren't sent again.
+            unchanged = _get(client, path, accept, etag)
+            assert unchanged.status_code == 304, (path, accept)
+            assert unchanged.content == b""
+            assert unchanged.headers["etag"] == etag
+            assert _get(client, path, accept, f'"other", W/{etag}').status_code == 304
+            assert _get(client, path, accept, "*").status_code == 304
+
+        # A different representation's entity tag doesn't match.
+        br_etag = _get(client, path, "br").headers["etag"]
+        assert _get(client, path, "identity", br_etag).status_code == 200
+
+
+def test_precomputed_invalidation(client: TestClient, config: HyperglassState):  # noqa: F811
+    state = config
+    response = _get(client, "/api/info", "identity")
+    assert response.json()["organization"] == "Test"
+    etag = response.headers["etag"]
+
+    # Replace configuration, as reloading it would.
+    state.redis.set("params", state.params.model_copy(update={"org_name": "Changed"}))
+    state.redis.instance.incr(state.redis.key(("config", "version")))
+
+    response = _get(client, "/api/info", "identity", etag)
+    assert response.status_code == 200
+    assert response.json()["organization"] == "Changed"
+    assert response.headers["etag"] != etag
+    assert _get(client, "/api/info", "identity", response.headers["etag"]).status_code == 304
+
+
+def test_page_routes():
+    prefixes = [{"prefix": f"192.0.2.{i}/32"} for i in range(3)]
+    table = {"vrf": "default", "count": 3, "routes": prefixes}
+    # Routes are copied as they're serialized.
+    output = json.dumps(table, indent=1).encode()
+
+    # Unpaged output is unchanged.
+    assert routes.page_routes(output, offset=0, limit=None) is output
+    no_routes = json.dumps({"vrf": "default"}).encode()
+    assert routes.page_routes(no_routes, offset=1, limit=1) is no_routes
+
+    for offset, limit, expected in ((0, 2, [0, 1]), (1, None, [1, 2]), (2, 5, [2]), (5, 1, [])):
+        page = json.loads(routes.page_routes(output, offset=offset, limit=limit))
+        assert page == {
+            **table,
+            "routes": [table["routes"][i] for i in expected],
+            "total": 3,
+            "offset": offset,
+            "limit": limit,
+        }, (offset, limit)
+
+
+def _route(prefix: str, next_hop: str, age: int = 0) -> t.Dict[str, t.Any]:
+    return {"prefix": prefix, "next_hop": next_hop, "age": age}
+
+
+def test_merge_outputs():
+    first = {
+        "vrf": "default",
+        "count": 2,
+        "routes": [_route("192.0.2.0/24", "a"), _route("10.0.0.0/8", "a")],
+    }
+    second = {
+        "vrf": "default",
+        "count": 2,
+        "routes": [_route("192.0.2.0/24", "a", age=10), _route("192.0.2.0/24", "b")],
+    }
+    merged = routes.merge_outputs(["10.0.0.1", "192.0.2.1", "192.0.2.2"], [first, None, second])
+    # Routes are sorted by prefix, even if an output's routes aren't, and each route is included
+    # once, even if it's in the output of more than one target.
+    assert merged == {
+        "vrf": "default",
+        "count": 3,
+        "routes": [
+            _route("10.0.0.0/8", "a"),
+            _route("192.0.2.0/24", "a"),
+            _route("192.0.2.0/24", "b"),
+        ],
+    }
+
+    # Text outputs are sections, by target.
+    text = routes.merge_outputs(["192.0.2.1", "192.0.2.2", "192.0.2.3"], ["one", None, "three"])
+    assert text == "192.0.2.1\none\n\n192.0.2.3\nthree"
+
+    assert routes.merge_outputs(["192.0.2.1"], ["one"]) == "one"
+
+
+def test_run_queries_partial_cache(monkeypatch, config: HyperglassState):  # noqa: F811
+    state = config
+    executed = []
+
+    async def execute_many(queries):
+        executed.extend(query.query_target for query in queries)
+        return [f"output {query.query_target}" for query in queries]
+
+    monkeypatch.setattr(routes, "execute_many", execute_many)
+    queries = [
+        Query(query_location="router_1", query_type="ping", query_target=target)
+        for target in ("192.0.2.1", "192.0.2.2", "192.0.2.3")
+    ]
+    state.query_cache.set(queries[1], output=b'"cached"', timestamp="cached at", timeout=60)
+
+    results = asyncio.run(routes.run_queries(state, queries))
+
+    # Only the targets that aren't cached are executed, and their outputs are cached.
+    assert executed == ["192.0.2.1", "192.0.2.3"]
+    assert results[1] == (b'"cached"', "cached at", True, 0)
+    for index in (0, 2):
+        output, timestamp, cached, _ = results[index]
+        assert output == f'"output {queries[index].query_target}"'.encode()
+        assert timestamp == queries[index].timestamp
+        assert cached is False
+        assert state.query_cache.get(queries[index], timeout=60) == (output, timestamp)
+
+    executed.clear()
+    results = asyncio.run(routes.run_queries(state, queries))
+    assert executed == []
+    assert all(cached for _, _, cached, _ in results)
+
+
+def test_device_directives(client: TestClient, config: HyperglassState):  # noqa: F811
+    response = client.get("/api/devices/router_2/directives")
+    assert response.status_code == 200
+    details = {directive["id"]: directive for directive in response.json()}
+    assert details["ping"]["info"] == "Ping a target.\n"
+    assert details["ping"]["options"] is None
+    assert details["select"]["options"] == [{"name": None, "description": "One", "value": "one"}]
+
+    for path in ("/api/devices/missing/directives", "/api/devices/missing"):
+        assert client.get(path).status_code == 404, path
+
+    # Details are only loaded for a selected location, rather than with the UI configuration.
+    ui_directives = {d["id"]: d for d in config.ui_params.export_dict(by_alias=True)["directives"]}
+    assert set(ui_directives) == set(details)
+    for directive in ui_directives.values():
+        assert "info" not in directive
+        assert "options" not in directive
@@ -116,16 +116,87 @@ def _system_info():
     echo.plain(table)
 
 
+@cli.command(name="compile-config")
+def _compile_config():
+    """Validate configuration and write a snapshot for faster startup"""
+    # Project
+    from hyperglass.configuration import compile_config
+
+    try:
+        with echo._console.status("Validating configuration...", spinner="aesthetic"):
+            path = compile_config()
+        echo.success("Wrote configuration snapshot to {!s}", path)
+
+    except Exception as err:
+        if not sys.stdout.isatty():
+            echo._console.print_exception(show_locals=True)
+            raise typer.Exit(1)
+
+        echo.error("Error compiling configuration: {!s}", err)
+        raise typer.Exit(1)
+
+
+@cli.command(name="startup-profile")
+def _startup_profile(
+    command: t.Optional[t.List[str]] = typer.Argument(
+        None, help="hyperglass command to profile, e.g. 'devices'"
+    ),
+    module: str = typer.Option("hyperglass.console", help="Module to import, if no command"),
+    top: int = typer.Option(25, help="Number of modules to show"),
+    cumulative: bool = typer.Option(
+        False, "--cumulative", is_flag=True, help="Sort by cumulative import time"
+    ),
+):
+    """Show import time per module for a cold start"""
+    # Standard Library
+    import time
+    import subprocess
+
+    # Third Party
+    from rich.table import Table
+
+    # Local
+    from .util import parse_import_times
+
+    if command:
+        args = [sys.executable, "-X", "importtime", "-m", "hyperglass.console", *command]
+    else:
+        args = [sys.executable, "-X", "importtime", "-c", f"import {module}"]
+
+    start = time.perf_counter()
+    result = subprocess.run(args, capture_output=True, text=True)  # noqa: S603
+    elapsed = time.perf_counter() - start
+
+    times = parse_import_times(result.stderr)
+    if not times:
+        echo.error("Unable to profile startup: {}", result.stderr.strip() or result.returncode)
+        raise typer.Exit(1)
+
+    times.sort(key=lambda i: i[2] if cumulative else i[1], reverse=True)
+    table = Table("Module", "Self (ms)", "Cumulative (ms)", title="Import Times")
+    for name, self_us, cumulative_us in times[:top]:
+        table.add_row(name, f"{self_us / 1000:.1f}", f"{cumulative_us / 1000:.1f}")
+    echo._console.print(table)
+
+    total = sum(i[1] for i in times) / 1e6
+    echo.info(
+        "Imported {} modules in {} seconds ({} seconds total)",
+        len(times),
+        f"{total:.3f}",
+        f"{elapsed:.3f}",
+    )
+
+
 @cli.command(name="clear-cache")
 def _clear_cache():
-    """Clear the Redis cache"""
+    """Clear cached query responses & external data"""
     # Project
     from hyperglass.state import use_state
 
     state = use_state()
 
     try:
-        state.clear()
+        state.clear_cache()
         echo.success("Cleared Redis Cache")
 
     except Exception as err:
@@ -137,6 +208,81 @@ def _clear_cache():
         raise typer.Exit(1)
 
 
+@cli.command(name="cache-stats")
+def _cache_stats(
+    top: int = typer.Option(10, help="Number of top entries to show"),
+):
+    """Show query cache statistics"""
+    # Third Party
+    from rich.table import Table
+
+    # Project
+    from hyperglass.state import use_state
+
+    stats = use_state("query_cache").stats(top=top)
+
+    summary = Table("Metric", "Value")
+    summary.add_row("Keys", str(stats["keys"]))
+    summary.add_row("Total Bytes", str(stats["bytes"]))
+    summary.add_row("Hits", str(stats["hits"]))
+    summary.add_row("Misses", str(stats["misses"]))
+    summary.add_row("Hit Ratio", f"{stats['hit_ratio']:.2%}")
+    echo.plain(summary)
+
+    for title, entries in (("Size", stats["top_by_size"]), ("Hits", stats["top_by_hits"])):
+        table = Table("Device", "Directive", "Target", "Bytes", "Hits", title=f"Top Keys by {title}")
+        for entry in entries:
+            table.add_row(
+                entry["device"],
+                entry["directive"],
+                entry["target"],
+                str(entry["bytes"]),
+                str(entry["hits"]),
+            )
+        echo.plain(table)
+
+
+@cli.command(name="cache-evict")
+def _cache_evict(
+    device: t.Optional[str] = typer.Option(None, help="Evict entries for this device ID"),
+    directive: t.Optional[str] = typer.Option(None, help="Evict entries for this directive ID"),
+    target: t.Optional[str] = typer.Option(
+        None, help="Evict entries whose target is within this prefix or starts with this value"
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", is_flag=True, help="Only show matching entries"
+    ),
+):
+    """Evict matching entries from the query cache"""
+    # Third Party
+    from rich.table import Table
+
+    # Project
+    from hyperglass.state import use_state
+
+    if all(v is None for v in (device, directive, target)):
+        echo.error("At least one of --device, --directive, or --target is required")
+        raise typer.Exit(1)
+
+    query_cache = use_state("query_cache")
+
+    if dry_run:
+        table = Table("Device", "Directive", "Target", "Bytes", "Hits")
+        for entry in query_cache.entries(device=device, directive=directive, target=target):
+            table.add_row(
+                entry["device"],
+                entry["directive"],
+                entry["target"],
+                str(entry["bytes"]),
+                str(entry["hits"]),
+            )
+        echo.plain(table)
+        raise typer.Exit(0)
+
+    evicted = query_cache.evict(device=device, directive=directive, target=target)
+    echo.success("Evicted {} cache entries", evicted)
+
+
 @cli.command(name="devices")
 def _devices(
     search: t.Optional[str] = typer.Argument(None, help="Device ID or Name Search Pattern"),
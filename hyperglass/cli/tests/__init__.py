@@ -0,0 +1 @@
+"""hyperglass.cli tests."""
@@ -0,0 +1,47 @@
+"""Test CLI startup time and imports."""
+
+# Standard Library
+import sys
+import json
+import time
+import subprocess
+
+# Local
+from ..util import parse_import_times
+
+# Modules that should only be imported by the commands that need them.
+HEAVY_MODULES = ("uvicorn", "litestar", "netmiko", "paramiko", "PIL", "psutil", "cpuinfo", "httpx")
+
+# Upper limit, in seconds, of the time it takes to run `hyperglass --version` from a cold start.
+MAX_STARTUP_TIME = 1.5
+
+IMPORT_TIMES = """import time: self [us] | cumulative | imported package
+import time:       150 |        150 |   _io
+import time:      1200 |       4800 | hyperglass.cli
+"""
+
+
+def test_parse_import_times():
+    assert parse_import_times(IMPORT_TIMES) == [("_io", 150, 150), ("hyperglass.cli", 1200, 4800)]
+
+
+def test_cli_imports():
+    code = (
+        "import sys, json; import hyperglass.console; "
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, check=True)
+    assert json.loads(result.stdout) == []
+
+
+def test_cli_startup_time():
+    durations = []
+    for _ in range(3):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "hyperglass.console", "--version"],
+            capture_output=True,
+            check=True,
+        )
+        durations.append(time.perf_counter() - start)
+    assert min(durations) < MAX_STARTUP_TIME, f"CLI startup took {min(durations):.3f}s"
@@ -2,6 +2,7 @@
 
 # Standard Library
 import sys
+import typing as t
 import asyncio
 
 # Third Party
@@ -49,3 +50,17 @@ def build_ui(timeout: int) -> None:
 
         echo.error("Error building UI: {!s}", e)
         raise typer.Exit(1)
+
+
+def parse_import_times(output: str) -> t.List[t.Tuple[str, int, int]]:
+    """Parse the output of `python -X importtime` into (module, self, cumulative) microseconds."""
+    times = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, module = line.removeprefix("import time:").split("|", 2)
+        if not self_us.strip().isdigit():
+            # Skip the header line.
+            continue
+        times.append((module.strip(), int(self_us), int(cumulative_us)))
+    return times
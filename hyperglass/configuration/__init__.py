@@ -2,13 +2,22 @@
 
 # Standard Library
 import typing as t
+from pathlib import Path
 
 # Project
 from hyperglass.state import use_state
 from hyperglass.defaults.directives import init_builtin_directives
 
 # Local
-from .validate import init_files, init_params, init_devices, init_ui_params, init_directives
+from .snapshot import load_snapshot, write_snapshot
+from .validate import (
+    init_files,
+    init_params,
+    init_devices,
+    init_ui_params,
+    init_generation,
+    init_directives,
+)
 
 if t.TYPE_CHECKING:
     # Project
@@ -16,30 +25,73 @@ if t.TYPE_CHECKING:
     from hyperglass.models.config.params import Params
     from hyperglass.models.config.devices import Devices
 
-__all__ = ("init_user_config",)
+__all__ = ("compile_config", "init_user_config")
 
 
 def init_user_config(
     params: t.Optional["Params"] = None,
     directives: t.Optional["Directives"] = None,
     devices: t.Optional["Devices"] = None,
+    *,
+    snapshot: bool = True,
 ) -> None:
-    """Initialize all user configurations and add them to global state."""
+    """Initialize all user configurations and add them to global state.
+
+    If no configuration objects are passed and a configuration snapshot matching the current
+    configuration files exists, the snapshot is loaded instead of validating configuration again.
+    """
     state = use_state()
     init_files()
 
-    _params = params or init_params()
-    builtins = init_builtin_directives()
-    _custom = directives or init_directives()
-    _directives = builtins + _custom
+    _snapshot = None
+    if snapshot and all(i is None for i in (params, directives, devices)):
+        _snapshot = load_snapshot()
+
+    if _snapshot is not None:
+        _params = _snapshot.params
+        _directives = _snapshot.directives
+    else:
+        _params = params or init_params()
+        builtins = init_builtin_directives()
+        _custom = directives or init_directives()
+        _directives = builtins + _custom
+
     with state.cache.pipeline() as pipeline:
         # Write params and directives to the cache first to avoid a race condition where ui_params
         # or devices try to access params or directives before they're available.
         pipeline.set("params", _params)
         pipeline.set("directives", _directives)
 
-    _devices = devices or init_devices()
+    if _snapshot is not None:
+        _devices = _snapshot.devices
+        generation = _snapshot.generation
+    else:
+        _devices = devices or init_devices(_directives, params=_params)
+        generation = init_generation(params=_params, directives=_directives, devices=_devices)
+
+    if _snapshot is not None or devices is not None:
+        # Devices validated elsewhere may have been loaded with a different static directory, so
+        # their avatars might not exist in this one. Avatars are named by content, so those that
+        # do exist aren't processed again.
+        _devices.migrate_avatars()
+
     ui_params = init_ui_params(params=_params, devices=_devices)
-    with state.cache.pipeline() as pipeline:
-        pipeline.set("devices", _devices)
-        pipeline.set("ui_params", ui_params)
+    state.set_config(
+        params=_params,
+        directives=_directives,
+        devices=_devices,
+        ui_params=ui_params,
+        generation=generation,
+    )
+
+
+def compile_config() -> Path:
+    """Validate all user configuration and write a snapshot of it for faster startup."""
+    state = use_state()
+    init_user_config(snapshot=False)
+    return write_snapshot(
+        params=state.params,
+        directives=state.directives,
+        devices=state.devices,
+        generation=state.generation,
+    )
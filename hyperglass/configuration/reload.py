@@ -0,0 +1,232 @@
+"""Reload configuration while hyperglass is running."""
+
+# Standard Library
+import typing as t
+import threading
+from pathlib import Path
+
+# Project
+from hyperglass.log import log
+from hyperglass.state import use_state
+from hyperglass.settings import Settings
+from hyperglass.constants import CONFIG_EXTENSIONS
+from hyperglass.defaults.directives import init_builtin_directives
+
+# Local
+from .snapshot import snapshot_path, write_snapshot
+from .validate import (
+    model_hash,
+    init_params,
+    init_devices,
+    init_ui_params,
+    init_generation,
+    init_directives,
+)
+
+__all__ = ("ConfigReload", "ConfigReloader", "reload_user_config")
+
+# Maximum number of seconds a reload may hold the reload lock, in case a process dies while
+# reloading.
+RELOAD_LOCK_TIMEOUT = 600
+
+
+class ConfigReload(t.NamedTuple):
+    """Configuration changed by a reload."""
+
+    params: bool
+    # IDs of added, changed, or removed directives & devices.
+    directives: t.Tuple[str, ...]
+    devices: t.Tuple[str, ...]
+    # Configuration version in use once reloaded.
+    version: int
+
+    @property
+    def changed(self) -> bool:
+        """Determine if any configuration changed."""
+        return self.params or len(self.directives) > 0 or len(self.devices) > 0
+
+
+def _changed(
+    previous: t.Iterable[t.Any], current: t.Iterable[t.Any], generation: t.Dict[str, str], key: str
+) -> t.Set[str]:
+    """Get IDs of items that were added, changed, or removed."""
+    unchanged = {item.id: item for item in previous}
+    changed = set(unchanged)
+    for item in current:
+        existing = unchanged.get(item.id)
+        if existing is item or generation.get(f"{key}:{item.id}") == model_hash(item):
+            changed.discard(item.id)
+        else:
+            changed.add(item.id)
+    return changed
+
+
+def _register_plugins(devices: t.Any, directive_ids: t.Set[str]) -> None:
+    """Register plugins used by added or changed directives."""
+    # Project
+    from hyperglass.plugins import register_plugin
+
+    for plugin_file, directives in devices.directive_plugins().items():
+        if directive_ids.isdisjoint(directives):
+            continue
+        for failure in register_plugin(plugin_file, directives=directives):
+            log.bind(plugin=failure).warning("Invalid hyperglass plugin")
+
+
+def reload_user_config() -> ConfigReload:
+    """Validate changed configuration, and replace the configuration in use with it.
+
+    Only changed configuration is validated; unchanged devices & directives are reused as they
+    are. Nothing is replaced unless all configuration is valid, and all processes switch to the
+    new configuration at once. Queries already in progress finish with the configuration they
+    started with.
+    """
+    state = use_state()
+    lock = state.redis.instance.lock(
+        state.redis.key(("config", "reload")), timeout=RELOAD_LOCK_TIMEOUT
+    )
+    # Only one process reloads configuration at a time.
+    with lock:
+        previous_params = state.params
+        previous_directives = state.directives
+        previous_devices = state.devices
+        previous_generation = state.generation
+
+        params = init_params(previous=previous_params)
+        directives = init_builtin_directives() + init_directives(previous=previous_directives)
+        changed_directives = _changed(
+            previous_directives, directives, previous_generation, "directive"
+        )
+        devices = init_devices(
+            directives,
+            params=params,
+            previous=previous_devices,
+            changed_directives=changed_directives,
+        )
+        changed_devices = _changed(previous_devices, devices, previous_generation, "device")
+        result = ConfigReload(
+            params=params is not previous_params,
+            directives=tuple(sorted(changed_directives)),
+            devices=tuple(sorted(changed_devices)),
+            version=state.config_version(),
+        )
+
+        if not result.changed:
+            log.info("Configuration is unchanged")
+            return result
+
+        unchanged = {
+            *(f"directive:{d.id}" for d in directives if d.id not in changed_directives),
+            *(f"device:{d.id}" for d in devices if d.id not in changed_devices),
+        }
+        if not result.params:
+            unchanged.add("structured")
+        generation = init_generation(
+            params=params,
+            directives=directives,
+            devices=devices,
+            previous=previous_generation,
+            unchanged=unchanged,
+        )
+        version = state.set_config(
+            params=params,
+            directives=directives,
+            devices=devices,
+            ui_params=init_ui_params(params=params, devices=devices),
+            generation=generation,
+        )
+
+        if changed_directives:
+            _register_plugins(devices, changed_directives)
+
+        if snapshot_path().exists():
+            # Keep the snapshot current, so it's used on the next start.
+            write_snapshot(
+                params=params, directives=directives, devices=devices, generation=generation
+            )
+
+    result = result._replace(version=version)
+    log.bind(
+        params=result.params,
+        directives=result.directives,
+        devices=result.devices,
+        version=version,
+    ).info("Reloaded configuration")
+    return result
+
+
+def _is_config_file(path: Path) -> bool:
+    """Determine if a path is a configuration file."""
+    name, _, extension = path.name.rpartition(".")
+    return name in Settings.config_file_names and extension in CONFIG_EXTENSIONS
+
+
+class ConfigReloader:
+    """Reload configuration in a background thread, whenever a reload is requested.
+
+    Requests are safe to make from signal handlers. Requests made while a reload is running cause
+    one more reload once it finishes, so the most recent change is always loaded.
+    """
+
+    _requested: threading.Event
+    _stopped: threading.Event
+    _threads: t.List[threading.Thread]
+
+    def __init__(self) -> None:
+        """Set up reloader."""
+        self._requested = threading.Event()
+        self._stopped = threading.Event()
+        self._threads = []
+
+    def request(self, *_: t.Any) -> None:
+        """Request a configuration reload."""
+        self._requested.set()
+
+    def reload(self) -> t.Optional[ConfigReload]:
+        """Reload configuration, and log any errors instead of raising them."""
+        try:
+            return reload_user_config()
+        except Exception as err:
+            # The current configuration remains in use.
+            log.bind(error=str(err)).error("Failed to reload configuration")
+            return None
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            if self._requested.wait(timeout=1):
+                self._requested.clear()
+                self.reload()
+
+    def _watch(self) -> None:
+        try:
+            # Third Party
+            from watchfiles import watch
+        except ImportError:
+            log.warning("Configuration files can't be watched, because watchfiles isn't installed")
+            return
+
+        for _ in watch(
+            Settings.app_path,
+            watch_filter=lambda _, path: _is_config_file(Path(path)),
+            stop_event=self._stopped,
+            recursive=False,
+        ):
+            log.info("Configuration files changed")
+            self.request()
+
+    def start(self, *, watch: bool = False) -> None:
+        """Start reloading configuration when requested, and when configuration files change."""
+        targets = [(self._run, "config-reload")]
+        if watch:
+            targets.append((self._watch, "config-watch"))
+        for target, name in targets:
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        """Stop reloading configuration."""
+        self._stopped.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
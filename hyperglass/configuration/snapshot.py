@@ -0,0 +1,144 @@
+"""Write & load validated configuration snapshots."""
+
+# Standard Library
+import os
+import sys
+import pickle
+import typing as t
+import hashlib
+from pathlib import Path
+
+# Project
+from hyperglass.log import log
+from hyperglass.settings import Settings
+from hyperglass.constants import __version__
+
+# Local
+from .load import find_path
+
+if t.TYPE_CHECKING:
+    # Project
+    from hyperglass.models.directive import Directives
+    from hyperglass.models.config.params import Params
+    from hyperglass.models.config.devices import Devices
+
+__all__ = ("ConfigSnapshot", "load_snapshot", "snapshot_path", "write_snapshot")
+
+# Increment when the structure of the snapshot file changes.
+SNAPSHOT_FORMAT = 9
+SNAPSHOT_FILE_NAME = "hyperglass.snapshot"
+
+
+class ConfigSnapshot(t.NamedTuple):
+    """Validated configuration loaded from a snapshot."""
+
+    params: "Params"
+    directives: "Directives"
+    devices: "Devices"
+    generation: t.Dict[str, str]
+
+
+def snapshot_path() -> Path:
+    """Get the path of the configuration snapshot file."""
+    return Settings.app_path / SNAPSHOT_FILE_NAME
+
+
+def _config_files() -> t.List[Path]:
+    """Get paths of all configuration files that currently exist."""
+    paths = (find_path(name, required=False) for name in Settings.config_file_names)
+    return [p for p in paths if p is not None]
+
+
+def _referenced_files(value: t.Any) -> t.Set[Path]:
+    """Find all files referenced by validated configuration, such as avatars or markdown."""
+    if isinstance(value, Path):
+        return {value} if value.is_file() else set()
+    if isinstance(value, t.Dict):
+        value = value.values()
+    if isinstance(value, (t.KeysView, t.ValuesView, t.List, t.Tuple, t.Set)):
+        return {path for item in value for path in _referenced_files(item)}
+    return set()
+
+
+def _key(files: t.Iterable[Path]) -> str:
+    """Hash the contents of input files, along with anything else that affects validation."""
+    digest = hashlib.sha256()
+    for part in (SNAPSHOT_FORMAT, __version__, sys.version, Settings.app_path):
+        digest.update(f"{part!s}\n".encode())
+    for path in sorted(set(files)):
+        digest.update(f"{path!s}\n".encode())
+        try:
+            digest.update(hashlib.sha256(path.read_bytes()).digest())
+        except OSError:
+            digest.update(b"missing")
+    return digest.hexdigest()
+
+
+def write_snapshot(
+    *,
+    params: "Params",
+    directives: "Directives",
+    devices: "Devices",
+    generation: t.Dict[str, str],
+) -> Path:
+    """Write validated configuration to the snapshot file.
+
+    The file contains two pickled objects: a small header describing the snapshot's inputs,
+    followed by the validated configuration. The header can be checked without loading the
+    (much larger) configuration.
+    """
+    files = {
+        *_config_files(),
+        # VRPs change independently of configuration, and are reloaded whenever they do.
+        *_referenced_files(params.model_dump(exclude={"structured": {"rpki": {"vrp_file"}}})),
+        *_referenced_files(directives.model_dump()),
+        *_referenced_files(devices.model_dump()),
+    }
+    header = {
+        "format": SNAPSHOT_FORMAT,
+        "key": _key(files),
+        "files": sorted(str(f) for f in files),
+    }
+    path = snapshot_path()
+    temp = path.with_suffix(".tmp")
+    with temp.open("wb") as f:
+        pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(
+            ConfigSnapshot(
+                params=params, directives=directives, devices=devices, generation=generation
+            ),
+            f,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+    # Replace any existing snapshot atomically, so a running process never reads a partial file.
+    os.replace(temp, path)
+    log.bind(path=path, key=header["key"]).debug("Wrote configuration snapshot")
+    return path
+
+
+def load_snapshot() -> t.Optional[ConfigSnapshot]:
+    """Load validated configuration from the snapshot file, if it matches its inputs."""
+    path = snapshot_path()
+    if not path.exists():
+        return None
+
+    _log = log.bind(path=path)
+    try:
+        with path.open("rb") as f:
+            header = pickle.load(f)  # noqa: S301
+            if header.get("format") != SNAPSHOT_FORMAT:
+                _log.warning("Configuration snapshot format is outdated, ignoring")
+                return None
+
+            files = {Path(f) for f in header["files"]}
+            if _key((*files, *_config_files())) != header["key"]:
+                _log.info("Configuration has changed since snapshot was compiled, ignoring")
+                return None
+
+            snapshot = pickle.load(f)  # noqa: S301
+    except Exception as err:
+        _log.bind(error=str(err)).warning("Failed to load configuration snapshot, ignoring")
+        return None
+
+    _log.bind(key=header["key"]).info("Loaded configuration from snapshot")
+    return snapshot
@@ -0,0 +1,91 @@
+"""Test reloading configuration."""
+
+# Standard Library
+import tempfile
+from pathlib import Path
+
+# Project
+from hyperglass.state import HyperglassState, use_state
+from hyperglass.settings import Settings
+
+# Local
+from .. import init_user_config
+from ..reload import reload_user_config
+
+DEVICES = """
+devices:
+  - name: Router 1
+    address: 192.0.2.1
+    platform: juniper
+    credential: {{username: hyperglass, password: hyperglass}}
+    attrs: {{source4: 192.0.2.10, source6: "2001:db8::10"}}
+    directives: [ping]
+  - name: Router 2
+    address: {address}
+    platform: juniper
+    credential: {{username: hyperglass, password: hyperglass}}
+    attrs: {{source4: 192.0.2.10, source6: "2001:db8::10"}}
+    directives: [ping]
+"""
+
+DIRECTIVES = """
+ping:
+  name: Ping
+  field:
+    description: IP Address
+  rules:
+    - condition: 0.0.0.0/0
+      command: ping {target}
+"""
+
+
+def test_reload(monkeypatch, isolated_state: HyperglassState):
+    state = isolated_state
+    with tempfile.TemporaryDirectory() as directory_name:
+        directory = Path(directory_name)
+        monkeypatch.setattr(Settings, "app_path", directory)
+        (directory / "config.yaml").write_text("org_name: Test\n")
+        (directory / "directives.yaml").write_text(DIRECTIVES)
+        devices_file = directory / "devices.yaml"
+        devices_file.write_text(DEVICES.format(address="192.0.2.2"))
+
+        init_user_config(snapshot=False)
+        version = state.config_version()
+        router1 = state.devices["router_1"]
+        generation = state.generation
+
+        # Nothing is replaced if nothing changed.
+        result = reload_user_config()
+        assert not result.changed
+        assert state.config_version() == version
+
+        # Only the changed device is validated again.
+        devices_file.write_text(DEVICES.format(address="192.0.2.3"))
+        result = reload_user_config()
+        assert result.devices == ("router_2",)
+        assert result.directives == ()
+        assert result.params is False
+        assert result.version == state.config_version() == version + 1
+        assert str(use_state("devices")["router_2"].address) == "192.0.2.3"
+        assert use_state("devices")["router_1"]._source == router1._source
+        assert state.generation["device:router_1"] == generation["device:router_1"]
+        assert state.generation["device:router_2"] != generation["device:router_2"]
+
+        # Devices using a changed directive are validated again.
+        (directory / "directives.yaml").write_text(DIRECTIVES.replace("Ping", "Ping Test"))
+        result = reload_user_config()
+        assert result.directives == ("ping",)
+        assert result.devices == ("router_1", "router_2")
+        assert use_state("devices")["router_1"].directives["ping"].name == "Ping Test"
+
+        # Invalid configuration leaves the current configuration in place.
+        (directory / "config.yaml").write_text("org_name: [invalid]\n")
+        version = state.config_version()
+        try:
+            reload_user_config()
+        except Exception:  # noqa: S110
+            pass
+        else:
+            raise AssertionError("Invalid configuration was reloaded")
+        assert state.config_version() == version
+        assert use_state("params").org_name == "Test"
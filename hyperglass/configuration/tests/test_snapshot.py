@@ -0,0 +1,81 @@
+"""Test configuration snapshots."""
+
+# Standard Library
+import tempfile
+from pathlib import Path
+
+# Third Party
+from PIL import Image
+
+# Project
+from hyperglass.state import HyperglassState
+from hyperglass.settings import Settings
+from hyperglass.models.directive import Directives
+from hyperglass.models.config.params import Params
+from hyperglass.models.config.devices import Devices
+
+# Local
+from .. import compile_config, init_user_config
+from ..snapshot import load_snapshot, snapshot_path, write_snapshot
+
+DEVICES = """
+devices:
+  - name: Router 1
+    address: 192.0.2.1
+    platform: juniper
+    avatar: {avatar}
+    credential: {{username: hyperglass, password: hyperglass}}
+    attrs: {{source4: 192.0.2.10, source6: "2001:db8::10"}}
+"""
+
+
+def test_snapshot(monkeypatch):
+    with tempfile.TemporaryDirectory() as directory_name:
+        directory = Path(directory_name)
+        monkeypatch.setattr(Settings, "app_path", directory)
+        config_file = directory / "config.yaml"
+        config_file.write_text("org_name: Test\n")
+
+        assert load_snapshot() is None
+
+        path = write_snapshot(
+            params=Params(org_name="Test"),
+            directives=Directives(),
+            devices=Devices(),
+            generation={"config": "test"},
+        )
+        assert path == snapshot_path()
+
+        snapshot = load_snapshot()
+        assert snapshot is not None
+        assert snapshot.params.org_name == "Test"
+        assert snapshot.generation == {"config": "test"}
+
+        # Adding a configuration file invalidates the snapshot.
+        (directory / "devices.yaml").write_text("devices: []\n")
+        assert load_snapshot() is None
+        (directory / "devices.yaml").unlink()
+        assert load_snapshot() is not None
+
+        # Changing a configuration file invalidates the snapshot.
+        config_file.write_text("org_name: Changed\n")
+        assert load_snapshot() is None
+
+
+def test_snapshot_avatars(monkeypatch, isolated_state: HyperglassState):
+    with tempfile.TemporaryDirectory() as directory_name:
+        directory = Path(directory_name)
+        monkeypatch.setattr(Settings, "app_path", directory)
+        avatar = directory / "avatar.png"
+        Image.new("RGB", (16, 16)).save(avatar)
+        (directory / "config.yaml").write_text("org_name: Test\n")
+        (directory / "devices.yaml").write_text(DEVICES.format(avatar=avatar))
+        compile_config()
+
+        # Avatars are copied to the static directory when loaded from a snapshot, too.
+        images = directory / "static" / "images"
+        for image in images.iterdir():
+            image.unlink()
+        init_user_config()
+        (name,) = (image.name for image in images.iterdir())
+        assert isolated_state.devices["router_1"]._avatar == name
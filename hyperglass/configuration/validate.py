@@ -1,16 +1,22 @@
 """Import configuration files and run validation."""
 
+# Standard Library
+import json
+import typing as t
+import hashlib
+
 # Third Party
 from pydantic import ValidationError
 
 # Project
 from hyperglass.log import log
+from hyperglass.util import resolve_hostnames, run_coroutine_in_new_thread
 from hyperglass.settings import Settings
 from hyperglass.models.ui import UIParameters
 from hyperglass.models.directive import Directive, Directives
 from hyperglass.exceptions.private import ConfigError, ConfigInvalid
 from hyperglass.models.config.params import Params
-from hyperglass.models.config.devices import Devices
+from hyperglass.models.config.devices import Device, Devices, device_context
 
 # Local
 from .load import load_config
@@ -20,8 +26,10 @@ __all__ = (
     "init_devices",
     "init_directives",
     "init_files",
+    "init_generation",
     "init_params",
     "init_ui_params",
+    "model_hash",
 )
 
 
@@ -34,11 +42,24 @@ def init_files() -> None:
             log.debug("Created directory", path=path)
 
 
-def init_params() -> "Params":
-    """Validate & initialize configuration parameters."""
+def _source(value: t.Any) -> str:
+    """Hash unvalidated configuration, to determine if it's changed since it was validated."""
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def init_params(previous: t.Optional["Params"] = None) -> "Params":
+    """Validate & initialize configuration parameters.
+
+    If `previous` parameters were validated from the same configuration, they're returned as-is.
+    """
     user_config = load_config("config", required=False)
+    source = _source(user_config)
+    if previous is not None and previous._source == source:
+        return previous
+
     # Map imported user configuration to expected schema.
     params = Params(**user_config)
+    params._source = source
 
     # # Set up file logging once configuration parameters are initialized.
     # enable_file_logging(
@@ -72,15 +93,24 @@ def init_params() -> "Params":
     return params
 
 
-def init_directives() -> "Directives":
-    """Validate & initialize directives."""
-    # Map imported user directives to expected schema.
-    directives = load_config("directives", required=False)
+def init_directives(previous: t.Optional["Directives"] = None) -> "Directives":
+    """Validate & initialize directives.
+
+    Directives in `previous` that were validated from the same configuration are reused.
+    """
+    validated = {d.id: d for d in previous or () if d._source is not None}
+    directives = []
     try:
-        directives = (
-            Directive(id=name, **directive)
-            for name, directive in load_config("directives", required=False).items()
-        )
+        for name, directive in load_config("directives", required=False).items():
+            source = _source(directive)
+            existing = validated.get(name)
+            if existing is not None and existing._source == source:
+                directives.append(existing)
+                continue
+            # Map imported user directives to expected schema.
+            new = Directive(id=name, **directive)
+            new._source = source
+            directives.append(new)
 
     except ValidationError as err:
         raise ConfigInvalid(errors=err.errors()) from err
@@ -88,8 +118,28 @@ def init_directives() -> "Directives":
     return Directives(*directives)
 
 
-def init_devices() -> "Devices":
-    """Validate & initialize devices."""
+def _hostnames(items: t.Sequence[t.Dict[str, t.Any]]) -> t.List[str]:
+    """Get device addresses that need to be resolved.
+
+    Addresses aren't coerced to IP address objects before they're validated, so IP addresses are
+    included; they're resolved without a DNS lookup.
+    """
+    return [item["address"] for item in items if isinstance(item.get("address"), str)]
+
+
+def init_devices(
+    directives: t.Optional["Directives"] = None,
+    *,
+    params: t.Optional["Params"] = None,
+    previous: t.Optional["Devices"] = None,
+    changed_directives: t.Collection[str] = (),
+) -> "Devices":
+    """Validate & initialize devices.
+
+    Device hostnames are resolved concurrently before devices are validated, and device avatars
+    are processed in parallel afterwards. Devices in `previous` that were validated from the same
+    configuration are reused, unless they use a directive in `changed_directives`.
+    """
     devices_config = load_config("devices", required=True)
     items = []
 
@@ -102,8 +152,42 @@ def init_devices() -> "Devices":
     if len(items) < 1:
         raise ConfigError("No devices are defined in devices file")
 
-    devices = Devices(*items)
-    log.debug("Initialized devices", devices=devices)
+    validated = {d.id: d for d in previous or ()}
+    sources = {}
+    # Each device's ID in order, with its previously validated device if it can be reused.
+    order: t.List[t.Tuple[str, t.Optional[Device]]] = []
+    pending = []
+    for item in items:
+        device_id = Device._with_id(dict(item))["id"]
+        sources[device_id] = source = _source(item)
+        existing = validated.get(device_id)
+        if (
+            existing is not None
+            and existing._source == source
+            and not existing.has_directives(*changed_directives)
+        ):
+            order.append((device_id, existing))
+        else:
+            order.append((device_id, None))
+            pending.append(item)
+
+    hostnames = _hostnames(pending)
+    # Resolving with the configured resolver also caches the results for connecting to devices.
+    resolver = params.dns.resolver() if params is not None else None
+    resolved = run_coroutine_in_new_thread(
+        lambda: resolve_hostnames(*hostnames, resolver=resolver)
+    )
+
+    with device_context(directives, resolved=resolved):
+        new = Devices(*pending)
+    for device in new:
+        device._source = sources[device.id]
+
+    new_by_id = {device.id: device for device in new}
+    devices = Devices(*(existing or new_by_id[device_id] for device_id, existing in order))
+    # Reused devices' avatars are migrated again too, in case the static directory has changed.
+    devices.migrate_avatars()
+    log.debug("Initialized devices", devices=devices, validated=len(new))
 
     return devices
 
@@ -130,7 +214,45 @@ def init_ui_params(*, params: "Params", devices: "Devices") -> "UIParameters":
         **_ui_params,
         version=__version__,
         devices=devices.frontend(),
+        directives=devices.frontend_directives(),
         developer_mode=Settings.dev_mode,
         parsed_data_fields=PARSED_RESPONSE_FIELDS,
         content={"credit": content_credit, "greeting": content_greeting},
     )
+
+
+def model_hash(*models: t.Any) -> str:
+    """Hash validated models."""
+    digest = hashlib.sha256()
+    for model in models:
+        digest.update(model.model_dump_json().encode())
+    return digest.hexdigest()
+
+
+def init_generation(
+    *,
+    params: "Params",
+    directives: "Directives",
+    devices: "Devices",
+    previous: t.Optional[t.Dict[str, str]] = None,
+    unchanged: t.Collection[str] = (),
+) -> t.Dict[str, str]:
+    """Hash validated configuration to identify its generation.
+
+    Each device, directive, and the structured output configuration has its own generation so
+    that cached responses are only invalidated when the configuration that produced them changes.
+    Generations of `unchanged` keys are reused from a `previous` generation.
+    """
+
+    def _reuse(key: str, model: t.Any) -> str:
+        if previous is not None and key in unchanged and key in previous:
+            return previous[key]
+        return model_hash(model)
+
+    generation = {"structured": _reuse("structured", params.structured)}
+    generation.update({f"directive:{d.id}": _reuse(f"directive:{d.id}", d) for d in directives})
+    generation.update({f"device:{d.id}": _reuse(f"device:{d.id}", d) for d in devices})
+    generation["config"] = hashlib.sha256(
+        "".join((model_hash(params), *sorted(generation.values()))).encode()
+    ).hexdigest()
+    return generation
@@ -0,0 +1,36 @@
+"""Fixtures shared by all hyperglass tests."""
+
+# Standard Library
+import typing as t
+
+# Third Party
+import pytest
+
+# Project
+from hyperglass.state import HyperglassState, hooks
+from hyperglass.settings import Settings
+
+
+class IsolatedState(HyperglassState):
+    """State in its own namespaces, so test configuration doesn't replace shared state."""
+
+    _namespace = "hyperglass.test.state"
+    _cache_namespace = "hyperglass.test.cache"
+
+
+@pytest.fixture
+def isolated_state(monkeypatch) -> t.Generator[HyperglassState, None, None]:
+    """Provide global state in isolated namespaces, and remove it afterwards."""
+    state = IsolatedState(settings=Settings)
+    monkeypatch.setattr(hooks, "_state", lambda: state)
+    # Check for new configuration on each access, and forget the version seen once finished.
+    monkeypatch.setattr(hooks, "CHECK_INTERVAL", 0)
+    monkeypatch.setattr(hooks._Version, "value", hooks._Version.value)
+    monkeypatch.setattr(hooks._Version, "checked", hooks._Version.checked)
+    # Objects are cached by configuration version, which differs between namespaces.
+    hooks._use_state.cache_clear()
+    yield state
+    # Remove everything, including version counters, which clearing state keeps.
+    state._delete_namespace(state._namespace)
+    state.clear_cache()
+    hooks._use_state.cache_clear()
@@ -2,7 +2,7 @@
 
 # Standard Library
 import json as _json
-from typing import Any, Set, Dict, List, Union, Literal, Optional
+from typing import Any, Set, Dict, List, Type, Tuple, Union, Literal, Optional
 
 # Third Party
 from pydantic import ValidationError
@@ -39,6 +39,15 @@ class HyperglassError(Exception):
         """Return the instance's error message."""
         return self._message
 
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Pickle the formatted error, so it's restored without formatting (or logging) it again.
+
+        Subclasses' arguments differ, and a formatted message can't be formatted again, so errors
+        raised in another process (such as a parse worker) are restored from their attributes.
+        """
+        state = {**self.__dict__, "_keywords": self.keywords}
+        return (_restore_error, (type(self), self.args), state)
+
     def __repr__(self) -> str:
         """Return the instance's severity & error message in a string."""
         return repr_from_attrs(self, ("_message", "level", "keywords"), strip="_")
@@ -67,6 +76,7 @@ class HyperglassError(Exception):
                 kwargs[key] = str(kwargs[key])
         return template.format(**kwargs)
 
+    @staticmethod
     def _parse_pydantic_errors(*errors: Dict[str, Any]) -> str:
         errs = ("\n",)
 
@@ -110,6 +120,13 @@ class HyperglassError(Exception):
         return STATUS_CODE_MAP.get(self._level, 500)
 
 
+def _restore_error(cls: Type[HyperglassError], args: Tuple[Any, ...]) -> HyperglassError:
+    """Create an unpickled error without initializing it; its attributes are restored after."""
+    error = cls.__new__(cls)
+    error.args = args
+    return error
+
+
 class PublicHyperglassError(HyperglassError):
     """Base exception class for user-facing errors.
 
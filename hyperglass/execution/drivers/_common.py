@@ -6,7 +6,9 @@ from abc import ABC, abstractmethod
 
 # Project
 from hyperglass.types import Series
+from hyperglass.state import use_state
 from hyperglass.plugins import OutputPluginManager
+from hyperglass.models.data import BGPRouteTable, CompactRouteTable
 
 # Local
 from ._construct import Construct
@@ -37,12 +39,25 @@ class Connection(ABC):
         """Return a preconfigured sshtunnel.SSHTunnelForwarder instance."""
         pass
 
+    async def resolve_address(self) -> str:
+        """Get the device's address, resolved with the shared resolver if it's a hostname.
+
+        If the hostname can't be resolved, it's returned as-is, and the connection fails as it
+        would have without the resolver.
+        """
+        resolver = use_state("params").dns.resolver()
+        address = await resolver.address(self.device._target)
+        return address or self.device._target
+
     async def response(self, output: Series[str]) -> t.Union["OutputDataModel", str]:
         """Send output through common parsers."""
 
-        response = self.plugin_manager.execute(output=output, query=self.query_data)
+        response = await self.plugin_manager.execute(output=output, query=self.query_data)
 
         if response is None:
             response = ()
 
+        if isinstance(response, (BGPRouteTable, CompactRouteTable)):
+            await response.validate_rpki()
+
         return response
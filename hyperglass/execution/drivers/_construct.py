@@ -10,13 +10,12 @@ import re
 import json as _json
 import typing as t
 import ipaddress
+from functools import lru_cache
 
 # Project
 from hyperglass.log import log
-from hyperglass.util import get_fmt_keys
 from hyperglass.constants import TRANSPORT_REST, TARGET_FORMAT_SPACE
 from hyperglass.exceptions.public import InputInvalid
-from hyperglass.exceptions.private import ConfigError
 
 if t.TYPE_CHECKING:
     # Third Party
@@ -65,12 +64,13 @@ class Construct:
         """Format the query target based on directive parameters."""
         if isinstance(self.query.query_target, t.List):
             # Directive can accept multiple values in a single command.
-            if self.directive.multiple:
+            if self.directive.multiple and self.directive.multiple_separator is not None:
                 return self.directive.multiple_separator.join(self.query.query_target)
             # Target is an array of one, return single item.
             if len(self.query.query_target) == 1:
                 return self.query.query_target[0]
-            # Directive commands should be run once for each item in the target.
+            # Directive commands are run once for each item in the target, as separate queries
+            # (see `Query.split_targets()`).
 
         return self.query.query_target
 
@@ -87,20 +87,8 @@ class Construct:
             }
         )
 
-    def format(self, command: str) -> str:
-        """Return formatted command for 'Scrape' endpoints (SSH)."""
-        keys = get_fmt_keys(command)
-        attrs = {k: v for k, v in self.device.attrs.items() if k in keys}
-        for key in [k for k in keys if k != "target" and k != "mask"]:
-            if key not in attrs:
-                raise ConfigError(
-                    ("Command '{c}' has attribute '{k}', which is missing from device '{d}'"),
-                    level="danger",
-                    c=self.directive.name,
-                    k=key,
-                    d=self.device.name,
-                )
-
+    def mask(self) -> ipaddress.IPv4Address:
+        """Get the netmask of an IPv4 target with more than one host."""
         mask = ipaddress.ip_address("255.255.255.255")
         try:
             network = ipaddress.ip_network(self.target)
@@ -109,23 +97,21 @@ class Construct:
                 mask = network.netmask
         except ValueError:
             pass
-
-        return command.format(target=self.target, mask=mask, **attrs)
+        return mask
 
     def queries(self):
         """Return queries for each enabled AFI."""
-        query = []
-
-        rules = [r for r in self.directive.rules if r._passed is True]
-        if len(rules) < 1:
+        rule_match = getattr(self.query, "rule_match", None)
+        if rule_match is None:
             raise InputInvalid(
                 error="No validation rules matched target '{target}'",
                 target=self.query.query_target,
             )
 
-        for rule in [r for r in self.directive.rules if r._passed is True]:
-            for command in rule.commands:
-                query.append(self.format(command))
+        # Device attributes are substituted into commands when the device is loaded, so only the
+        # target (and mask, if used) remain to be substituted.
+        templates = self.device.command_templates(self.directive.id)[rule_match.index]
+        query = [template.format(self.target, self.mask) for template in templates]
         self._log.bind(constructed_query=query).debug("Constructed query")
         return query
 
@@ -139,9 +125,9 @@ class Formatter:
         self.platform = query.device.platform
         self.query_type = query.query_type
 
-    def __enter__(self):
+    def __enter__(self) -> FormatterCallback:
         """Get the relevant formatter."""
-        return self._get_formatter()
+        return get_formatter(self.platform, self.query_type)
 
     def __exit__(self, exc_type, exc_value, exc_traceback):
         """Handle context exit."""
@@ -149,29 +135,13 @@ class Formatter:
             log.error(exc_traceback)
         pass
 
-    def _get_formatter(self):
-        if self.platform in ("juniper", "juniper_junos"):
-            if self.query_type == "bgp_aspath":
-                return self._with_formatter(self._juniper_bgp_aspath)
-        if self.platform in ("bird", "bird_ssh"):
-            if self.query_type == "bgp_aspath":
-                return self._with_formatter(self._bird_bgp_aspath)
-            if self.query_type == "bgp_community":
-                return self._with_formatter(self._bird_bgp_community)
-        return self._with_formatter(self._default)
-
-    def _default(self, target: str) -> str:
+    @staticmethod
+    def _default(target: str) -> str:
         """Don't format targets by default."""
         return target
 
-    def _with_formatter(self, formatter: t.Callable[[str], str]) -> FormatterCallback:
-        result: FormatterCallback
-        if isinstance(self.query.query_target, t.List):
-            result = lambda s: [formatter(i) for i in s]
-        result = lambda s: formatter(s)
-        return result
-
-    def _juniper_bgp_aspath(self, target: str) -> str:
+    @staticmethod
+    def _juniper_bgp_aspath(target: str) -> str:
         """Convert from Cisco AS_PATH format to Juniper format."""
         query = str(target)
         asns = re.findall(r"\d+", query)
@@ -194,7 +164,8 @@ class Formatter:
 
         return query
 
-    def _bird_bgp_aspath(self, target: str) -> str:
+    @staticmethod
+    def _bird_bgp_aspath(target: str) -> str:
         """Convert from Cisco AS_PATH format to BIRD format."""
 
         # Extract ASNs from query target string
@@ -221,7 +192,25 @@ class Formatter:
 
         return result
 
-    def _bird_bgp_community(self, target: str) -> str:
+    @staticmethod
+    def _bird_bgp_community(target: str) -> str:
         """Convert from standard community format to BIRD format."""
         parts = target.split(":")
         return f"({','.join(parts)})"
+
+
+# Target formatters by platform & query type. All other targets are left unmodified.
+TARGET_FORMATTERS: t.Dict[t.Tuple[str, str], FormatterCallback] = {
+    ("juniper", "bgp_aspath"): Formatter._juniper_bgp_aspath,
+    ("juniper_junos", "bgp_aspath"): Formatter._juniper_bgp_aspath,
+    ("bird", "bgp_aspath"): Formatter._bird_bgp_aspath,
+    ("bird_ssh", "bgp_aspath"): Formatter._bird_bgp_aspath,
+    ("bird", "bgp_community"): Formatter._bird_bgp_community,
+    ("bird_ssh", "bgp_community"): Formatter._bird_bgp_community,
+}
+
+
+@lru_cache
+def get_formatter(platform: str, query_type: str) -> FormatterCallback:
+    """Get the target formatter for a platform & query type."""
+    return TARGET_FORMATTERS.get((platform, query_type), Formatter._default)
@@ -0,0 +1,87 @@
+"""Limit and run device sessions.
+
+Blocking device sessions (such as Netmiko's) can't be interrupted once they've started, so timing
+out a query only stops waiting for its session. Sessions therefore run in a dedicated, bounded
+thread pool, so abandoned sessions can't exhaust the event loop's default executor, and a device's
+concurrency limit is held until its session's thread actually finishes.
+"""
+
+# Standard Library
+import typing as t
+import asyncio
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# Project
+from hyperglass.log import log
+
+if t.TYPE_CHECKING:
+    # Project
+    from hyperglass.models.config.devices import Device
+
+__all__ = ("device_limit", "run_session", "shutdown_session_pool")
+
+# Maximum number of blocking device sessions running at once, per process.
+SESSION_WORKERS = 32
+
+T = t.TypeVar("T")
+
+# Per-device limits on concurrent executions, per event loop.
+_limits: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, t.Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+_pool: t.Optional[ThreadPoolExecutor] = None
+
+
+def device_limit(device: "Device") -> asyncio.Semaphore:
+    """Get the semaphore limiting concurrent executions on a device in this process."""
+    limits = _limits.setdefault(asyncio.get_running_loop(), {})
+    limit = limits.get(device.id)
+    if limit is None:
+        limit = limits[device.id] = asyncio.Semaphore(device.concurrency)
+    return limit
+
+
+def use_session_pool() -> ThreadPoolExecutor:
+    """Get this process's device session thread pool."""
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=SESSION_WORKERS, thread_name_prefix="session")
+    return _pool
+
+
+def shutdown_session_pool() -> None:
+    """Stop this process's device session threads once their sessions finish."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def run_session(device: "Device", func: t.Callable[..., T], *args: t.Any) -> T:
+    """Run a blocking session with a device in the session pool, within the device's limit.
+
+    If the caller is cancelled (for example, when the query times out), the device's limit is
+    still held until the session finishes; a session that hasn't started yet is cancelled.
+    """
+    limit = device_limit(device)
+    loop = asyncio.get_running_loop()
+    await limit.acquire()
+
+    def release(_: Future) -> None:
+        # Called from the session's thread, or from the event loop if the session is cancelled
+        # before it starts.
+        try:
+            loop.call_soon_threadsafe(limit.release)
+        except RuntimeError:
+            # The event loop is closed, and its limits with it.
+            log.bind(device=device.id).debug("Device session finished after event loop closed")
+
+    try:
+        future = use_session_pool().submit(func, *args)
+    except BaseException:
+        limit.release()
+        raise
+    future.add_done_callback(release)
+    return await asyncio.wrap_future(future)
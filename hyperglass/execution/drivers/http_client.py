@@ -12,6 +12,7 @@ from hyperglass.exceptions.public import AuthError, RestError, DeviceTimeout, Re
 
 # Local
 from ._common import Connection
+from ._session import device_limit
 
 if t.TYPE_CHECKING:
     # Project
@@ -89,16 +90,25 @@ class HttpClient(Connection):
 
         query = self._query_params()
         responses = ()
+        address = await self.resolve_address()
 
-        async with self.client as client:
+        async with device_limit(self.device), self.client as client:
             body = {}
             if self.config.method in ("POST", "PATCH", "PUT"):
                 body = self._body()
 
+            request = client.build_request(
+                method=self.config.method, url=self.config.path, params=query, **body
+            )
+            if address != request.url.host:
+                # Connect to the resolved address. The request's `Host` header is already set to
+                # the device's hostname, which is also used for TLS server name indication and
+                # certificate verification.
+                request.extensions["sni_hostname"] = request.url.host
+                request.url = request.url.copy_with(host=address)
+
             try:
-                response: httpx.Response = await client.request(
-                    method=self.config.method, url=self.config.path, params=query, **body
-                )
+                response: httpx.Response = await client.send(request)
                 response.raise_for_status()
                 data = response.text.strip()
 
@@ -4,8 +4,8 @@ https://github.com/ktbyers/netmiko
 """
 
 # Standard Library
-import math
-from typing import Iterable
+import time
+from typing import Any, Dict, Tuple, Iterable
 
 # Third Party
 from netmiko import (  # type: ignore
@@ -21,6 +21,7 @@ from hyperglass.exceptions.public import AuthError, DeviceTimeout, ResponseEmpty
 
 # Local
 from .ssh import SSHConnection
+from ._session import run_session
 
 netmiko_device_globals = {
     # Netmiko doesn't currently handle Mikrotik echo verification well,
@@ -42,6 +43,11 @@ class NetmikoConnection(SSHConnection):
         command output.
         """
         params = use_state("params")
+        if host is None:
+            # Connect to the address resolved by hyperglass's resolver, rather than having netmiko
+            # resolve the device's hostname for each connection.
+            host = await self.resolve_address()
+
         _log = log.bind(
             device=self.device.name,
             address=f"{host}:{port}",
@@ -50,18 +56,25 @@ class NetmikoConnection(SSHConnection):
 
         _log.debug("Connecting to device")
 
+        # Queries time out after this many seconds, and the session can't outlive its query, so
+        # every stage of the session times out by then too.
+        timeout = params.request_timeout - 1
+
         global_args = netmiko_device_globals.get(self.device.platform, {})
 
         send_args = netmiko_device_send_args.get(self.device.platform, {})
 
         driver_kwargs = {
-            "host": host or self.device._target,
+            "host": host,
             "port": port or self.device.port,
             "device_type": self.device.get_device_type(),
             "username": self.device.credential.username,
             "global_delay_factor": 0.1,
-            "timeout": math.floor(params.request_timeout * 1.25),
-            "session_timeout": math.ceil(params.request_timeout - 1),
+            "conn_timeout": timeout,
+            "auth_timeout": timeout,
+            "banner_timeout": timeout,
+            "timeout": timeout,
+            "session_timeout": timeout,
             **global_args,
             **self.device.driver_config,
         }
@@ -84,15 +97,11 @@ class NetmikoConnection(SSHConnection):
                 driver_kwargs["passphrase"] = self.device.credential.password.get_secret_value()
 
         try:
-            nm_connect_direct = ConnectHandler(**driver_kwargs)
-
-            responses = ()
-
-            for query in self.query:
-                raw = nm_connect_direct.send_command(query, **send_args)
-                responses += (raw,)
-
-            nm_connect_direct.disconnect()
+            # Netmiko blocks while waiting for the device, so its session is run in a thread to
+            # allow other queries to be executed at the same time.
+            responses = await run_session(
+                self.device, self._send, driver_kwargs, send_args, time.monotonic() + timeout
+            )
 
         except NetMikoTimeoutException as scrape_error:
             raise DeviceTimeout(error=scrape_error, device=self.device) from scrape_error
@@ -104,3 +113,23 @@ class NetmikoConnection(SSHConnection):
             raise ResponseEmpty(query=self.query_data)
 
         return responses
+
+    def _send(
+        self, driver_kwargs: Dict[str, Any], send_args: Dict[str, Any], deadline: float
+    ) -> Tuple[str, ...]:
+        """Connect to the device and send each command, finishing by `deadline`."""
+        nm_connect_direct = ConnectHandler(**driver_kwargs)
+
+        responses = ()
+
+        try:
+            for query in self.query:
+                # Each command may take as long as remains before the session's deadline.
+                read_timeout = max(deadline - time.monotonic(), 1)
+                raw = nm_connect_direct.send_command(
+                    query, **{"read_timeout": read_timeout, **send_args}
+                )
+                responses += (raw,)
+        finally:
+            nm_connect_direct.disconnect()
+        return responses
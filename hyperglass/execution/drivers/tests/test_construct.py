@@ -10,7 +10,8 @@ from hyperglass.models.api import Query
 from hyperglass.configuration import init_ui_params
 from hyperglass.models.directive import Directives
 from hyperglass.models.config.params import Params
-from hyperglass.models.config.devices import Devices
+from hyperglass.exceptions.private import ConfigError
+from hyperglass.models.config.devices import Device, Devices
 
 # Local
 from .._construct import Construct
@@ -34,7 +35,7 @@ def devices():
             "credential": {"username": "", "password": ""},
             "platform": "juniper",
             "attrs": {"source4": "192.0.2.1", "source6": "2001:db8::1"},
-            "directives": ["juniper_bgp_route"],
+            "directives": ["juniper_bgp_route", "juniper_bgp_community"],
         }
     ]
 
@@ -46,7 +47,24 @@ def directives():
             "juniper_bgp_route": {
                 "name": "BGP Route",
                 "field": {"description": "test"},
-            }
+                "rules": [
+                    {"condition": r".*_$", "command": "show as-path {target}"},
+                    {
+                        "condition": "0.0.0.0/0",
+                        "command": [
+                            "show route {target} {mask} source {source4}",
+                            "show {{literal}} {target!r}",
+                        ],
+                    },
+                ],
+            },
+            "juniper_bgp_community": {
+                "name": "BGP Community",
+                "field": {"description": "test"},
+                "multiple": True,
+                "multiple_separator": None,
+                "rules": [{"condition": r"^\d+:\d+$", "command": "show community {target}"}],
+            },
         }
     ]
 
@@ -88,3 +106,48 @@ def test_construct(state):
     )
     constructor = Construct(device=state.devices["test1"], query=query)
     assert constructor.target == "192.0.2.0/24"
+
+
+def test_construct_commands(state):
+    query = Query(
+        queryLocation="test1",
+        queryTarget="192.0.2.0/24",
+        queryType="juniper_bgp_route",
+    )
+    constructor = Construct(device=state.devices["test1"], query=query)
+    assert constructor.queries() == [
+        "show route 192.0.2.0/24 255.255.255.0 source 192.0.2.1",
+        "show {literal} '192.0.2.0/24'",
+    ]
+
+    query = Query(queryLocation="test1", queryTarget="65000_", queryType="juniper_bgp_route")
+    constructor = Construct(device=state.devices["test1"], query=query)
+    assert constructor.queries() == ["show as-path 65000_"]
+
+
+def test_construct_per_target(state):
+    query = Query(
+        queryLocation="test1",
+        queryTarget=["65000:1", "65000:2", "65000:1"],
+        queryType="juniper_bgp_community",
+    )
+    assert query.per_target is True
+    # Each unique target is run as a separate query.
+    queries = query.split_targets()
+    assert [q.query_target for q in queries] == ["65000:1", "65000:2"]
+    assert [Construct(device=state.devices["test1"], query=q).queries() for q in queries] == [
+        ["show community 65000:1"],
+        ["show community 65000:2"],
+    ]
+
+
+def test_missing_attrs(state):
+    # Commands referencing missing attributes are a configuration error when devices are loaded.
+    with pytest.raises(ConfigError):
+        Device(
+            name="test2",
+            address="127.0.0.1",
+            credential={"username": "", "password": ""},
+            platform="juniper",
+            directives=["juniper_bgp_route"],
+        )
@@ -0,0 +1,38 @@
+"""Test device session limits."""
+
+# Standard Library
+import asyncio
+import threading
+from types import SimpleNamespace
+
+# Local
+from .._session import run_session, device_limit
+
+
+def test_run_session_holds_limit_until_finished():
+    device = SimpleNamespace(id="test_session_device", concurrency=1)
+    started = threading.Event()
+    finish = threading.Event()
+
+    def session() -> str:
+        started.set()
+        finish.wait(5)
+        return "done"
+
+    async def main():
+        limit = device_limit(device)
+        task = asyncio.ensure_future(run_session(device, session))
+        await asyncio.to_thread(started.wait, 5)
+
+        # Timing out the caller doesn't release the device while its session is still running.
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        assert limit.locked()
+
+        finish.set()
+        # The next session runs once the first session's thread finishes.
+        result = await asyncio.wait_for(run_session(device, lambda: "next"), timeout=5)
+        assert result == "next"
+        assert not limit.locked()
+
+    asyncio.run(main())
@@ -7,8 +7,8 @@ http client API calls, returns the output back to the front end.
 """
 
 # Standard Library
-import signal
-from typing import TYPE_CHECKING, Any, Dict, Union, Callable
+import asyncio
+from typing import TYPE_CHECKING, Dict, List, Union, Optional, Sequence
 
 # Project
 from hyperglass.log import log
@@ -34,31 +34,15 @@ def map_driver(driver_name: str) -> "Connection":
     return NetmikoConnection
 
 
-def handle_timeout(**exc_args: Any) -> Callable:
-    """Return a function signal can use to raise a timeout exception."""
-
-    def handler(*args: Any, **kwargs: Any) -> None:
-        raise DeviceTimeout(**exc_args)
-
-    return handler
-
-
-async def execute(query: "Query") -> Union["OutputDataModel", str]:
-    """Initiate query validation and execution."""
-    params = use_state("params")
-    output = params.messages.general
+async def _execute(query: "Query") -> Union["OutputDataModel", str]:
+    """Run a query on its device and validate the response."""
     _log = log.bind(query=query.summary(), device=query.device.id)
     _log.debug("")
 
     mapped_driver = map_driver(query.device.driver)
     driver: "Connection" = mapped_driver(query.device, query)
 
-    signal.signal(
-        signal.SIGALRM,
-        handle_timeout(error=TimeoutError("Connection timed out"), device=query.device),
-    )
-    signal.alarm(params.request_timeout - 1)
-
+    # Drivers limit concurrent executions on the device.
     if query.device.proxy:
         proxy = driver.setup_proxy()
         with proxy() as tunnel:
@@ -85,6 +69,35 @@ async def execute(query: "Query") -> Union["OutputDataModel", str]:
         if not output:
             raise ResponseEmpty(query=query)
 
-    signal.alarm(0)
-
     return output
+
+
+async def execute(query: "Query") -> Union["OutputDataModel", str]:
+    """Initiate query validation and execution."""
+    params = use_state("params")
+    try:
+        # Time out each execution independently, rather than with a process-wide alarm, so
+        # concurrent executions don't interfere with each other's timeouts.
+        return await asyncio.wait_for(_execute(query), timeout=params.request_timeout - 1)
+    except asyncio.TimeoutError as err:
+        raise DeviceTimeout(
+            error=TimeoutError("Connection timed out"), device=query.device
+        ) from err
+
+
+async def execute_many(
+    queries: Sequence["Query"],
+) -> List[Optional[Union["OutputDataModel", str]]]:
+    """Execute queries concurrently, in order.
+
+    The output of a query with an empty response is `None`, unless every response is empty. Any
+    other error is raised.
+    """
+    results = await asyncio.gather(*(execute(query) for query in queries), return_exceptions=True)
+    errors = [result for result in results if isinstance(result, BaseException)]
+    for error in errors:
+        if not isinstance(error, ResponseEmpty):
+            raise error
+    if errors and len(errors) == len(results):
+        raise errors[0]
+    return [None if isinstance(result, ResponseEmpty) else result for result in results]
@@ -16,7 +16,7 @@ from hyperglass.state import use_state
 
 DEFAULT_KEYS = ("asn", "ip", "prefix", "country", "rir", "allocated", "org")
 
-CACHE_KEY = "hyperglass.external.bgptools"
+CACHE_KEY = "bgptools"
 
 TargetDetail = t.TypedDict(
     "TargetDetail",
@@ -136,7 +136,7 @@ async def network_info(*targets: str) -> TargetData:
 
     default_data, query_targets = default_ip_targets(*targets)
 
-    cache = use_state("cache")
+    cache = use_state("external_cache")
 
     # Set default data structure.
     query_data = {t: dict.fromkeys(DEFAULT_KEYS, "") for t in query_targets}
@@ -0,0 +1,207 @@
+"""Resolve hostnames asynchronously, with results cached by the whole process.
+
+Device addresses and hostname query targets are resolved once per TTL, rather than each time a
+device is connected to or a query target is validated. IPv4 & IPv6 addresses are looked up in
+parallel, and failed lookups are cached for a (shorter) negative TTL. Only a limited number of
+hostnames are looked up at once, since each lookup occupies threads of the event loop's executor;
+lookups that time out are retried the next time the hostname is resolved, rather than cached.
+Hostname query targets are chosen by users, so the number of cached results is limited, and the
+least recently used results are removed first.
+"""
+
+# Standard Library
+import re
+import time
+import socket
+import typing as t
+import asyncio
+import weakref
+from functools import lru_cache
+from collections import OrderedDict
+from ipaddress import IPv4Address, IPv6Address, ip_address
+
+# Project
+from hyperglass.log import log
+
+__all__ = ("Resolver", "is_hostname", "use_resolver")
+
+IPAddress = t.Union[IPv4Address, IPv6Address]
+
+HOSTNAME_PATTERN = re.compile(
+    # One or more labels, followed by a top level domain that doesn't start with a digit.
+    r"^(?=.{1,253}\.?$)(?:(?!-)[a-z0-9-]{1,63}(?<!-)\.)+[a-z][a-z0-9-]{0,62}(?<!-)\.?$",
+    re.IGNORECASE,
+)
+
+
+def is_hostname(value: t.Any) -> bool:
+    """Determine if a value is a fully qualified hostname, rather than an IP address or prefix."""
+    return isinstance(value, str) and HOSTNAME_PATTERN.match(value) is not None
+
+
+class CacheEntry(t.NamedTuple):
+    """Addresses a hostname resolved to, empty if it couldn't be resolved."""
+
+    addresses: t.Tuple[IPAddress, ...]
+    expires: float
+
+
+class Resolver:
+    """Resolve hostnames, caching the results.
+
+    The system resolver doesn't expose the TTLs of the records it returns, so results are cached
+    for a configured TTL. Concurrent lookups of the same hostname share a single lookup, and at
+    most `concurrency` hostnames are looked up at once. A lookup's timeout starts once it's
+    running, so lookups waiting their turn don't time out.
+    """
+
+    __slots__ = (
+        "ttl",
+        "negative_ttl",
+        "timeout",
+        "concurrency",
+        "max_size",
+        "_cache",
+        "_pending",
+        "_limits",
+    )
+
+    ttl: int
+    negative_ttl: int
+    timeout: float
+    concurrency: int
+    max_size: int
+    _cache: "OrderedDict[str, CacheEntry]"
+    _pending: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, t.Dict[str, asyncio.Task]]"
+    _limits: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]"
+
+    def __init__(
+        self,
+        *,
+        ttl: int = 300,
+        negative_ttl: int = 30,
+        timeout: float = 5.0,
+        concurrency: int = 8,
+        max_size: int = 4096,
+    ) -> None:
+        """Set up resolver."""
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.max_size = max_size
+        # Least recently used first.
+        self._cache = OrderedDict()
+        # Lookups in progress, and the limit on them, are tied to the event loop running them.
+        self._pending = weakref.WeakKeyDictionary()
+        self._limits = weakref.WeakKeyDictionary()
+
+    def cached(self, hostname: str) -> t.Optional[t.Tuple[IPAddress, ...]]:
+        """Get a hostname's cached addresses, if they haven't expired."""
+        hostname = hostname.lower()
+        entry = self._cache.get(hostname)
+        if entry is None:
+            return None
+        if entry.expires < time.monotonic():
+            del self._cache[hostname]
+            return None
+        self._cache.move_to_end(hostname)
+        return entry.addresses
+
+    def _store(self, hostname: str, entry: CacheEntry) -> None:
+        """Cache a result, removing expired, then least recently used, results to make room."""
+        self._cache.pop(hostname, None)
+        now = time.monotonic()
+        for expired in [h for h, e in self._cache.items() if e.expires < now]:
+            del self._cache[expired]
+        while len(self._cache) >= self.max_size:
+            self._cache.popitem(last=False)
+        self._cache[hostname] = entry
+
+    def clear(self) -> None:
+        """Remove all cached results."""
+        self._cache.clear()
+
+    async def _lookup_family(self, hostname: str, family: socket.AddressFamily) -> t.List[str]:
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.getaddrinfo(hostname, None, family=family, type=socket.SOCK_STREAM)
+        except (socket.gaierror, UnicodeError) as err:
+            log.bind(hostname=hostname, family=family.name, error=str(err)).debug(
+                "Failed to resolve hostname"
+            )
+            return []
+        return [result[4][0] for result in results]
+
+    def _limit(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        limit = self._limits.get(loop)
+        if limit is None:
+            limit = self._limits[loop] = asyncio.Semaphore(self.concurrency)
+        return limit
+
+    async def _lookup(self, hostname: str) -> t.Optional[t.Tuple[IPAddress, ...]]:
+        async with self._limit():
+            try:
+                ipv4, ipv6 = await asyncio.wait_for(
+                    asyncio.gather(
+                        self._lookup_family(hostname, socket.AF_INET),
+                        self._lookup_family(hostname, socket.AF_INET6),
+                    ),
+                    timeout=self.timeout,
+                )
+            except asyncio.TimeoutError:
+                # Whether the hostname is resolvable is unknown, so the result isn't cached.
+                log.bind(hostname=hostname, timeout=self.timeout).warning(
+                    "Timed out resolving hostname"
+                )
+                return None
+
+        # IPv4 addresses are preferred, and each address is only included once, in order.
+        addresses = tuple(ip_address(address) for address in dict.fromkeys((*ipv4, *ipv6)))
+        ttl = self.ttl if addresses else self.negative_ttl
+        self._store(hostname, CacheEntry(addresses, time.monotonic() + ttl))
+        log.bind(hostname=hostname, addresses=[str(a) for a in addresses]).debug(
+            "Resolved hostname"
+        )
+        return addresses
+
+    async def lookup(self, hostname: str) -> t.Optional[t.Tuple[IPAddress, ...]]:
+        """Get the addresses a hostname resolves to, or `None` if the lookup timed out.
+
+        IP addresses are returned as they are, without a lookup.
+        """
+        try:
+            return (ip_address(hostname),)
+        except ValueError:
+            pass
+
+        hostname = hostname.lower()
+        cached = self.cached(hostname)
+        if cached is not None:
+            return cached
+
+        pending = self._pending.setdefault(asyncio.get_running_loop(), {})
+        task = pending.get(hostname)
+        if task is None:
+            task = pending[hostname] = asyncio.ensure_future(self._lookup(hostname))
+            task.add_done_callback(lambda _: pending.pop(hostname, None))
+        # A cancelled caller doesn't cancel the lookup for others waiting on it.
+        return await asyncio.shield(task)
+
+    async def resolve(self, hostname: str) -> t.Tuple[IPAddress, ...]:
+        """Get the addresses a hostname resolves to, or an empty tuple if it can't be resolved."""
+        return await self.lookup(hostname) or ()
+
+    async def address(self, hostname: str) -> t.Optional[str]:
+        """Get the preferred address a hostname resolves to, if it can be resolved."""
+        addresses = await self.resolve(hostname)
+        if addresses:
+            return str(addresses[0])
+        return None
+
+
+@lru_cache
+def use_resolver(ttl: int = 300, negative_ttl: int = 30, timeout: float = 5.0) -> Resolver:
+    """Get the resolver for a configuration, shared by the whole process."""
+    return Resolver(ttl=ttl, negative_ttl=negative_ttl, timeout=timeout)
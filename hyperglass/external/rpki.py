@@ -2,10 +2,16 @@
 
 # Standard Library
 import typing as t
+import asyncio
+import weakref
+
+# Third Party
+import httpx
 
 # Project
 from hyperglass.log import log
 from hyperglass.state import use_state
+from hyperglass.settings import Settings
 from hyperglass.external._base import BaseExternal
 
 if t.TYPE_CHECKING:
@@ -14,7 +20,21 @@ if t.TYPE_CHECKING:
 
 RPKI_STATE_MAP = {"Invalid": 0, "Valid": 1, "NotFound": 2, "DEFAULT": 3}
 RPKI_NAME_MAP = {v: k for k, v in RPKI_STATE_MAP.items()}
-CACHE_KEY = "hyperglass.external.rpki"
+CACHE_KEY = "rpki"
+RPKI_URL = "https://rpki.cloudflare.com"
+
+# Number of validations requested in a single GraphQL query.
+BATCH_SIZE = 100
+
+# Number of GraphQL queries sent concurrently.
+MAX_CONNECTIONS = 4
+
+RPKIPair = t.Tuple[str, int]
+
+# One pooled client per event loop, since an async client can't be shared between loops.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
 
 
 def rpki_state(prefix: t.Union["IPv4Address", "IPv6Address", str], asn: t.Union[int, str]) -> int:
@@ -22,7 +42,7 @@ def rpki_state(prefix: t.Union["IPv4Address", "IPv6Address", str], asn: t.Union[
     _log = log.bind(prefix=prefix, asn=asn)
     _log.debug("Validating RPKI State")
 
-    cache = use_state("cache")
+    cache = use_state("external_cache")
 
     state = 3
     ro = f"{prefix!s}@{asn!s}"
@@ -57,3 +77,98 @@ def rpki_state(prefix: t.Union["IPv4Address", "IPv6Address", str], asn: t.Union[
 
     log.debug(msg)
     return state
+
+
+def _async_client() -> httpx.AsyncClient:
+    """Get a pooled client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        context = httpx.create_ssl_context(verify=True)
+        if Settings.ca_cert is not None:
+            context.load_verify_locations(cafile=str(Settings.ca_cert))
+        client = httpx.AsyncClient(
+            base_url=RPKI_URL,
+            timeout=10,
+            verify=context,
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS),
+        )
+        _clients[loop] = client
+    return client
+
+
+def _cache_item(pair: RPKIPair) -> str:
+    prefix, asn = pair
+    return f"{prefix!s}@{asn!s}"
+
+
+def validations_query(pairs: t.Sequence[RPKIPair]) -> str:
+    """Construct a GraphQL query for multiple validations, each with an alias of its index."""
+    fields = " ".join(
+        f'v{index}: validation(prefix: "{prefix}", asn: {asn}) {{ state }}'
+        for index, (prefix, asn) in enumerate(pairs)
+    )
+    return f"query GetValidations {{ {fields} }}"
+
+
+async def _validate_batch(
+    client: httpx.AsyncClient, pairs: t.Sequence[RPKIPair]
+) -> t.Dict[RPKIPair, int]:
+    """Validate a batch of prefix/origin pairs in a single request."""
+    response = await client.post("/api/graphql", json={"query": validations_query(pairs)})
+    response.raise_for_status()
+    data = response.json().get("data") or {}
+    states = {}
+    for index, pair in enumerate(pairs):
+        try:
+            states[pair] = RPKI_STATE_MAP[data[f"v{index}"]["state"]]
+        except (KeyError, TypeError):
+            log.bind(prefix=pair[0], asn=pair[1]).error("Response from Cloudflare missing state")
+    return states
+
+
+async def rpki_states(pairs: t.Iterable[RPKIPair], *, timeout: float) -> t.Dict[RPKIPair, int]:
+    """Get the RPKI state of multiple prefix/origin pairs.
+
+    Duplicate pairs are validated once, and uncached pairs are validated concurrently in
+    batches. Pairs that can't be validated before `timeout` seconds elapse are given the
+    unknown state (3), which isn't cached.
+    """
+    unique = list(dict.fromkeys((str(prefix), int(asn)) for prefix, asn in pairs))
+    cache = use_state("external_cache")
+    cached = cache.get_map_items(CACHE_KEY, [_cache_item(pair) for pair in unique])
+    states = {pair: cached[_cache_item(pair)] for pair in unique if _cache_item(pair) in cached}
+    missing = [pair for pair in unique if pair not in states]
+
+    _log = log.bind(pairs=len(unique), cached=len(states), missing=len(missing))
+    _log.debug("Validating RPKI State")
+
+    if missing:
+        client = _async_client()
+        tasks = [
+            asyncio.create_task(_validate_batch(client, missing[i : i + BATCH_SIZE]))
+            for i in range(0, len(missing), BATCH_SIZE)
+        ]
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+
+        validated = {}
+        for task in done:
+            if task.exception() is not None:
+                _log.bind(error=str(task.exception())).error("Failed to validate RPKI State")
+                continue
+            validated.update(task.result())
+
+        if validated:
+            with cache.pipeline() as pipeline:
+                for pair, state in validated.items():
+                    pipeline.set_map_item(CACHE_KEY, _cache_item(pair), state)
+
+        if pending:
+            _log.bind(timeout=timeout, unvalidated=len(missing) - len(validated)).warning(
+                "RPKI validation did not complete in time"
+            )
+        states.update(validated)
+
+    return {pair: states.get(pair, 3) for pair in unique}
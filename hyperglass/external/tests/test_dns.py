@@ -0,0 +1,153 @@
+"""Test cached DNS resolution."""
+
+# Standard Library
+import time
+import socket
+import asyncio
+from ipaddress import ip_address
+from concurrent.futures import ThreadPoolExecutor
+
+# Project
+from hyperglass.util import resolve_hostnames
+
+# Local
+from ..dns import Resolver, is_hostname
+
+DELAY = 0.1
+
+RECORDS = {
+    ("router.example.com", socket.AF_INET): ["192.0.2.1"],
+    ("router.example.com", socket.AF_INET6): ["2001:db8::1", "2001:db8::1"],
+    ("v6.example.com", socket.AF_INET6): ["2001:db8::2"],
+}
+
+
+class FakeLookups:
+    """Answer lookups from `RECORDS` after a delay, and record each lookup."""
+
+    def __init__(self, delay: float = DELAY) -> None:
+        self.delay = delay
+        self.lookups = []
+
+    async def getaddrinfo(self, host, port, *, family, type):
+        self.lookups.append((host, family))
+        await asyncio.sleep(self.delay)
+        addresses = RECORDS.get((host, family))
+        if addresses is None:
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        return [(family, type, 6, "", (address, 0)) for address in addresses]
+
+
+class BlockingLookups(FakeLookups):
+    """Answer lookups after blocking a thread of a small pool, like the system resolver."""
+
+    def __init__(self, delay: float = DELAY, workers: int = 4) -> None:
+        super().__init__(delay)
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+
+    async def getaddrinfo(self, host, port, *, family, type):
+        self.lookups.append((host, family))
+        await asyncio.get_running_loop().run_in_executor(self.pool, time.sleep, self.delay)
+        return [(family, type, 6, "", (f"192.0.2.{len(self.lookups) % 250}", 0))]
+
+
+def _run(coro_function, lookups: FakeLookups):
+    async def main():
+        loop = asyncio.get_running_loop()
+        loop.getaddrinfo = lookups.getaddrinfo
+        return await coro_function()
+
+    return asyncio.run(main())
+
+
+def test_is_hostname():
+    for value in ("router.example.com", "ROUTER.example.com.", "a-1.example.net"):
+        assert is_hostname(value), value
+    for value in ("192.0.2.1", "192.0.2.0/24", "2001:db8::1", "65000", "65000:1", "localhost"):
+        assert not is_hostname(value), value
+    assert not is_hostname(["router.example.com"])
+
+
+def test_resolve():
+    resolver = Resolver()
+    lookups = FakeLookups()
+
+    async def resolve():
+        return await asyncio.gather(
+            *(resolver.resolve(h) for h in ("router.example.com", "Router.Example.com")),
+            resolver.resolve("v6.example.com"),
+            resolver.resolve("192.0.2.10"),
+        )
+
+    start = time.perf_counter()
+    router, same, v6, literal = _run(resolve, lookups)
+    # IPv4 & IPv6 lookups run in parallel, and concurrent lookups of a hostname are shared.
+    assert time.perf_counter() - start < DELAY * 2
+
+    assert router == same == (ip_address("192.0.2.1"), ip_address("2001:db8::1"))
+    assert v6 == (ip_address("2001:db8::2"),)
+    assert literal == (ip_address("192.0.2.10"),)
+    assert len(lookups.lookups) == 4
+
+    # Cached results are used until they expire.
+    assert _run(lambda: resolver.address("router.example.com"), lookups) == "192.0.2.1"
+    assert len(lookups.lookups) == 4
+
+    resolver.ttl = 0
+    resolver.clear()
+    _run(lambda: resolver.resolve("router.example.com"), lookups)
+    _run(lambda: resolver.resolve("router.example.com"), lookups)
+    assert len(lookups.lookups) == 8
+
+
+def test_negative_cache():
+    resolver = Resolver(negative_ttl=60)
+    lookups = FakeLookups()
+    for _ in range(2):
+        assert _run(lambda: resolver.resolve("missing.example.com"), lookups) == ()
+        assert _run(lambda: resolver.address("missing.example.com"), lookups) is None
+    assert len(lookups.lookups) == 2
+
+
+def test_cache_size():
+    resolver = Resolver(max_size=2, negative_ttl=0)
+    lookups = FakeLookups(delay=0)
+    for hostname in ("router.example.com", "v6.example.com"):
+        _run(lambda: resolver.resolve(hostname), lookups)
+    # Using a result makes it the most recently used.
+    assert resolver.cached("router.example.com") is not None
+
+    # The least recently used result is removed to make room.
+    _run(lambda: resolver.resolve("missing.example.com"), lookups)
+    assert resolver.cached("v6.example.com") is None
+    # Expired results are removed first.
+    _run(lambda: resolver.resolve("v6.example.com"), lookups)
+    assert list(resolver._cache) == ["router.example.com", "v6.example.com"]
+    _run(lambda: resolver.resolve("other.example.com"), lookups)
+    assert list(resolver._cache) == ["v6.example.com", "other.example.com"]
+
+
+def test_timeout():
+    resolver = Resolver(timeout=DELAY / 2, negative_ttl=60)
+    lookups = FakeLookups()
+    assert _run(lambda: resolver.resolve("router.example.com"), lookups) == ()
+    # Whether a timed out hostname is resolvable is unknown, so it's looked up again next time.
+    assert resolver.cached("router.example.com") is None
+    resolved = _run(lambda: resolve_hostnames("router.example.com", resolver=resolver), lookups)
+    assert resolved == {"router.example.com": None}
+    assert len(lookups.lookups) == 4
+
+
+def test_many_slow_lookups():
+    # Far more lookups than threads to run them, which each take a large part of the timeout.
+    delay = 0.02
+    resolver = Resolver(timeout=delay * 5, concurrency=2)
+    lookups = BlockingLookups(delay, workers=4)
+    hostnames = [f"router{i}.example.com" for i in range(50)]
+    try:
+        resolved = _run(lambda: resolve_hostnames(*hostnames, resolver=resolver), lookups)
+    finally:
+        lookups.pool.shutdown()
+    # Lookups waiting for others to finish don't time out.
+    assert resolved == {hostname: True for hostname in hostnames}
+    assert len(lookups.lookups) == 100
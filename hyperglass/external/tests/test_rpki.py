@@ -24,3 +24,63 @@ def test_rpki():
                 prefix, asn, result, result_name, expected, expected_name
             )
         )
+
+
+def test_rpki_states(monkeypatch):
+    # Standard Library
+    import json
+    import asyncio
+
+    # Third Party
+    import httpx
+
+    # Project
+    from hyperglass.state import use_state
+
+    # Local
+    from .. import rpki
+
+    requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        query = json.loads(request.content)["query"]
+        requests.append(query)
+        if "192.0.2.0/24" in query:
+            # Never respond before the deadline.
+            await asyncio.sleep(5)
+        data = {f"v{i}": {"state": "Valid"} for i in range(query.count("validation("))}
+        return httpx.Response(200, json={"data": data})
+
+    def client() -> httpx.AsyncClient:
+        return httpx.AsyncClient(base_url=rpki.RPKI_URL, transport=httpx.MockTransport(handler))
+
+    monkeypatch.setattr(rpki, "_async_client", client)
+    monkeypatch.setattr(rpki, "BATCH_SIZE", 2)
+    cache = use_state("external_cache")
+    pairs = [
+        ("198.51.100.0/24", 64496),
+        ("203.0.113.0/24", 64497),
+        ("198.51.100.0/24", 64496),
+        ("192.0.2.0/24", 64498),
+    ]
+    try:
+        states = asyncio.run(rpki.rpki_states(pairs, timeout=0.5))
+        # Duplicates are validated once, in batches of two.
+        assert len(requests) == 2
+        assert requests[0].count("validation(") == 2
+        assert states == {
+            ("198.51.100.0/24", 64496): 1,
+            ("203.0.113.0/24", 64497): 1,
+            # The batch containing this pair did not complete before the deadline.
+            ("192.0.2.0/24", 64498): 3,
+        }
+        assert cache.get_map(rpki.CACHE_KEY, "198.51.100.0/24@64496") == 1
+        assert cache.get_map(rpki.CACHE_KEY, "192.0.2.0/24@64498") is None
+
+        # Cached pairs are not validated again.
+        states = asyncio.run(rpki.rpki_states(pairs[:2], timeout=0.5))
+        assert len(requests) == 2
+        assert set(states.values()) == {1}
+    finally:
+        for pair in pairs:
+            cache.instance.hdel(cache.key(rpki.CACHE_KEY), rpki._cache_item(pair))
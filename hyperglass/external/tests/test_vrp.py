@@ -0,0 +1,93 @@
+"""Test local RPKI validation."""
+
+# Standard Library
+import os
+import json
+from pathlib import Path
+from ipaddress import ip_network
+
+# Local
+from ..vrp import LocalVRPs, VRPTable, read_vrps
+
+VRPS = {
+    "roas": [
+        {"asn": "AS13335", "prefix": "1.1.1.0/24", "maxLength": 24, "ta": "apnic"},
+        {"asn": 64496, "prefix": "198.51.100.0/22", "maxLength": 23, "ta": "arin"},
+        {"asn": "AS0", "prefix": "203.0.113.0/24", "maxLength": 32, "ta": "ripe"},
+        {"asn": "AS64497", "prefix": "2001:db8::/32", "maxLength": 48, "ta": "ripe"},
+    ]
+}
+
+CSV = """ASN,IP Prefix,Max Length,Trust Anchor
+AS13335,1.1.1.0/24,24,apnic
+AS64496,198.51.100.0/22,23,arin
+AS0,203.0.113.0/24,32,ripe
+AS64497,2001:db8::/32,48,ripe
+"""
+
+CHECKS = (
+    ("1.1.1.0/24", 13335, 1),
+    ("1.1.1.0/24", 64496, 0),
+    # More specific than the VRP's max length.
+    ("1.1.1.0/25", 13335, 0),
+    ("198.51.100.0/23", 64496, 1),
+    ("198.51.102.0/23", 64496, 1),
+    ("198.51.100.0/24", 64496, 0),
+    ("198.51.96.0/20", 64496, 2),
+    ("203.0.113.0/24", 0, 0),
+    ("2001:db8:1::/48", 64497, 1),
+    ("2001:db8:1::/64", 64497, 0),
+    ("2001:db9::/32", 64497, 2),
+    ("8.8.8.0/24", 15169, 2),
+)
+
+
+def _check(table: VRPTable) -> None:
+    for prefix, asn, expected in CHECKS:
+        result = table.state(ip_network(prefix), asn)
+        assert result == expected, f"RPKI State for {prefix} via AS{asn} is {result}"
+
+
+def test_vrp_json(tmp_path: Path):
+    path = tmp_path / "vrps.json"
+    path.write_text(json.dumps(VRPS))
+    table = VRPTable(read_vrps(path))
+    assert table.count == 4
+    _check(table)
+
+
+def test_vrp_csv(tmp_path: Path):
+    path = tmp_path / "vrps.csv"
+    path.write_text(CSV)
+    table = VRPTable(read_vrps(path))
+    assert table.count == 4
+    _check(table)
+
+
+def test_vrp_reload(tmp_path: Path, monkeypatch):
+    # Local
+    from .. import vrp
+
+    monkeypatch.setattr(vrp, "CHECK_INTERVAL", 0)
+    path = tmp_path / "vrps.csv"
+    path.write_text(CSV)
+    vrps = LocalVRPs(path)
+    assert vrps.state(ip_network("8.8.8.0/24"), 15169) == 2
+
+    # The changed file is loaded in the background.
+    previous = vrps.table()
+    path.write_text(CSV + "AS15169,8.8.8.0/24,24,arin\n")
+    os.utime(path, ns=(0, 1))
+    vrps.table()
+    vrps._reloader.join()
+    assert vrps.table() is not previous
+    assert vrps.state(ip_network("8.8.8.0/24"), 15169) == 1
+
+    # An unreadable file keeps the previous table in use.
+    previous = vrps.table()
+    path.write_text("{")
+    os.utime(path, ns=(0, 2))
+    vrps.table()
+    vrps._reloader.join()
+    assert vrps.table() is previous
+    assert vrps.state(ip_network("8.8.8.0/24"), 15169) == 1
@@ -0,0 +1,188 @@
+"""Validate RPKI state locally, from an export of Validated ROA Payloads (VRPs).
+
+Supported formats are the JSON and CSV exports of common relying party software, such as
+rpki-client and Routinator:
+
+JSON:
+    {"roas": [{"asn": "AS13335", "prefix": "1.1.1.0/24", "maxLength": 24, "ta": "apnic"}]}
+
+CSV:
+    ASN,IP Prefix,Max Length,Trust Anchor
+    AS13335,1.1.1.0/24,24,apnic
+"""
+
+# Standard Library
+import csv
+import json
+import time
+import typing as t
+import threading
+from pathlib import Path
+from socket import AF_INET, AF_INET6, inet_pton
+from functools import lru_cache
+from ipaddress import IPv4Network, IPv6Network
+
+# Project
+from hyperglass.log import log
+
+__all__ = ("VRPTable", "LocalVRPs", "read_vrps", "use_vrps")
+
+# Minimum number of seconds between checks for changes to a VRP file.
+CHECK_INTERVAL = 1
+
+VRP = t.Tuple[str, int, int]
+
+
+def _asn(value: t.Union[str, int]) -> int:
+    """Get an ASN from a value such as `AS65000`, `65000`, or 65000."""
+    if isinstance(value, str):
+        value = value.strip().upper().removeprefix("AS")
+    return int(value)
+
+
+def read_vrps(path: Path) -> t.Generator[VRP, None, None]:
+    """Read the prefix, max length, and ASN of each VRP in a JSON or CSV export."""
+    with path.open("r") as f:
+        content = f.read()
+
+    if content.lstrip().startswith("{"):
+        data = json.loads(content)
+        for vrp in data.get("roas", data.get("vrps", ())):
+            yield (vrp["prefix"], int(vrp["maxLength"]), _asn(vrp["asn"]))
+        return
+
+    for row in csv.reader(content.splitlines()):
+        if len(row) < 3 or not row[0].strip().upper().removeprefix("AS").isdigit():
+            # Skip headers & blank lines.
+            continue
+        asn, prefix, max_length = row[:3]
+        yield (prefix.strip(), int(max_length), _asn(asn))
+
+
+class VRPTable:
+    """VRPs indexed by address family, prefix length, and network address.
+
+    Route origin validation follows RFC 6811: a route is valid if any VRP covering its prefix
+    has a matching origin ASN and a max length no shorter than the route's prefix length,
+    invalid if VRPs cover its prefix but none match, and not found if no VRP covers its prefix.
+    """
+
+    __slots__ = ("count", "_tables")
+
+    count: int
+    _tables: t.Dict[int, t.Tuple[t.Tuple[int, t.Dict[int, t.List[t.Tuple[int, int]]]], ...]]
+
+    def __init__(self, vrps: t.Iterable[VRP]) -> None:
+        """Index VRPs."""
+        tables: t.Dict[int, t.Dict[int, t.Dict[int, t.List[t.Tuple[int, int]]]]] = {4: {}, 6: {}}
+        count = 0
+        for prefix, max_length, asn in vrps:
+            # Parsing addresses with socket is much faster than with ipaddress, which matters
+            # when loading hundreds of thousands of VRPs.
+            address, length = prefix.split("/")
+            version, family, bits = (6, AF_INET6, 128) if ":" in address else (4, AF_INET, 32)
+            length = int(length)
+            key = int.from_bytes(inet_pton(family, address), "big") >> (bits - length)
+            tables[version].setdefault(length, {}).setdefault(key, []).append((max_length, asn))
+            count += 1
+
+        self.count = count
+        # Store each family's prefix lengths in ascending order, so a lookup can stop at the
+        # route's own prefix length.
+        self._tables = {version: tuple(sorted(table.items())) for version, table in tables.items()}
+
+    def state(self, prefix: t.Union[IPv4Network, IPv6Network], asn: int) -> int:
+        """Get the RPKI state of a prefix & origin ASN."""
+        address = int(prefix.network_address)
+        covered = False
+        for length, networks in self._tables[prefix.version]:
+            if length > prefix.prefixlen:
+                break
+            vrps = networks.get(address >> (prefix.max_prefixlen - length))
+            if vrps is None:
+                continue
+            covered = True
+            for max_length, vrp_asn in vrps:
+                # VRPs for AS0 never match an origin (RFC 6483).
+                if vrp_asn == asn and asn != 0 and prefix.prefixlen <= max_length:
+                    return 1
+        return 0 if covered else 2
+
+
+class LocalVRPs:
+    """Load VRPs from a file, and reload them when the file changes.
+
+    The first load happens in the calling thread. Subsequent reloads happen in a background
+    thread, and lookups use the previous table until the new one is completely loaded.
+    """
+
+    path: Path
+    _table: t.Optional[VRPTable]
+    _signature: t.Optional[t.Tuple[int, int]]
+    _checked: float
+    _reloader: t.Optional[threading.Thread]
+
+    def __init__(self, path: Path) -> None:
+        """Set up VRP file."""
+        self.path = path
+        self._table = None
+        self._signature = None
+        self._checked = 0.0
+        self._reloader = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> None:
+        _log = log.bind(path=self.path)
+        start = time.perf_counter()
+        try:
+            table = VRPTable(read_vrps(self.path))
+        except Exception as err:
+            # Keep using the previous table, if one exists, until the file changes again.
+            _log.bind(error=str(err)).error("Failed to load VRPs")
+            return
+        # Swap the complete table in at once; lookups in progress keep using the previous table.
+        self._table = table
+        _log.bind(vrps=table.count, seconds=round(time.perf_counter() - start, 3)).info(
+            "Loaded VRPs"
+        )
+
+    def table(self) -> t.Optional[VRPTable]:
+        """Get the current VRP table, and reload it if the file has changed."""
+        if time.monotonic() - self._checked < CHECK_INTERVAL:
+            return self._table
+
+        with self._lock:
+            self._checked = time.monotonic()
+            try:
+                stat = self.path.stat()
+            except OSError as err:
+                log.bind(path=self.path, error=str(err)).error("Failed to read VRP file")
+                return self._table
+
+            signature = (stat.st_mtime_ns, stat.st_size)
+            reloading = self._reloader is not None and self._reloader.is_alive()
+            # If the file changes during a reload, it's checked again after the reload finishes.
+            if signature != self._signature and not reloading:
+                self._signature = signature
+                if self._table is None:
+                    self._load()
+                else:
+                    self._reloader = threading.Thread(
+                        target=self._load, name="vrp-reload", daemon=True
+                    )
+                    self._reloader.start()
+
+        return self._table
+
+    def state(self, prefix: t.Union[IPv4Network, IPv6Network], asn: int) -> int:
+        """Get the RPKI state of a prefix & origin ASN, or unknown if no VRPs are loaded."""
+        table = self.table()
+        if table is None:
+            return 3
+        return table.state(prefix, asn)
+
+
+@lru_cache
+def use_vrps(path: Path) -> LocalVRPs:
+    """Get the VRP loader for a file, shared by the whole process."""
+    return LocalVRPs(path)
@@ -7,16 +7,98 @@ import math
 import shutil
 import typing as t
 import asyncio
+import hashlib
 from pathlib import Path
+from functools import lru_cache
 
 # Project
 from hyperglass.log import log
-from hyperglass.util import copyfiles, check_path, move_files, dotenv_to_dict
+from hyperglass.util import copyfiles, check_path, move_files, get_node_version
+from hyperglass.constants import MIN_NODE_VERSION
 
 if t.TYPE_CHECKING:
     # Project
     from hyperglass.models.ui import UIParameters
 
+UI_PATH = Path(__file__).parent.parent / "ui"
+
+# Directories in the UI directory that aren't part of the UI source.
+UI_IGNORED_DIRECTORIES = ("node_modules", ".next", "out")
+
+# Files in the UI directory that are written by hyperglass or by the UI build, rather than being
+# part of the UI source. Custom files & UI parameters are hashed from their sources instead.
+UI_IGNORED_FILES = ("hyperglass.json", "custom.js", "custom.html", ".DS_Store")
+UI_IGNORED_PREFIXES = (".env",)
+UI_IGNORED_SUFFIXES = (".tsbuildinfo", ".log")
+
+# File in the static directory recording the inputs of each step of the last build.
+BUILD_MANIFEST = ".build.json"
+
+
+def hash_files(*paths: t.Optional[Path], root: t.Optional[Path] = None) -> str:
+    """Hash the names & contents of files, relative to `root` if provided."""
+    digest = hashlib.sha256()
+    for path in paths:
+        if path is None:
+            digest.update(b"\x00")
+            continue
+        name = path.relative_to(root) if root is not None else path
+        digest.update(f"{name!s}\n".encode())
+        try:
+            digest.update(hashlib.sha256(path.read_bytes()).digest())
+        except OSError:
+            digest.update(b"missing")
+    return digest.hexdigest()
+
+
+def ui_source_files() -> t.List[Path]:
+    """Get all UI source files, including the lockfile, in a stable order."""
+    files = []
+    for directory, directories, names in os.walk(UI_PATH):
+        directories[:] = sorted(d for d in directories if d not in UI_IGNORED_DIRECTORIES)
+        for name in sorted(names):
+            if (
+                name in UI_IGNORED_FILES
+                or name.startswith(UI_IGNORED_PREFIXES)
+                or name.endswith(UI_IGNORED_SUFFIXES)
+            ):
+                continue
+            files.append(Path(directory) / name)
+    return files
+
+
+class BuildManifest:
+    """Inputs of each step of the last build.
+
+    Each step is identified by a hash of its inputs. If a step's inputs are unchanged and its
+    outputs still exist, the step is skipped.
+    """
+
+    path: Path
+    steps: t.Dict[str, str]
+
+    def __init__(self, path: Path) -> None:
+        """Read the manifest, if it exists."""
+        self.path = path
+        try:
+            self.steps = json.loads(path.read_text())
+        except (OSError, ValueError):
+            self.steps = {}
+
+    def fresh(self, step: str, key: str, *outputs: Path) -> bool:
+        """Determine if a step's inputs are unchanged since its outputs were created."""
+        return self.steps.get(step) == key and all(p.exists() for p in outputs)
+
+    def record(self, step: str, key: str) -> None:
+        """Record the inputs of a completed step."""
+        self.steps[step] = key
+
+    def write(self) -> None:
+        """Write the manifest."""
+        temp = self.path.with_suffix(".tmp")
+        temp.write_text(json.dumps(self.steps, indent=2, sort_keys=True))
+        os.replace(temp, self.path)
+
 
 def get_ui_build_timeout() -> t.Optional[int]:
     """Read the UI build timeout from environment variables or set a default."""
@@ -29,6 +111,19 @@ def get_ui_build_timeout() -> t.Optional[int]:
     return timeout
 
 
+@lru_cache
+def check_node_version() -> t.Tuple[int, int, int]:
+    """Ensure the NodeJS version meets the minimum requirements."""
+    node_major, node_minor, node_patch = get_node_version()
+
+    if node_major < MIN_NODE_VERSION:
+        installed = ".".join(str(v) for v in (node_major, node_minor, node_patch))
+        raise RuntimeError(
+            f"NodeJS {MIN_NODE_VERSION!s}+ is required (version {installed} installed)"
+        )
+    return node_major, node_minor, node_patch
+
+
 async def check_node_modules() -> bool:
     """Check if node_modules exists and has contents."""
 
@@ -61,6 +156,7 @@ async def read_package_json() -> t.Dict[str, t.Any]:
 
 async def node_initial(timeout: int = 180, dev_mode: bool = False) -> str:
     """Initialize node_modules."""
+    check_node_version()
 
     ui_path = Path(__file__).parent.parent / "ui"
 
@@ -95,6 +191,7 @@ async def build_ui(app_path: Path):
         RuntimeError: Raised if exit code is not 0.
         RuntimeError: Raised when any other error occurs.
     """
+    check_node_version()
     timeout = get_ui_build_timeout()
 
     ui_dir = Path(__file__).parent.parent / "ui"
@@ -161,11 +258,7 @@ def generate_opengraph(
     # Convert image to JPEG format with static name "opengraph.jpg"
     dst_path = target_path / "opengraph.jpg"
 
-    # Copy the original image to the target path
-    copied = shutil.copy2(image_path, target_path)
-    log.bind(source=str(image_path), destination=str(target_path)).debug("Copied OpenGraph image")
-
-    with Image.open(copied) as src:
+    with Image.open(image_path) as src:
         # Only resize the image if it needs to be resized
         if src.size[0] != max_width or src.size[1] != max_height:
             # Resize image while maintaining aspect ratio
@@ -185,9 +278,6 @@ def generate_opengraph(
         # Save new image to derived target path
         dst.save(dst_path)
 
-        # Delete the copied image
-        Path(copied).unlink()
-
         if not dst_path.exists():
             raise RuntimeError(f"Unable to save resized image to {str(dst_path)}")
         log.bind(path=str(dst_path)).debug("OpenGraph image ready")
@@ -195,6 +285,21 @@ def generate_opengraph(
     return True
 
 
+def generate_favicons(source: Path, output_directory: Path) -> t.Tuple[t.Dict[str, t.Any], ...]:
+    """Generate favicons in all supported formats, and get the generated formats."""
+    # Third Party
+    from favicons import Favicons  # type:ignore
+
+    with Favicons(
+        source=source,
+        output_directory=output_directory,
+        base_url="/images/favicons/",
+    ) as favicons:
+        favicons.generate()
+        log.bind(count=favicons.completed).debug("Generated favicons")
+        return favicons.formats()
+
+
 def migrate_images(app_path: Path, params: "UIParameters"):
     """Migrate images from source code to install directory."""
     images_dir = app_path / "static" / "images"
@@ -260,26 +365,27 @@ async def build_frontend(  # noqa: C901
     timeout: int = 180,
     full: bool = False,
 ) -> bool:
-    """Perform full frontend UI build process."""
-    # Standard Library
-    import hashlib
+    """Perform full frontend UI build process.
 
-    # Third Party
-    from favicons import Favicons  # type:ignore
+    Each step is skipped if its inputs are unchanged since the last build (unless `force` is
+    set): the UI is rebuilt only if UI parameters, the UI source, its lockfile, or custom files
+    change, and images, favicons & the OpenGraph image are only processed if their source images
+    change. Image steps run in parallel.
+    """
+    # Standard Library
+    from importlib.metadata import version
 
     # Project
     from hyperglass.constants import __version__
 
     # Create temporary file. json file extension is added for easy
     # webpack JSON parsing.
-    dot_env_file = Path(__file__).parent.parent / "ui" / ".env"
+    dot_env_file = UI_PATH / ".env"
     env_config = {}
 
-    ui_config_file = Path(__file__).parent.parent / "ui" / "hyperglass.json"
-
-    ui_config_file.write_text(params.export_json(by_alias=True))
-
-    package_json = await read_package_json()
+    ui_config_file = UI_PATH / "hyperglass.json"
+    ui_config = params.export_json(by_alias=True)
+    ui_config_file.write_text(ui_config)
 
     # Set NextJS production/development mode and base URL based on
     # developer_mode setting.
@@ -306,73 +412,88 @@ async def build_frontend(  # noqa: C901
 
     images_dir = app_path / "static" / "images"
     favicon_dir = images_dir / "favicons"
+    build_dir = app_path / "static" / "ui"
+    check_path(favicon_dir, create=True)
 
-    if not favicon_dir.exists():
-        favicon_dir.mkdir()
-
-    async with Favicons(
-        source=params.web.logo.favicon,
-        output_directory=favicon_dir,
-        base_url="/images/favicons/",
-    ) as favicons:
-        await favicons.generate()
-        log.bind(count=favicons.completed).debug("Generated favicons")
-        write_favicon_formats(favicons.formats())
-
-    build_data = {
-        "params": params.export_dict(),
-        "version": __version__,
-        "package_json": package_json,
-    }
-
-    build_json = json.dumps(build_data, default=str)
-
-    # Create SHA256 hash from all parameters passed to UI, use as
-    # build identifier.
-    build_id = hashlib.sha256(build_json.encode()).hexdigest()
+    manifest = BuildManifest(app_path / "static" / BUILD_MANIFEST)
+    logo = params.web.logo
 
-    # Read hard-coded environment file from last build. If build ID
-    # matches this build's ID, don't run a new build.
-    if dot_env_file.exists() and not force:
-        env_data = dotenv_to_dict(dot_env_file)
-        env_build_id = env_data.get("HYPERGLASS_BUILD_ID", "None")
-        log.bind(id=env_build_id).debug("Previous build detected")
+    async def images() -> None:
+        key = hash_files(logo.light, logo.dark, logo.favicon)
+        outputs = (
+            images_dir / f"{image}{getattr(logo, image).suffix}"
+            for image in ("light", "dark", "favicon")
+        )
+        if not force and manifest.fresh("images", key, *outputs):
+            log.debug("Images unchanged since last build, skipping image migration")
+            return
+        await asyncio.to_thread(migrate_images, app_path, params)
+        manifest.record("images", key)
+
+    async def favicons() -> None:
+        key = f"{hash_files(logo.favicon)}:{version('favicons')}"
+        if not force and manifest.fresh("favicons", key, favicon_dir / "favicon.ico"):
+            log.debug("Favicon unchanged since last build, skipping favicon generation")
+            return
+        formats = await asyncio.to_thread(generate_favicons, logo.favicon, favicon_dir)
+        write_favicon_formats(formats)
+        manifest.record("favicons", key)
+
+    async def opengraph() -> None:
+        image = params.web.opengraph.image
+        background = params.web.theme.colors.black
+        key = f"{hash_files(image)}:{background}"
+        if not force and manifest.fresh("opengraph", key, images_dir / "opengraph.jpg"):
+            log.debug("OpenGraph image unchanged since last build, skipping generation")
+            return
+        await asyncio.to_thread(generate_opengraph, image, 1200, 630, images_dir, background)
+        manifest.record("opengraph", key)
 
-        if env_build_id == build_id:
-            log.debug("UI parameters unchanged since last build, skipping UI build...")
+    try:
+        await asyncio.gather(images(), favicons(), opengraph())
+
+        # Custom files are part of the UI build, so they must be written before it starts.
+        write_custom_files(params)
+
+        build_data = {
+            "params": ui_config,
+            "version": __version__,
+            "env": env_config,
+            "source": hash_files(*ui_source_files(), root=UI_PATH),
+            "custom": hash_files(params.web.custom_javascript, params.web.custom_html),
+        }
+
+        # Create SHA256 hash from all inputs to the UI build, use as build identifier.
+        build_id = hashlib.sha256(json.dumps(build_data, sort_keys=True).encode()).hexdigest()
+        env_config.update({"HYPERGLASS_BUILD_ID": build_id})
+
+        # If this build's ID matches the last build's ID and its output still exists, don't run a
+        # new build.
+        if not force and manifest.fresh("ui", build_id, dot_env_file, build_dir / "index.html"):
+            log.bind(id=build_id).debug("UI unchanged since last build, skipping UI build")
             return True
 
-    env_config.update({"HYPERGLASS_BUILD_ID": build_id})
-
-    dot_env_file.write_text("\n".join(f"{k}={v}" for k, v in env_config.items()))
-    log.bind(path=str(dot_env_file)).debug("Wrote UI environment file")
-
-    # Initiate Next.JS export process.
-    if any((not dev_mode, force, full)):
-        log.info("Starting UI build")
-        initialize_result = await node_initial(timeout, dev_mode)
-        build_result = await build_ui(app_path=app_path)
-
-        if initialize_result:
-            log.debug(initialize_result)
-        elif initialize_result == "":
-            log.debug("Re-initialized node_modules")
-
-        if build_result:
-            log.info("Completed UI build")
-    elif dev_mode and not force:
-        log.debug("Running in developer mode, did not build new UI files")
-
-    migrate_images(app_path, params)
-
-    write_custom_files(params)
-
-    generate_opengraph(
-        params.web.opengraph.image,
-        1200,
-        630,
-        images_dir,
-        params.web.theme.colors.black,
-    )
+        dot_env_file.write_text("\n".join(f"{k}={v}" for k, v in env_config.items()))
+        log.bind(path=str(dot_env_file)).debug("Wrote UI environment file")
+
+        # Initiate Next.JS export process.
+        if any((not dev_mode, force, full)):
+            log.info("Starting UI build")
+            initialize_result = await node_initial(timeout, dev_mode)
+            build_result = await build_ui(app_path=app_path)
+
+            if initialize_result:
+                log.debug(initialize_result)
+            elif initialize_result == "":
+                log.debug("Re-initialized node_modules")
+
+            if build_result:
+                log.info("Completed UI build")
+            manifest.record("ui", build_id)
+        elif dev_mode and not force:
+            log.debug("Running in developer mode, did not build new UI files")
+    finally:
+        # Record completed steps, even if another step failed.
+        manifest.write()
 
     return True
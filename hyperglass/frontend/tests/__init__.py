@@ -0,0 +1 @@
+"""hyperglass frontend tests."""
@@ -0,0 +1,53 @@
+"""Test UI build caching."""
+
+# Standard Library
+import tempfile
+from pathlib import Path
+
+# Local
+from .. import UI_PATH, BuildManifest, hash_files, ui_source_files
+
+
+def test_hash_files():
+    with tempfile.TemporaryDirectory() as directory_name:
+        directory = Path(directory_name)
+        image = directory / "logo.svg"
+        image.write_text("<svg></svg>")
+        key = hash_files(image, None)
+        assert hash_files(image, None) == key
+
+        # Changing a file's contents or name changes its hash.
+        image.write_text("<svg>changed</svg>")
+        assert hash_files(image, None) != key
+        assert hash_files(image, None, root=directory) != hash_files(image, None)
+        assert hash_files(image) != hash_files(image, None)
+
+
+def test_ui_source_files():
+    files = ui_source_files()
+    names = {str(path.relative_to(UI_PATH)) for path in files}
+    assert {"package.json", "pnpm-lock.yaml", "next.config.js"} <= names
+    # Generated files & build output aren't part of the UI source.
+    assert not any(name.startswith(("node_modules", ".next", "out/")) for name in names)
+    assert not names & {".env", "hyperglass.json", "custom.js", "custom.html"}
+    assert files == ui_source_files()
+
+
+def test_build_manifest():
+    with tempfile.TemporaryDirectory() as directory_name:
+        directory = Path(directory_name)
+        output = directory / "opengraph.jpg"
+        manifest = BuildManifest(directory / ".build.json")
+        assert not manifest.fresh("opengraph", "key")
+
+        output.write_bytes(b"")
+        manifest.record("opengraph", "key")
+        manifest.write()
+
+        manifest = BuildManifest(directory / ".build.json")
+        assert manifest.fresh("opengraph", "key", output)
+        assert not manifest.fresh("opengraph", "changed", output)
+
+        # Steps are repeated if their output is removed.
+        output.unlink()
+        assert not manifest.fresh("opengraph", "key", output)
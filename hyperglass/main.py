@@ -2,6 +2,7 @@
 
 # Standard Library
 import sys
+import signal
 import typing as t
 import asyncio
 import logging
@@ -11,21 +12,13 @@ import uvicorn
 
 # Local
 from .log import LibInterceptHandler, init_logger, enable_file_logging, enable_syslog_logging
-from .util import get_node_version
-from .constants import MIN_NODE_VERSION, MIN_PYTHON_VERSION, __version__
+from .constants import MIN_PYTHON_VERSION, __version__
 
 # Ensure the Python version meets the minimum requirements.
 pretty_version = ".".join(tuple(str(v) for v in MIN_PYTHON_VERSION))
 if sys.version_info < MIN_PYTHON_VERSION:
     raise RuntimeError(f"Python {pretty_version}+ is required.")
 
-# Ensure the NodeJS version meets the minimum requirements.
-node_major, node_minor, node_patch = get_node_version()
-
-if node_major < MIN_NODE_VERSION:
-    installed = ".".join(str(v) for v in (node_major, node_minor, node_patch))
-    raise RuntimeError(f"NodeJS {MIN_NODE_VERSION!s}+ is required (version {installed} installed)")
-
 
 # Local
 from .util import cpu_count
@@ -87,43 +80,69 @@ def unregister_all_plugins() -> None:
         manager().reset()
 
 
+LOG_CONFIG = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "default": {
+            "()": "uvicorn.logging.DefaultFormatter",
+            "format": "%(message)s",
+        },
+        "access": {
+            "()": "uvicorn.logging.AccessFormatter",
+            "format": "%(message)s",
+        },
+    },
+    "handlers": {
+        "default": {"formatter": "default", "class": "hyperglass.log.LibInterceptHandler"},
+        "access": {"formatter": "access", "class": "hyperglass.log.LibInterceptHandler"},
+    },
+    "loggers": {
+        "uvicorn.error": {"level": "ERROR", "handlers": ["default"], "propagate": False},
+        "uvicorn.access": {"level": "INFO", "handlers": ["access"], "propagate": False},
+    },
+}
+
+
 def start(*, log_level: t.Union[str, int], workers: int) -> None:
     """Start hyperglass via ASGI server."""
 
+    # Local
+    from .configuration.reload import ConfigReloader
+
     register_all_plugins()
 
     if not Settings.disable_ui:
         asyncio.run(build_ui())
 
-    uvicorn.run(
-        app="hyperglass.api:app",
-        host=str(Settings.host),
-        port=Settings.port,
-        workers=workers,
-        log_level=log_level,
-        log_config={
-            "version": 1,
-            "disable_existing_loggers": False,
-            "formatters": {
-                "default": {
-                    "()": "uvicorn.logging.DefaultFormatter",
-                    "format": "%(message)s",
-                },
-                "access": {
-                    "()": "uvicorn.logging.AccessFormatter",
-                    "format": "%(message)s",
-                },
-            },
-            "handlers": {
-                "default": {"formatter": "default", "class": "hyperglass.log.LibInterceptHandler"},
-                "access": {"formatter": "access", "class": "hyperglass.log.LibInterceptHandler"},
-            },
-            "loggers": {
-                "uvicorn.error": {"level": "ERROR", "handlers": ["default"], "propagate": False},
-                "uvicorn.access": {"level": "INFO", "handlers": ["access"], "propagate": False},
-            },
-        },
-    )
+    # Reload configuration on SIGHUP and, if enabled, whenever configuration files change.
+    reloader = ConfigReloader()
+
+    server_config = {
+        "host": str(Settings.host),
+        "port": Settings.port,
+        "workers": workers,
+        "log_level": log_level,
+        "log_config": LOG_CONFIG,
+    }
+
+    if Settings.preload and workers > 1:
+        # Local
+        from .prefork import PreforkServer, preload
+
+        # Preloaded workers are forked from a process that can't run threads, so configuration
+        # is reloaded in a separate process.
+        PreforkServer(
+            uvicorn.Config(app=preload(), **server_config),
+            reloader=reloader,
+            watch_config=Settings.watch_config,
+        ).run()
+        return
+
+    signal.signal(signal.SIGHUP, reloader.request)
+    reloader.start(watch=Settings.watch_config)
+
+    uvicorn.run(app="hyperglass.api:app", **server_config)
 
 
 def run(workers: int = None):
@@ -166,6 +185,7 @@ def run(workers: int = None):
             container=Settings.container,
             original_app_path=f"{Settings.original_app_path.absolute()!s}",
             workers=_workers,
+            preload=Settings.preload,
         ).info(
             "Starting hyperglass",
         )
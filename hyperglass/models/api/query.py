@@ -2,12 +2,20 @@
 
 # Standard Library
 import typing as t
+import asyncio
 import hashlib
 import secrets
 from datetime import datetime
 
 # Third Party
-from pydantic import BaseModel, ConfigDict, field_validator, StringConstraints
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    PositiveInt,
+    NonNegativeInt,
+    StringConstraints,
+    field_validator,
+)
 from typing_extensions import Annotated
 
 # Project
@@ -15,10 +23,12 @@ from hyperglass.log import log
 from hyperglass.util import snake_to_camel, repr_from_attrs
 from hyperglass.state import use_state
 from hyperglass.plugins import InputPluginManager
+from hyperglass.external.dns import is_hostname
 from hyperglass.exceptions.public import InputInvalid, QueryTypeNotFound, QueryLocationNotFound
 from hyperglass.exceptions.private import InputValidationError
 
 # Local
+from ..directive import RuleWithIP
 from ..config.devices import Device
 
 
@@ -51,7 +61,14 @@ class Query(BaseModel):
 
     # Directive `id` field
     query_type: QueryType
+
+    # Paging of structured output. These don't affect the query itself, so they're excluded from
+    # the query's representation, digest, and cache key.
+    offset: NonNegativeInt = 0
+    limit: t.Optional[PositiveInt] = None
     _kwargs: t.Dict[str, t.Any]
+    # Whether hostname targets need to be resolved before the query target is valid.
+    _unresolved: bool = False
 
     def __init__(self, **data) -> None:
         """Initialize the query with a UTC timestamp at initialization time."""
@@ -61,6 +78,9 @@ class Query(BaseModel):
 
         state = use_state()
         self._state = state
+        # Pin the device, so the query completes with the configuration it started with, even if
+        # configuration is reloaded while it runs.
+        self._device = use_state("devices")[self.query_location]
 
         query_directives = self.device.directives.matching(self.query_type)
 
@@ -76,7 +96,24 @@ class Query(BaseModel):
         except InputValidationError as err:
             raise InputInvalid(**err.kwargs) from err
 
-        self.query_target = self.transform_query_target()
+    def __getstate__(self) -> t.Dict[str, t.Any]:
+        """Exclude state & plugin managers, which are recreated when unpickled.
+
+        The pinned device is kept, so an unpickled query uses the device it started with.
+        """
+        state = super().__getstate__()
+        state["__dict__"] = {
+            key: value
+            for key, value in state["__dict__"].items()
+            if key not in ("_state", "_input_plugin_manager")
+        }
+        return state
+
+    def __setstate__(self, state: t.Dict[str, t.Any]) -> None:
+        """Restore a pickled query, for example, in a parse worker process."""
+        super().__setstate__(state)
+        self._state = use_state()
+        self._input_plugin_manager = InputPluginManager()
 
     def summary(self) -> SimpleQuery:
         """Summarized and post-validated model of a Query."""
@@ -105,16 +142,101 @@ class Query(BaseModel):
         ).hexdigest()
 
     def validate_query_target(self) -> None:
-        """Validate a query target after all fields/relationships have been initialized."""
-        # Run config/rule-based validations.
-        self.directive.validate_target(self.query_target)
-        # Run plugin-based validations.
-        self._input_plugin_manager.validate(query=self)
+        """Validate a query target after all fields/relationships have been initialized.
+
+        Hostname targets that aren't valid for the directive, but may be once they're resolved to
+        an IP address, are validated by `resolve_query_target()`.
+        """
+        try:
+            self._validate_query_target()
+        except InputValidationError:
+            if not self._resolvable():
+                raise
+            self.rule_match = None
+            self._unresolved = True
+
+    def _validate_query_target(self) -> None:
+        if self.per_target:
+            # Each target is run as a separate query, so each target is validated separately.
+            self.rule_match = None
+            for target in self.query_target:
+                self.directive.validate_target(target)
+            return
+        # Run config/rule-based validations, and keep the matching rule to construct commands.
+        self.rule_match = self.directive.validate_target(self.query_target)
+
+    def _resolvable(self) -> bool:
+        """Determine if any query target is a hostname that could resolve to a valid target."""
+        targets = self.query_target if isinstance(self.query_target, list) else [self.query_target]
+        return any(is_hostname(target) for target in targets) and any(
+            isinstance(rule, RuleWithIP) for rule in self.directive.rules
+        )
+
+    async def _resolve_target(self, target: str) -> str:
+        if not is_hostname(target):
+            return target
+        addresses = await self._state.params.dns.resolver().resolve(target)
+        if not addresses:
+            raise InputInvalid(error="Unable to resolve hostname", target=target)
+        # Use the first address the directive permits, in order of preference.
+        for address in addresses:
+            try:
+                self.directive.validate_target(str(address))
+                return str(address)
+            except InputValidationError:
+                continue
+        return str(addresses[0])
+
+    async def resolve_query_target(self) -> None:
+        """Resolve hostname query targets to IP addresses with the shared resolver."""
+        if not self._unresolved:
+            return
+        if isinstance(self.query_target, list):
+            targets = await asyncio.gather(*(self._resolve_target(t) for t in self.query_target))
+            self.query_target = list(targets)
+        else:
+            self.query_target = await self._resolve_target(self.query_target)
+        log.bind(query=self.summary()).debug("Resolved query target")
+        try:
+            self._validate_query_target()
+        except InputValidationError as err:
+            raise InputInvalid(**err.kwargs) from err
+        self._unresolved = False
+
+    @property
+    def per_target(self) -> bool:
+        """Determine if this query's commands are run separately for each target."""
+        return self.directive.runs_per_target(self.query_target)
+
+    def split_targets(self) -> t.List["Query"]:
+        """Get a query for each unique target, in order."""
+        queries = []
+        for target in dict.fromkeys(self.query_target):
+            query = self.model_copy(update={"query_target": target})
+            try:
+                # Input plugins may have transformed targets since they were validated.
+                query.rule_match = self.directive.validate_target(target)
+            except InputValidationError as err:
+                raise InputInvalid(**err.kwargs) from err
+            queries.append(query)
+        return queries
+
+    async def apply_input_plugins(self) -> None:
+        """Validate & transform the query target with input plugins.
+
+        Input plugins may be asynchronous, so they're applied after the query is initialized, and
+        before it's used.
+        """
+        try:
+            await self._input_plugin_manager.validate(query=self)
+        except InputValidationError as err:
+            raise InputInvalid(**err.kwargs) from err
         log.bind(query=self.summary()).debug("Validation passed")
+        self.query_target = await self.transform_query_target()
 
-    def transform_query_target(self) -> t.Union[t.List[str], str]:
+    async def transform_query_target(self) -> t.Union[t.List[str], str]:
         """Transform a query target based on defined plugins."""
-        return self._input_plugin_manager.transform(query=self)
+        return await self._input_plugin_manager.transform(query=self)
 
     def dict(self) -> t.Dict[str, t.Union[t.List[str], str]]:
         """Include only public fields."""
@@ -123,7 +245,7 @@ class Query(BaseModel):
     @property
     def device(self) -> Device:
         """Get this query's device object by query_location."""
-        return self._state.devices[self.query_location]
+        return self._device
 
     @field_validator("query_location")
     def validate_query_location(cls, value):
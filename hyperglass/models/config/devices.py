@@ -1,18 +1,22 @@
 """Validate router configuration variables."""
 
 # Standard Library
+import os
 import re
 import typing as t
+import hashlib
 from pathlib import Path
+from functools import lru_cache
+from contextlib import contextmanager
+from contextvars import ContextVar
 from ipaddress import IPv4Address, IPv6Address
 
 # Third Party
-from pydantic import FilePath, ValidationInfo, field_validator
-from netmiko.ssh_dispatcher import CLASS_MAPPER  # type: ignore
+from pydantic import FilePath, PositiveInt, PrivateAttr, ValidationInfo, field_validator
 
 # Project
 from hyperglass.log import log
-from hyperglass.util import get_driver, get_fmt_keys, resolve_hostname
+from hyperglass.util import get_driver, resolve_hostname
 from hyperglass.state import use_state
 from hyperglass.settings import Settings
 from hyperglass.constants import (
@@ -28,11 +32,56 @@ from ..main import MultiModel, HyperglassModel, HyperglassModelWithId
 from ..util import check_legacy_fields
 from .proxy import Proxy
 from ..fields import SupportedDriver
-from ..directive import Directives
+from ..directive import Directives, CommandTemplate
 from .credential import Credential
 from .http_client import HttpConfiguration
 
-ALL_DEVICE_TYPES = {*DRIVER_MAP.keys(), *CLASS_MAPPER.keys()}
+
+class DeviceContext(t.NamedTuple):
+    """Configuration shared by all devices validated together, resolved only once."""
+
+    directives: Directives
+    # Whether each hostname is resolvable (`None` if its lookup timed out), if already resolved.
+    resolved: t.Dict[str, t.Optional[bool]]
+    # Built-in directives by platform & structured output support.
+    builtins: t.Dict[t.Tuple[str, bool], Directives]
+
+
+_device_context: ContextVar[t.Optional[DeviceContext]] = ContextVar(
+    "device_context", default=None
+)
+
+
+@contextmanager
+def device_context(
+    directives: t.Optional[Directives] = None,
+    *,
+    resolved: t.Optional[t.Dict[str, t.Optional[bool]]] = None,
+) -> t.Generator[DeviceContext, None, None]:
+    """Share directives & resolved hostnames between devices validated in this context."""
+    context = _device_context.get()
+    if context is not None:
+        yield context
+        return
+    context = DeviceContext(
+        directives=directives if directives is not None else use_state("directives"),
+        resolved=resolved or {},
+        builtins={},
+    )
+    token = _device_context.set(context)
+    try:
+        yield context
+    finally:
+        _device_context.reset(token)
+
+
+@lru_cache
+def all_device_types() -> t.FrozenSet[str]:
+    """Get all supported device platforms, including all platforms supported by netmiko."""
+    # Third Party
+    from netmiko.ssh_dispatcher import CLASS_MAPPER  # type: ignore
+
+    return frozenset((*DRIVER_MAP.keys(), *CLASS_MAPPER.keys()))
 
 
 class APIDevice(t.TypedDict):
@@ -49,9 +98,38 @@ class DirectiveOptions(HyperglassModel, extra="ignore"):
     builtins: t.Union[bool, t.List[str]] = True
 
 
+def _migrate_avatar(source: Path) -> str:
+    """Copy an avatar to the static directory, named by its content, if not already present."""
+    data = source.read_bytes()
+    name = hashlib.sha256(data).hexdigest()[:16] + source.suffix.lower()
+    target = Settings.static_path / "images" / name
+    if target.exists():
+        return name
+
+    # Third Party
+    from PIL import Image
+
+    # Write to a temporary file first, so a partially written avatar is never served or reused.
+    partial = target.with_name(f".{name}.{os.getpid()}.tmp")
+    partial.write_bytes(data)
+    with Image.open(partial) as src:
+        if src.width > 512:
+            src.thumbnail((512, 512 * src.height / src.width))
+            src.save(partial, format=src.format)
+    partial.replace(target)
+    log.bind(source=str(source), destination=str(target)).debug("Copied device avatar")
+    return name
+
+
 class Device(HyperglassModelWithId, extra="allow"):
     """Validation model for per-router config in devices.yaml."""
 
+    _commands: t.Dict[str, t.Tuple[t.Tuple[CommandTemplate, ...], ...]] = PrivateAttr({})
+    # File name of the avatar in the static directory, once migrated.
+    _avatar: t.Optional[str] = PrivateAttr(None)
+    # Hash of the configuration this device was validated from.
+    _source: t.Optional[str] = PrivateAttr(None)
+
     id: str
     name: str
     description: t.Optional[str] = None
@@ -68,6 +146,7 @@ class Device(HyperglassModelWithId, extra="allow"):
     directives: Directives = Directives()
     driver: t.Optional[SupportedDriver] = None
     driver_config: t.Dict[str, t.Any] = {}
+    concurrency: PositiveInt = 4
     attrs: t.Dict[str, str] = {}
 
     def __init__(self, **kw) -> None:
@@ -76,7 +155,7 @@ class Device(HyperglassModelWithId, extra="allow"):
         if "id" not in kw:
             kw = self._with_id(kw)
         super().__init__(**kw)
-        self._validate_directive_attrs()
+        self._compile_commands()
 
     @property
     def _target(self):
@@ -148,25 +227,33 @@ class Device(HyperglassModelWithId, extra="allow"):
             return "linux_ssh"
         return self.platform
 
-    def _validate_directive_attrs(self) -> None:
-        # Set of all keys except for built-in key `target`.
-        keys = {
-            key
-            for group in [get_fmt_keys(command) for command in self.directive_commands]
-            for key in group
-            if key != "target"
-        }
+    def command_templates(self, directive_id: str) -> t.Tuple[t.Tuple[CommandTemplate, ...], ...]:
+        """Get the compiled commands of each of a directive's rules, in rule order."""
+        return self._commands[directive_id]
 
-        attrs = {k: v for k, v in self.attrs.items() if k in keys}
+    def _compile_commands(self) -> None:
+        """Substitute device attributes into every directive command.
 
-        # Verify all keys in associated commands contain values in device's `attrs`.
-        for key in keys:
-            if key not in attrs:
-                raise ConfigError(
-                    "Device '{d}' has a command that references attribute '{a}', but '{a}' is missing from device attributes",
-                    d=self.name,
-                    a=key,
-                )
+        Raises a `ConfigError` if a command references an attribute the device doesn't have.
+        """
+        commands = {}
+        for directive in self.directives:
+            rules = []
+            for rule in directive.rules:
+                templates = []
+                for command in rule.commands:
+                    try:
+                        templates.append(CommandTemplate.compile(command, self.attrs))
+                    except KeyError as err:
+                        raise ConfigError(
+                            "Device '{d}' has a command that references attribute '{a}', "
+                            "but '{a}' is missing from device attributes",
+                            d=self.name,
+                            a=err.args[0],
+                        ) from err
+                rules.append(tuple(templates))
+            commands[directive.id] = tuple(rules)
+        self._commands = commands
 
     @field_validator("address")
     def validate_address(
@@ -175,7 +262,17 @@ class Device(HyperglassModelWithId, extra="allow"):
         """Ensure a hostname is resolvable."""
 
         if not isinstance(value, (IPv4Address, IPv6Address)):
-            if not any(resolve_hostname(value)):
+            context = _device_context.get()
+            if context is not None and value in context.resolved:
+                resolvable = context.resolved[value]
+            else:
+                resolvable = any(resolve_hostname(value))
+            if resolvable is None:
+                # The hostname's lookup timed out, which doesn't mean it isn't resolvable.
+                log.bind(device=info.data["name"], address=value).warning(
+                    "Timed out ensuring device address is resolvable"
+                )
+            elif not resolvable:
                 raise ConfigError(
                     "Device '{d}' has an address of '{a}', which is not resolvable.",
                     d=info.data["name"],
@@ -183,32 +280,6 @@ class Device(HyperglassModelWithId, extra="allow"):
                 )
         return value
 
-    @field_validator("avatar")
-    def validate_avatar(
-        cls, value: t.Union[FilePath, None], info: ValidationInfo
-    ) -> t.Union[FilePath, None]:
-        """Migrate avatar to static directory."""
-        if value is not None:
-            # Standard Library
-            import shutil
-
-            # Third Party
-            from PIL import Image
-
-            target = Settings.static_path / "images" / value.name
-            copied = shutil.copy2(value, target)
-            log.bind(
-                device=info.data["name"],
-                source=str(value),
-                destination=str(target),
-            ).debug("Copied device avatar")
-
-            with Image.open(copied) as src:
-                if src.width > 512:
-                    src.thumbnail((512, 512 * src.height / src.width))
-                    src.save(target)
-        return value
-
     @field_validator("platform", mode="before")
     def validate_platform(cls: "Device", value: t.Any, info: ValidationInfo) -> str:
         """Validate & rewrite device platform, set default `directives`."""
@@ -235,7 +306,7 @@ class Device(HyperglassModelWithId, extra="allow"):
             value = SCRAPE_HELPERS[value]
 
         # Verify device platform is supported by hyperglass.
-        if value not in ALL_DEVICE_TYPES:
+        if value not in all_device_types():
             raise UnsupportedDevice(value)
 
         return value
@@ -264,7 +335,14 @@ class Device(HyperglassModelWithId, extra="allow"):
         cls: "Device", value: t.Optional[t.List[str]], info: ValidationInfo
     ) -> "Directives":
         """Associate directive IDs to loaded directive objects."""
-        directives = use_state("directives")
+        with device_context() as context:
+            return cls._directives(value, info, context)
+
+    @staticmethod
+    def _directives(
+        value: t.Optional[t.List[str]], info: ValidationInfo, context: DeviceContext
+    ) -> "Directives":
+        directives = context.directives
 
         directive_ids = value or []
         structured_output = info.data.get("structured_output", False)
@@ -289,7 +367,10 @@ class Device(HyperglassModelWithId, extra="allow"):
         # Directives matching provided IDs.
         device_directives = directives.filter(*directive_ids)
         # Matching built-in directives for this device's platform.
-        builtins = directives.device_builtins(platform=platform, table_output=structured_output)
+        builtins = context.builtins.get((platform, structured_output))
+        if builtins is None:
+            builtins = directives.device_builtins(platform=platform, table_output=structured_output)
+            context.builtins[(platform, structured_output)] = builtins
 
         if directive_options.builtins is True:
             # Add all builtins.
@@ -311,8 +392,32 @@ class Devices(MultiModel, model=Device, unique_by="id"):
 
     def __init__(self: "Devices", *items: t.Dict[str, t.Any]) -> None:
         """Generate IDs prior to validation."""
-        with_id = (Device._with_id(item) for item in items)
-        super().__init__(*with_id)
+        if all(isinstance(item, Device) for item in items):
+            # Devices that have already been validated are added as they are.
+            super().__init__(*items)
+            return
+        with_id = (item if isinstance(item, Device) else Device._with_id(item) for item in items)
+        # Directives are resolved once for all devices.
+        with device_context():
+            super().__init__(*with_id)
+
+    def migrate_avatars(self: "Devices") -> None:
+        """Copy device avatars to the static directory, resized if needed.
+
+        Avatars are named by a hash of their content, so each distinct image is processed once,
+        even if it's used by several devices or was already processed by a previous startup.
+        """
+        # Standard Library
+        from concurrent.futures import ThreadPoolExecutor
+
+        sources = list({device.avatar for device in self if device.avatar is not None})
+        if not sources:
+            return
+        with ThreadPoolExecutor() as executor:
+            names = dict(zip(sources, executor.map(_migrate_avatar, sources)))
+        for device in self:
+            if device.avatar is not None:
+                device._avatar = names[device.avatar]
 
     def export_api(self: "Devices") -> t.List[APIDevice]:
         """Export API-facing device fields."""
@@ -343,12 +448,18 @@ class Devices(MultiModel, model=Device, unique_by="id"):
         return {k: tuple(v) for k, v in result.items()}
 
     def directive_names(self) -> t.List[str]:
-        """Get all directive names for all devices."""
-        return list({directive.name for device in self for directive in device.directives})
+        """Get all directive names for all devices, in the order they're first used."""
+        return list(
+            dict.fromkeys(directive.name for device in self for directive in device.directives)
+        )
 
     def frontend(self: "Devices") -> t.List[t.Dict[str, t.Any]]:
-        """Export grouped devices for UIParameters."""
-        groups = {device.group for device in self}
+        """Export grouped devices for UIParameters.
+
+        Each location references its directives by ID; directives are exported once, by
+        `frontend_directives()`.
+        """
+        groups = dict.fromkeys(device.group for device in self)
         return [
             {
                 "group": group,
@@ -357,11 +468,11 @@ class Devices(MultiModel, model=Device, unique_by="id"):
                         "group": group,
                         "id": device.id,
                         "name": device.name,
-                        "avatar": f"/images/{device.avatar.name}"
-                        if device.avatar is not None
+                        "avatar": f"/images/{device._avatar}"
+                        if device._avatar is not None
                         else None,
                         "description": device.description,
-                        "directives": [d.frontend() for d in device.directives],
+                        "directives": device.directive_ids,
                     }
                     for device in self
                     if device.group == group
@@ -369,3 +480,12 @@ class Devices(MultiModel, model=Device, unique_by="id"):
             }
             for group in groups
         ]
+
+    def frontend_directives(self: "Devices") -> t.List[t.Dict[str, t.Any]]:
+        """Export a summary of each directive used by any device, for UIParameters."""
+        directives = {}
+        for device in self:
+            for directive in device.directives:
+                if directive.id not in directives:
+                    directives[directive.id] = directive.frontend(detail=False)
+        return list(directives.values())
@@ -0,0 +1,30 @@
+"""Validation model for DNS resolution config."""
+
+# Standard Library
+import typing as t
+
+# Third Party
+from pydantic import PositiveInt, NonNegativeInt
+
+# Local
+from ..fields import IntFloat
+from ..main import HyperglassModel
+
+if t.TYPE_CHECKING:
+    # Project
+    from hyperglass.external.dns import Resolver
+
+
+class DNS(HyperglassModel):
+    """Control how device addresses & hostname query targets are resolved."""
+
+    ttl: PositiveInt = 300
+    negative_ttl: NonNegativeInt = 30
+    timeout: IntFloat = 5
+
+    def resolver(self) -> "Resolver":
+        """Get the resolver for this configuration, shared by the whole process."""
+        # Project
+        from hyperglass.external.dns import use_resolver
+
+        return use_resolver(self.ttl, self.negative_ttl, self.timeout)
@@ -4,7 +4,6 @@
 import typing as t
 
 # Third Party
-import httpx
 from pydantic import FilePath, SecretStr, PrivateAttr, IPvAnyAddress
 
 # Project
@@ -15,6 +14,9 @@ from hyperglass.constants import __version__
 from ..fields import IntFloat, HttpMethod, Primitives
 
 if t.TYPE_CHECKING:
+    # Third Party
+    import httpx
+
     # Local
     from .devices import Device
 
@@ -86,8 +88,10 @@ class HttpConfiguration(HyperglassModel):
             query_target=self.attribute_map.query_target or "query_target",
         )
 
-    def create_client(self, *, device: "Device") -> httpx.AsyncClient:
+    def create_client(self, *, device: "Device") -> "httpx.AsyncClient":
         """Create a pre-configured http client."""
+        # Third Party
+        import httpx
 
         # Use the CA certificates for SSL verification, if present.
         verify = self.verify_ssl
@@ -6,13 +6,14 @@ import urllib.parse
 from pathlib import Path
 
 # Third Party
-from pydantic import Field, HttpUrl, ConfigDict, ValidationInfo, field_validator
+from pydantic import Field, HttpUrl, ConfigDict, PrivateAttr, ValidationInfo, field_validator
 
 # Project
 from hyperglass.settings import Settings
 from hyperglass.constants import __version__
 
 # Local
+from .dns import DNS
 from .web import Web
 from .docs import Docs
 from ..main import HyperglassModel
@@ -68,6 +69,9 @@ class Params(ParamsPublic, HyperglassModel):
 
     model_config = ConfigDict(json_schema_extra={"level": 1})
 
+    # Hash of the configuration these parameters were validated from.
+    _source: t.Optional[str] = PrivateAttr(None)
+
     # Top Level Params
 
     fake_output: bool = Field(
@@ -84,6 +88,7 @@ class Params(ParamsPublic, HyperglassModel):
 
     # Sub Level Params
     cache: Cache = Cache()
+    dns: DNS = DNS()
     docs: Docs = Docs()
     logging: Logging = Logging()
     messages: Messages = Messages()
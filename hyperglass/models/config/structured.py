@@ -1,26 +1,131 @@
 """Structured data configuration variables."""
 
 # Standard Library
+import re
 import typing as t
 
+# Third Party
+from pydantic import (
+    FilePath,
+    PrivateAttr,
+    PositiveInt,
+    NonNegativeInt,
+    field_validator,
+    model_validator,
+)
+
 # Local
+from ..fields import IntFloat
 from ..main import HyperglassModel
 
 StructuredCommunityMode = t.Literal["permit", "deny"]
-StructuredRPKIMode = t.Literal["router", "external"]
+StructuredRPKIMode = t.Literal["router", "external", "local"]
+
+# Characters that give a pattern meaning beyond its literal value.
+REGEX_SPECIAL = frozenset(".^$*+?{}[]\\|()")
+
+# Backreferences are relative to the pattern they're defined in, so patterns that use them can't
+# be combined with other patterns.
+BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+
+
+class CommunityMatcher:
+    """Match communities against a set of patterns.
+
+    A community matches if `re.match(pattern, community)` would match any one of the patterns.
+    Literal patterns are checked with hash lookups and string prefix comparisons, and all other
+    patterns are combined into a single compiled expression.
+    """
+
+    __slots__ = ("exact", "prefixes", "expressions")
+
+    exact: t.FrozenSet[str]
+    prefixes: t.Tuple[str, ...]
+    expressions: t.Tuple[t.Pattern, ...]
+
+    def __init__(self, patterns: t.Sequence[str]) -> None:
+        """Compile patterns."""
+        literals = [p for p in patterns if REGEX_SPECIAL.isdisjoint(p)]
+        regexes = [p for p in patterns if not REGEX_SPECIAL.isdisjoint(p)]
+        combinable = [p for p in regexes if BACKREFERENCE.search(p) is None]
+
+        self.exact = frozenset(literals)
+        # re.match() is anchored only at the start, so a literal pattern matches any community
+        # it is a prefix of.
+        self.prefixes = tuple(literals)
+
+        expressions = [re.compile(p) for p in regexes if p not in combinable]
+        if combinable:
+            try:
+                expressions.insert(0, re.compile("|".join(f"(?:{p})" for p in combinable)))
+            except re.error:
+                # Some patterns, such as those with inline global flags, can't be combined.
+                expressions.extend(re.compile(p) for p in combinable)
+        self.expressions = tuple(expressions)
+
+    def __call__(self, community: str) -> bool:
+        """Determine if a community matches any pattern."""
+        if community in self.exact or community.startswith(self.prefixes):
+            return True
+        return any(expression.match(community) for expression in self.expressions)
 
 
 class StructuredCommunities(HyperglassModel):
     """Control structured data response for BGP communities."""
 
+    _matcher: CommunityMatcher = PrivateAttr()
     mode: StructuredCommunityMode = "deny"
     items: t.List[str] = []
 
+    def __init__(self, **data: t.Any) -> None:
+        """Compile community patterns once, when configuration is loaded."""
+        super().__init__(**data)
+        self._matcher = CommunityMatcher(self.items)
+
+    @field_validator("items")
+    def validate_items(cls, value: t.List[str]) -> t.List[str]:
+        """Ensure each pattern is a valid regular expression."""
+        for pattern in value:
+            try:
+                re.compile(pattern)
+            except re.error as err:
+                raise ValueError(f"Invalid community pattern {pattern!r}: {err!s}") from err
+        return value
+
+    def allowed(self, community: str) -> bool:
+        """Determine if a community is allowed by the configured mode & patterns.
+
+        Modes:
+            permit: only permit matches
+            deny: only deny matches
+        """
+        matched = self._matcher(community)
+        if self.mode == "permit":
+            return matched
+        return not matched
+
 
 class StructuredRpki(HyperglassModel):
     """Control structured data response for RPKI state."""
 
     mode: StructuredRPKIMode = "router"
+    timeout: IntFloat = 5
+    vrp_file: t.Optional[FilePath] = None
+
+    @model_validator(mode="after")
+    def validate_rpki(cls, data: "StructuredRpki") -> "StructuredRpki":
+        """Ensure a VRP file is set when local validation is enabled."""
+        if data.mode == "local" and data.vrp_file is None:
+            raise ValueError("'vrp_file' must be set when RPKI validation mode is 'local'")
+        return data
+
+
+class StructuredParsing(HyperglassModel):
+    """Control where CPU-bound output plugins, such as structured output parsers, are run."""
+
+    # Number of worker processes per hyperglass process. If 0, plugins run in the calling process.
+    workers: NonNegativeInt = 0
+    timeout: IntFloat = 10
 
 
 class Structured(HyperglassModel):
@@ -28,3 +133,5 @@ class Structured(HyperglassModel):
 
     communities: StructuredCommunities = StructuredCommunities()
     rpki: StructuredRpki = StructuredRpki()
+    parsing: StructuredParsing = StructuredParsing()
+    max_routes: t.Optional[PositiveInt] = None
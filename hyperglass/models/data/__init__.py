@@ -4,11 +4,13 @@
 from typing import Union
 
 # Local
+from .compact import CompactRouteTable
 from .bgp_route import BGPRouteTable
 
-OutputDataModel = Union[BGPRouteTable]
+OutputDataModel = Union[BGPRouteTable, CompactRouteTable]
 
 __all__ = (
     "BGPRouteTable",
+    "CompactRouteTable",
     "OutputDataModel",
 )
@@ -1,8 +1,9 @@
 """Device-Agnostic Parsed Response Data Model."""
 
 # Standard Library
-import re
+import heapq
 import typing as t
+from socket import AF_INET, AF_INET6, inet_pton
 from ipaddress import ip_network
 
 # Third Party
@@ -10,7 +11,8 @@ from pydantic import ValidationInfo, field_validator
 
 # Project
 from hyperglass.state import use_state
-from hyperglass.external.rpki import rpki_state
+from hyperglass.external.vrp import use_vrps
+from hyperglass.external.rpki import rpki_states
 
 # Local
 from ..main import HyperglassModel
@@ -18,6 +20,70 @@ from ..main import HyperglassModel
 WinningWeight = t.Literal["low", "high"]
 
 
+if t.TYPE_CHECKING:
+    # Project
+    from hyperglass.external.rpki import RPKIPair
+    from hyperglass.models.config.structured import Structured
+
+
+def prefix_sort_key(prefix: str) -> t.Tuple[int, int, int, str]:
+    """Get a key that sorts prefixes by address family, network address, then prefix length."""
+    address, _, length = prefix.partition("/")
+    version, family, bits = (6, AF_INET6, 128) if ":" in address else (4, AF_INET, 32)
+    try:
+        network = int.from_bytes(inet_pton(family, address), "big")
+        return (version, network, int(length or bits), prefix)
+    except (OSError, ValueError):
+        # Sort anything that isn't a valid prefix last.
+        return (255, 0, 0, prefix)
+
+
+def _route_sort_key(route: "BGPRoute") -> t.Tuple[int, int, int, str]:
+    return prefix_sort_key(route.prefix)
+
+
+def route_rpki_state(
+    structured: "Structured", *, prefix: str, as_path: t.List[int], value: int
+) -> int:
+    """Get a route's RPKI state, prior to any external validation."""
+    if structured.rpki.mode == "router":
+        # If router validation is enabled, return the value as-is.
+        return value
+
+    if len(as_path) == 0:
+        # If the AS_PATH length is 0, i.e. for an internal route,
+        # return RPKI Unknown state.
+        return 3
+
+    try:
+        net = ip_network(prefix)
+    except ValueError:
+        return 3
+
+    if net.is_global:
+        if structured.rpki.mode == "local":
+            return use_vrps(structured.rpki.vrp_file).state(net, as_path[-1])
+        # External validation state is resolved for an entire table at once, by
+        # `BGPRouteTable.validate_rpki()`. Until then, the state is unknown.
+        return 3
+
+    return value
+
+
+def external_rpki_pair(*, prefix: str, as_path: t.List[int]) -> t.Optional["RPKIPair"]:
+    """Get the prefix & origin ASN to validate externally, if the route should be validated."""
+    if len(as_path) == 0:
+        return None
+    try:
+        net = ip_network(prefix)
+    except ValueError:
+        return None
+    # Only do external RPKI lookups for global prefixes.
+    if net.is_global:
+        return (prefix, as_path[-1])
+    return None
+
+
 class BGPRoute(HyperglassModel):
     """Post-parsed BGP route."""
 
@@ -37,70 +103,19 @@ class BGPRoute(HyperglassModel):
 
     @field_validator("communities")
     def validate_communities(cls, value):
-        """Filter returned communities against configured policy.
-
-        Actions:
-            permit: only permit matches
-            deny: only deny matches
-        """
-
-        (structured := use_state("params").structured)
-
-        def _permit(comm):
-            """Only allow matching patterns."""
-            valid = False
-            for pattern in structured.communities.items:
-                if re.match(pattern, comm):
-                    valid = True
-                    break
-            return valid
-
-        def _deny(comm):
-            """Allow any except matching patterns."""
-            valid = True
-            for pattern in structured.communities.items:
-                if re.match(pattern, comm):
-                    valid = False
-                    break
-            return valid
-
-        func_map = {"permit": _permit, "deny": _deny}
-        func = func_map[structured.communities.mode]
-
-        return [c for c in value if func(c)]
+        """Filter returned communities against configured policy."""
+        communities = use_state("params").structured.communities
+        return [c for c in value if communities.allowed(c)]
 
     @field_validator("rpki_state")
     def validate_rpki_state(cls, value, info: ValidationInfo):
         """If external RPKI validation is enabled, get validation state."""
-
-        (structured := use_state("params").structured)
-
-        if structured.rpki.mode == "router":
-            # If router validation is enabled, return the value as-is.
-            return value
-
-        if structured.rpki.mode == "external":
-            # If external validation is enabled, validate the prefix
-            # & asn with Cloudflare's RPKI API.
-            as_path = info.data.get("as_path", [])
-
-            if len(as_path) == 0:
-                # If the AS_PATH length is 0, i.e. for an internal route,
-                # return RPKI Unknown state.
-                return 3
-            # Get last ASN in path
-            asn = as_path[-1]
-
-        try:
-            net = ip_network(info.data["prefix"])
-        except ValueError:
-            return 3
-
-        # Only do external RPKI lookups for global prefixes.
-        if net.is_global:
-            return rpki_state(prefix=info.data["prefix"], asn=asn)
-
-        return value
+        return route_rpki_state(
+            use_state("params").structured,
+            prefix=info.data["prefix"],
+            as_path=info.data.get("as_path", []),
+            value=value,
+        )
 
 
 class BGPRouteTable(HyperglassModel):
@@ -114,11 +129,62 @@ class BGPRouteTable(HyperglassModel):
     def __init__(self, **kwargs):
         """Sort routes by prefix after validation."""
         super().__init__(**kwargs)
-        self.routes = sorted(self.routes, key=lambda r: r.prefix)
+        self.routes = sorted(self.routes, key=_route_sort_key)
+
+    @classmethod
+    def from_parsed(
+        cls,
+        *,
+        vrf: str,
+        count: int,
+        routes: t.Iterable[t.Dict[str, t.Any]],
+        winning_weight: WinningWeight,
+    ) -> "BGPRouteTable":
+        """Construct a table from route data already validated by a built-in parser.
+
+        Per-field validation is skipped. Community filtering and RPKI state are applied to the
+        whole table, with the structured output configuration resolved only once.
+        """
+        # Local
+        from .compact import CompactRouteTable
+
+        table = CompactRouteTable.from_parsed(
+            vrf=vrf, count=count, routes=routes, winning_weight=winning_weight
+        )
+        return table.to_model()
+
+    async def validate_rpki(self) -> None:
+        """Get the RPKI state of all routes from an external source, if enabled."""
+        rpki = use_state("params").structured.rpki
+        if rpki.mode != "external":
+            return
+
+        pairs = [external_rpki_pair(prefix=r.prefix, as_path=r.as_path) for r in self.routes]
+        states = await rpki_states((p for p in pairs if p is not None), timeout=rpki.timeout)
+        self.routes = [
+            route if pair is None else route.model_copy(update={"rpki_state": states[pair]})
+            for route, pair in zip(self.routes, pairs)
+        ]
+
+    @classmethod
+    def merge(cls, *tables: "BGPRouteTable") -> "BGPRouteTable":
+        """Merge tables into a single table.
+
+        Routes in each table are already sorted, so they're merged in a single pass rather than
+        sorted again. The merged table takes its VRF and winning weight from the first table.
+        """
+        if len(tables) == 1:
+            return tables[0]
+        first, *_ = tables
+        routes = list(heapq.merge(*(table.routes for table in tables), key=_route_sort_key))
+        return cls.model_construct(
+            vrf=first.vrf, count=len(routes), routes=routes, winning_weight=first.winning_weight
+        )
 
     def __add__(self: "BGPRouteTable", other: "BGPRouteTable") -> "BGPRouteTable":
         """Merge another BGP table instance with this instance."""
         if isinstance(other, BGPRouteTable):
-            self.routes = sorted([*self.routes, *other.routes], key=lambda r: r.prefix)
-            self.count = len(self.routes)
+            merged = BGPRouteTable.merge(self, other)
+            self.routes = merged.routes
+            self.count = merged.count
         return self
@@ -0,0 +1,467 @@
+"""Memory-efficient BGP route table for parsed structured output."""
+
+# Standard Library
+import sys
+import heapq
+import typing as t
+import itertools
+from array import array
+
+# Third Party
+import msgspec
+
+# Project
+from hyperglass.state import use_state
+from hyperglass.external.rpki import rpki_states
+
+# Local
+from .bgp_route import (
+    BGPRoute,
+    WinningWeight,
+    BGPRouteTable,
+    prefix_sort_key,
+    route_rpki_state,
+    external_rpki_pair,
+)
+
+if t.TYPE_CHECKING:
+    # Project
+    from hyperglass.models.config.structured import Structured
+
+__all__ = ("CompactRoute", "CompactRouteTable")
+
+# Route fields, in the same order as `BGPRoute`, so exported data is identical.
+ROUTE_FIELDS = tuple(BGPRoute.model_fields)
+
+# Typecodes of fixed-width columns. ASNs are unsigned 32-bit integers; everything else is signed
+# 64-bit, since values like MED and local preference may use the full unsigned 32-bit range.
+INT_COLUMNS = {
+    "active": "b",
+    "age": "q",
+    "weight": "q",
+    "med": "q",
+    "local_preference": "q",
+    "source_as": "I",
+    "rpki_state": "b",
+}
+
+# Columns of strings that commonly repeat across routes, and are therefore interned.
+STR_COLUMNS = ("prefix", "next_hop", "source_rid", "peer_rid")
+
+# Number of routes encoded at once when exporting a table to JSON. Routes are converted to Python
+# objects column-wise, which is much faster than converting each route separately, in chunks so
+# that every exported route is never held in memory at once.
+EXPORT_CHUNK_SIZE = 1000
+
+# Attributes that store route data.
+STORAGE = (
+    "_columns",
+    "_as_paths",
+    "_as_path_offsets",
+    "_communities",
+    "_community_offsets",
+    "_community_values",
+    "_community_index",
+)
+
+
+class ExportedRoute(msgspec.Struct, gc=False):
+    """A route as encoded to JSON, with the same fields (in the same order) as `BGPRoute`.
+
+    Exported routes only reference strings, integers, and lists of them, so they can't be part of
+    a reference cycle and don't need to be tracked by the garbage collector.
+    """
+
+    prefix: str
+    active: bool
+    age: int
+    weight: int
+    med: int
+    local_preference: int
+    as_path: t.List[int]
+    communities: t.List[str]
+    next_hop: str
+    source_as: int
+    source_rid: str
+    peer_rid: str
+    rpki_state: int
+
+
+class CompactRoute:
+    """View of a single route in a `CompactRouteTable`, with the same attributes as `BGPRoute`."""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "CompactRouteTable", index: int) -> None:
+        """Reference a route by index."""
+        self._table = table
+        self._index = index
+
+    def __getattr__(self, name: str) -> t.Any:
+        """Get a field value from the table's columns."""
+        if name not in ROUTE_FIELDS:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        return self._table._value(name, self._index)
+
+    def __repr__(self) -> str:
+        """Represent the route like a `BGPRoute`."""
+        return f"{type(self).__name__}(prefix={self.prefix!r}, next_hop={self.next_hop!r})"
+
+    def export_dict(self) -> t.Dict[str, t.Any]:
+        """Export the route in the same structure as `BGPRoute`."""
+        return next(self._table._rows((self._index,)))
+
+
+class CompactRoutes(t.Sequence[CompactRoute]):
+    """Sequence of route views, so a compact table's routes can be used like a list."""
+
+    __slots__ = ("_table",)
+
+    def __init__(self, table: "CompactRouteTable") -> None:
+        """Reference a table."""
+        self._table = table
+
+    def __len__(self) -> int:
+        """Get the number of routes."""
+        return len(self._table._columns["prefix"])
+
+    def __getitem__(self, index: t.Any) -> t.Any:
+        """Get a route view, or a list of route views for a slice."""
+        if isinstance(index, slice):
+            return [CompactRoute(self._table, i) for i in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("route index out of range")
+        return CompactRoute(self._table, index)
+
+
+class CompactRouteTable:
+    """BGP route table stored as columns rather than as a model per route.
+
+    Numeric fields are stored in typed arrays; AS paths and communities are stored in flat arrays
+    with per-route offsets, and communities are stored as indexes into a table of unique values.
+    Repeated strings are interned. Exported data has exactly the same structure as
+    `BGPRouteTable`, and `to_model()` converts the table to a `BGPRouteTable` for anything that
+    requires one.
+    """
+
+    __slots__ = ("vrf", "count", "winning_weight", "_structured", "_allowed", *STORAGE)
+
+    vrf: str
+    count: int
+    winning_weight: WinningWeight
+
+    def __init__(self, *, vrf: str, count: int, winning_weight: WinningWeight) -> None:
+        """Create an empty table."""
+        self.vrf = vrf
+        self.count = count
+        self.winning_weight = winning_weight
+        self._columns: t.Dict[str, t.Union[array, t.List[str]]] = {
+            **{name: array(code) for name, code in INT_COLUMNS.items()},
+            **{name: [] for name in STR_COLUMNS},
+        }
+        self._as_paths = array("I")
+        self._as_path_offsets = array("Q", (0,))
+        self._communities = array("I")
+        self._community_offsets = array("Q", (0,))
+        self._community_values: t.List[str] = []
+        self._community_index: t.Dict[str, int] = {}
+        self._structured: t.Optional["Structured"] = None
+        # Whether or not each unique community is allowed by the structured output configuration.
+        self._allowed: t.Dict[str, bool] = {}
+
+    def __len__(self) -> int:
+        """Get the number of routes."""
+        return len(self._columns["prefix"])
+
+    def __getstate__(self) -> t.Dict[str, t.Any]:
+        """Pickle only route data, which is stored in arrays and lists of strings."""
+        return {name: getattr(self, name) for name in ("vrf", "count", "winning_weight", *STORAGE)}
+
+    def __setstate__(self, state: t.Dict[str, t.Any]) -> None:
+        """Restore route data."""
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._structured = None
+        self._allowed = {}
+
+    def __repr__(self) -> str:
+        """Represent the table without its routes."""
+        return (
+            f"{type(self).__name__}(vrf={self.vrf!r}, count={self.count!r}, "
+            f"routes={len(self)}, winning_weight={self.winning_weight!r})"
+        )
+
+    def __add__(self, other: "CompactRouteTable") -> "CompactRouteTable":
+        """Merge another table with this table."""
+        if isinstance(other, CompactRouteTable):
+            return CompactRouteTable.merge(self, other)
+        return self
+
+    @property
+    def routes(self) -> CompactRoutes:
+        """Get a sequence of route views."""
+        return CompactRoutes(self)
+
+    @classmethod
+    def from_parsed(
+        cls,
+        *,
+        vrf: str,
+        count: int,
+        routes: t.Iterable[t.Dict[str, t.Any]],
+        winning_weight: WinningWeight,
+    ) -> "CompactRouteTable":
+        """Construct a table from route data already validated by a built-in parser."""
+        table = cls(vrf=vrf, count=count, winning_weight=winning_weight)
+        for route in routes:
+            table.append(route)
+        table.sort()
+        return table
+
+    @classmethod
+    def from_model(cls, table: BGPRouteTable) -> "CompactRouteTable":
+        """Construct a table from a `BGPRouteTable`, whose routes are already filtered."""
+        compact = cls(vrf=table.vrf, count=table.count, winning_weight=table.winning_weight)
+        for route in table.routes:
+            compact._append(route.model_dump())
+        return compact
+
+    def append(self, route: t.Dict[str, t.Any]) -> None:
+        """Add a route, already validated by a built-in parser.
+
+        Communities are filtered, and the RPKI state is determined, per the structured output
+        configuration.
+        """
+        if self._structured is None:
+            self._structured = use_state("params").structured
+
+        communities = []
+        for community in route["communities"]:
+            allowed = self._allowed.get(community)
+            if allowed is None:
+                allowed = self._allowed[community] = self._structured.communities.allowed(
+                    community
+                )
+            if allowed:
+                communities.append(community)
+
+        rpki_state = route_rpki_state(
+            self._structured,
+            prefix=route["prefix"],
+            as_path=route["as_path"],
+            value=route["rpki_state"],
+        )
+        self._append({**route, "communities": communities, "rpki_state": rpki_state})
+
+    def _append(self, route: t.Dict[str, t.Any]) -> None:
+        columns = self._columns
+        for name in INT_COLUMNS:
+            columns[name].append(route[name])
+        for name in STR_COLUMNS:
+            columns[name].append(sys.intern(route[name]))
+
+        self._as_paths.extend(route["as_path"])
+        self._as_path_offsets.append(len(self._as_paths))
+
+        for community in route["communities"]:
+            index = self._community_index.get(community)
+            if index is None:
+                index = self._community_index[community] = len(self._community_values)
+                self._community_values.append(sys.intern(community))
+            self._communities.append(index)
+        self._community_offsets.append(len(self._communities))
+
+    def _value(self, name: str, index: int) -> t.Any:
+        if name == "as_path":
+            start, end = self._as_path_offsets[index], self._as_path_offsets[index + 1]
+            return self._as_paths[start:end].tolist()
+        if name == "communities":
+            start, end = self._community_offsets[index], self._community_offsets[index + 1]
+            return [self._community_values[i] for i in self._communities[start:end]]
+        if name == "active":
+            return bool(self._columns[name][index])
+        return self._columns[name][index]
+
+    def _sort_key(self, index: int) -> t.Tuple[int, int, int, str]:
+        return prefix_sort_key(self._columns["prefix"][index])
+
+    def _rows(
+        self, indexes: t.Optional[t.Iterable[int]] = None
+    ) -> t.Iterator[t.Dict[str, t.Any]]:
+        """Generate routes in the same structure as `BGPRoute.model_dump()`."""
+        columns = self._columns
+        # Bind columns to local names, since this is called for every route of every export.
+        prefix, next_hop = columns["prefix"], columns["next_hop"]
+        source_rid, peer_rid = columns["source_rid"], columns["peer_rid"]
+        active, age, weight = columns["active"], columns["age"], columns["weight"]
+        med, local_preference = columns["med"], columns["local_preference"]
+        source_as, rpki_state = columns["source_as"], columns["rpki_state"]
+        as_paths, as_path_offsets = self._as_paths, self._as_path_offsets
+        communities, community_offsets = self._communities, self._community_offsets
+        community_values = self._community_values
+
+        for i in range(len(self)) if indexes is None else indexes:
+            yield {
+                "prefix": prefix[i],
+                "active": bool(active[i]),
+                "age": age[i],
+                "weight": weight[i],
+                "med": med[i],
+                "local_preference": local_preference[i],
+                "as_path": as_paths[as_path_offsets[i] : as_path_offsets[i + 1]].tolist(),
+                "communities": [
+                    community_values[c]
+                    for c in communities[community_offsets[i] : community_offsets[i + 1]]
+                ],
+                "next_hop": next_hop[i],
+                "source_as": source_as[i],
+                "source_rid": source_rid[i],
+                "peer_rid": peer_rid[i],
+                "rpki_state": rpki_state[i],
+            }
+
+    def _export(self, start: int, stop: int) -> t.List[ExportedRoute]:
+        """Get a range of routes for encoding to JSON."""
+        columns = self._columns
+
+        def column(name: str) -> t.List[t.Any]:
+            values = columns[name][start:stop]
+            return values.tolist() if isinstance(values, array) else values
+
+        as_path_offsets = self._as_path_offsets[start : stop + 1].tolist()
+        as_path_base = as_path_offsets[0]
+        as_paths = self._as_paths[as_path_base : as_path_offsets[-1]].tolist()
+        community_offsets = self._community_offsets[start : stop + 1].tolist()
+        community_base = community_offsets[0]
+        community_values = self._community_values
+        communities = [
+            community_values[c] for c in self._communities[community_base : community_offsets[-1]]
+        ]
+        return list(
+            itertools.starmap(
+                ExportedRoute,
+                zip(
+                    column("prefix"),
+                    map(bool, column("active")),
+                    column("age"),
+                    column("weight"),
+                    column("med"),
+                    column("local_preference"),
+                    [
+                        as_paths[path_start - as_path_base : path_end - as_path_base]
+                        for path_start, path_end in zip(as_path_offsets, as_path_offsets[1:])
+                    ],
+                    [
+                        communities[comm_start - community_base : comm_end - community_base]
+                        for comm_start, comm_end in zip(community_offsets, community_offsets[1:])
+                    ],
+                    column("next_hop"),
+                    column("source_as"),
+                    column("source_rid"),
+                    column("peer_rid"),
+                    column("rpki_state"),
+                ),
+            )
+        )
+
+    def _copy(self, order: t.Iterable[t.Tuple["CompactRouteTable", int]]) -> None:
+        """Append routes from other tables, without filtering or validating them again."""
+        for table, index in order:
+            self._append(next(table._rows((index,))))
+
+    def sort(self) -> None:
+        """Sort routes by prefix."""
+        order = sorted(range(len(self)), key=self._sort_key)
+        if order == list(range(len(self))):
+            return
+        ordered = CompactRouteTable(
+            vrf=self.vrf, count=self.count, winning_weight=self.winning_weight
+        )
+        ordered._copy((self, index) for index in order)
+        for name in STORAGE:
+            setattr(self, name, getattr(ordered, name))
+
+    @classmethod
+    def merge(cls, *tables: "CompactRouteTable") -> "CompactRouteTable":
+        """Merge tables into a single table.
+
+        Routes in each table are already sorted, so they're merged in a single pass rather than
+        sorted again. The merged table takes its VRF and winning weight from the first table.
+        """
+        if len(tables) == 1:
+            return tables[0]
+        first, *_ = tables
+        merged = cls(vrf=first.vrf, count=0, winning_weight=first.winning_weight)
+        merged._copy(
+            heapq.merge(
+                *(zip(itertools.repeat(table), range(len(table))) for table in tables),
+                key=lambda item: item[0]._sort_key(item[1]),
+            )
+        )
+        merged.count = len(merged)
+        return merged
+
+    async def validate_rpki(self) -> None:
+        """Get the RPKI state of all routes from an external source, if enabled."""
+        rpki = use_state("params").structured.rpki
+        if rpki.mode != "external":
+            return
+
+        pairs = [
+            external_rpki_pair(prefix=self._value("prefix", i), as_path=self._value("as_path", i))
+            for i in range(len(self))
+        ]
+        states = await rpki_states((p for p in pairs if p is not None), timeout=rpki.timeout)
+        for index, pair in enumerate(pairs):
+            if pair is not None:
+                self._columns["rpki_state"][index] = states[pair]
+
+    def export_dict(self) -> t.Dict[str, t.Any]:
+        """Export the table in the same structure as `BGPRouteTable.export_dict()`."""
+        return {
+            "vrf": self.vrf,
+            "count": self.count,
+            "routes": list(self._rows()),
+            "winning_weight": self.winning_weight,
+        }
+
+    def export_json(self) -> str:
+        """Export the table in the same structure as `BGPRouteTable.export_json()`.
+
+        Routes are encoded a chunk at a time, into a single buffer, so a complete set of exported
+        routes is never held in memory at once.
+        """
+        encoder = msgspec.json.Encoder()
+        buffer = bytearray(b'{"vrf":')
+        encoder.encode_into(self.vrf, buffer, -1)
+        buffer += b',"count":'
+        encoder.encode_into(self.count, buffer, -1)
+        buffer += b',"routes":'
+        # Each chunk is encoded as an array. Its closing bracket is removed, and each subsequent
+        # chunk's opening bracket is replaced with a comma, so that the chunks form one array.
+        separator = ord("[")
+        for start in range(0, len(self), EXPORT_CHUNK_SIZE):
+            position = len(buffer)
+            encoder.encode_into(
+                self._export(start, min(start + EXPORT_CHUNK_SIZE, len(self))), buffer, -1
+            )
+            buffer[position] = separator
+            separator = ord(",")
+            del buffer[-1]
+        if separator == ord("["):
+            buffer += b"["
+        buffer += b'],"winning_weight":'
+        encoder.encode_into(self.winning_weight, buffer, -1)
+        buffer += b"}"
+        return buffer.decode()
+
+    def to_model(self) -> BGPRouteTable:
+        """Convert the table to a `BGPRouteTable`."""
+        return BGPRouteTable.model_construct(
+            vrf=self.vrf,
+            count=self.count,
+            routes=[BGPRoute.model_construct(**route) for route in self._rows()],
+            winning_weight=self.winning_weight,
+        )
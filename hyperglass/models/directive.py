@@ -2,14 +2,16 @@
 
 # Standard Library
 import re
+import string
 import typing as t
+import weakref
+import hashlib
 from ipaddress import IPv4Network, IPv6Network, ip_network
 
 # Third Party
 from pydantic import Field, FilePath, PrivateAttr, IPvAnyNetwork, field_validator
 
 # Project
-from hyperglass.log import log
 from hyperglass.types import Series
 from hyperglass.settings import Settings
 from hyperglass.exceptions.private import InputValidationError
@@ -21,10 +23,12 @@ from .fields import Action
 StringOrArray = t.Union[str, t.List[str]]
 Condition = t.Union[str, None]
 RuleValidation = t.Union[t.Literal["ipv4", "ipv6", "pattern"], None]
-PassedValidation = t.Union[bool, None]
 IPFamily = t.Literal["ipv4", "ipv6"]
 RuleTypeAttr = t.Literal["ipv4", "ipv6", "pattern", "none"]
 
+# Command fields substituted per query, rather than from device attributes.
+QUERY_FIELDS = ("target", "mask")
+
 
 class Input(HyperglassModel):
     """Base input field."""
@@ -69,7 +73,6 @@ class Rule(HyperglassModel):
     """Base rule."""
 
     _type: RuleTypeAttr = "none"
-    _passed: PassedValidation = PrivateAttr(None)
     condition: Condition
     action: Action = "permit"
     commands: t.List[str] = Field([], alias="command")
@@ -88,6 +91,19 @@ class Rule(HyperglassModel):
         )
 
 
+def ip_target(target: StringOrArray) -> t.Tuple[str, t.Union[IPv4Network, IPv6Network]]:
+    """Get a single IP network from a query target."""
+    if isinstance(target, t.List):
+        if len(target) > 1:
+            raise InputValidationError(error="Target must be a single value", target=target)
+        target = target[0]
+    try:
+        # Attempt to use IP object factory to create an IP address object
+        return target, ip_network(target)
+    except ValueError as err:
+        raise InputValidationError(error=str(err), target=target) from err
+
+
 class RuleWithIP(Rule):
     """Base IP-based rule."""
 
@@ -107,73 +123,40 @@ class RuleWithIP(Rule):
 
     def membership(self, target: IPvAnyNetwork, network: IPvAnyNetwork) -> bool:
         """Check if IP address belongs to network."""
-        _log = log.bind(target=str(target), network=str(network))
-        _log.debug("Checking target membership")
-        if (
+        return (
             network.network_address <= target.network_address
             and network.broadcast_address >= target.broadcast_address
-        ):
-            _log.debug("Target membership verified")
-            return True
-        return False
+        )
 
     def in_range(self, target: IPvAnyNetwork) -> bool:
         """Verify if target prefix length is within ge/le threshold."""
-        if target.prefixlen <= self.le and target.prefixlen >= self.ge:
-            log.bind(target=str(target), range=f"{self.ge!s}-{self.le!s}").debug(
-                "Target is in range"
-            )
-            return True
-
-        return False
-
-    def validate_target(self, target: str, *, multiple: bool) -> bool:
-        """Validate an IP address target against this rule's conditions."""
-
-        if isinstance(target, t.List):
-            if len(target) > 1:
-                self._passed = False
-                raise InputValidationError(error="Target must be a single value", target=target)
-            target = target[0]
-
-        try:
-            # Attempt to use IP object factory to create an IP address object
-            valid_target = ip_network(target)
+        return self.ge <= target.prefixlen <= self.le
 
-        except ValueError as err:
-            raise InputValidationError(error=str(err), target=target) from err
-
-        if valid_target.version != self.condition.version:
-            log.bind(target=str(target), condition=str(self.condition)).debug(
-                "Mismatching IP version"
-            )
-            return False
-
-        is_member = self.membership(valid_target, self.condition)
-        in_range = self.in_range(valid_target)
-
-        if all((is_member, in_range, self.action == "permit")):
-            self._passed = True
-            return True
-
-        if is_member and not in_range:
-            self._passed = False
+    def decide(self, target: str, network: IPvAnyNetwork) -> t.Literal[True]:
+        """Apply this rule's prefix-length range & action to a target within its condition."""
+        if not self.in_range(network):
             raise InputValidationError(
                 error="Prefix-length is not within range {ge}-{le}",
                 target=target,
                 ge=self.ge,
                 le=self.le,
             )
-
-        if is_member and self.action == "deny":
-            self._passed = False
+        if self.action == "deny":
             raise InputValidationError(
                 error="Member of denied network '{network}'",
                 target=target,
                 network=str(self.condition),
             )
+        return True
 
-        return False
+    def validate_target(self, target: StringOrArray, *, multiple: bool) -> bool:
+        """Validate an IP address target against this rule's conditions."""
+        target, network = ip_target(target)
+        if network.version != self.condition.version:
+            return False
+        if not self.membership(network, self.condition):
+            return False
+        return self.decide(target, network)
 
 
 class RuleWithIPv4(RuleWithIP):
@@ -198,42 +181,35 @@ class RuleWithPattern(Rule):
     """A rule validated by a regular expression pattern."""
 
     _type: RuleTypeAttr = "pattern"
+    _pattern: t.Pattern = PrivateAttr()
     condition: str
 
-    def validate_target(self, target: str, *, multiple: bool) -> str:  # noqa: C901
-        """Validate a string target against configured regex patterns."""
-
-        def validate_single_value(value: str) -> t.Union[bool, BaseException]:
-            if self.condition == "*":
-                pattern = re.compile(".+", re.IGNORECASE)
-            else:
-                pattern = re.compile(self.condition, re.IGNORECASE)
-            is_match = pattern.match(value)
-
-            if is_match and self.action == "permit":
-                return True
-            if is_match and self.action == "deny":
-                return InputValidationError(target=value, error="Denied")
-            return False
+    def __init__(self, **kw) -> None:
+        super().__init__(**kw)
+        self._pattern = self.compile(self.condition)
 
-        if isinstance(target, t.List):
-            for result in (validate_single_value(v) for v in target):
-                if isinstance(result, BaseException):
-                    self._passed = False
-                    raise result
-                if result is False:
-                    self._passed = False
-                    return result
-            self._passed = True
-            return True
+    @staticmethod
+    def compile(condition: str) -> t.Pattern:
+        """Compile a condition, where `*` matches any value."""
+        return re.compile(".+" if condition == "*" else condition, re.IGNORECASE)
 
-        result = validate_single_value(target)
+    @field_validator("condition")
+    def validate_condition(cls, value: str) -> str:
+        """Ensure the condition is a valid regular expression."""
+        try:
+            cls.compile(value)
+        except re.error as err:
+            raise ValueError(f"Invalid pattern {value!r}: {err!s}") from err
+        return value
 
-        if isinstance(result, BaseException):
-            self._passed = False
-            raise result
-        self._passed = result
-        return result
+    def validate_target(self, target: StringOrArray, *, multiple: bool) -> bool:
+        """Validate a string target, or each of multiple targets, against the pattern."""
+        for value in target if isinstance(target, list) else (target,):
+            if self._pattern.match(value) is None:
+                return False
+            if self.action == "deny":
+                raise InputValidationError(target=value, error="Denied")
+        return True
 
 
 class RuleWithoutValidation(Rule):
@@ -244,7 +220,6 @@ class RuleWithoutValidation(Rule):
 
     def validate_target(self, target: str, *, multiple: bool) -> t.Literal[True]:
         """Don't validate a target. Always returns `True`."""
-        self._passed = True
         return True
 
 
@@ -256,10 +231,143 @@ RuleType = t.Union[
 ]
 
 
+class CommandTemplate(t.NamedTuple):
+    """A rule's command with device attributes substituted, leaving only the target and mask."""
+
+    template: str
+    # Whether the command references `{mask}`, which is only computed if it's used.
+    mask: bool
+
+    @classmethod
+    def compile(cls, command: str, attrs: t.Dict[str, str]) -> "CommandTemplate":
+        """Substitute device attributes into a command.
+
+        Raises `KeyError` with the name of the first attribute missing from `attrs`.
+        """
+        formatter = string.Formatter()
+        parts = []
+        mask = False
+        for literal, field, spec, conversion in formatter.parse(command):
+            parts.append(literal.replace("{", "{{").replace("}", "}}"))
+            if field is None:
+                continue
+            if field in QUERY_FIELDS:
+                mask = mask or field == "mask"
+                conversion = "" if conversion is None else f"!{conversion}"
+                spec = f":{spec}" if spec else ""
+                parts.append(f"{{{field}{conversion}{spec}}}")
+                continue
+            value = formatter.format_field(formatter.convert_field(attrs[field], conversion), spec)
+            parts.append(value.replace("{", "{{").replace("}", "}}"))
+        return cls("".join(parts), mask)
+
+    def format(self, target: t.Any, mask: t.Callable[[], t.Any]) -> str:
+        """Format the command for a query target."""
+        if self.mask:
+            return self.template.format(target=target, mask=mask())
+        return self.template.format(target=target)
+
+
+class RuleMatch(t.NamedTuple):
+    """The rule that permitted a query target, and the commands it selects."""
+
+    index: int
+    rule: RuleType
+    commands: t.Tuple[str, ...]
+
+
+class RuleEngine:
+    """A directive's rules, compiled to match query targets.
+
+    The result of matching a target is the same as evaluating each rule in order: the first rule
+    that permits or denies the target wins. IP rules are indexed by address family, prefix length,
+    and network address (a prefix trie, flattened into one table per prefix length), so the first
+    IP rule containing a target is found without evaluating every IP rule. Other rules are
+    evaluated in order, but only up to that IP rule.
+    """
+
+    __slots__ = ("rules", "_first_ip", "_tables", "_others", "__weakref__")
+
+    rules: t.Tuple[RuleType, ...]
+    _first_ip: t.Optional[int]
+    _tables: t.Dict[int, t.Tuple[t.Tuple[int, t.Dict[int, int]], ...]]
+    _others: t.Tuple[t.Tuple[int, RuleType], ...]
+
+    def __init__(self, rules: t.Sequence[RuleType]) -> None:
+        """Compile rules."""
+        self.rules = tuple(rules)
+        tables: t.Dict[int, t.Dict[int, t.Dict[int, int]]] = {4: {}, 6: {}}
+        others = []
+        self._first_ip = None
+        for index, rule in enumerate(self.rules):
+            if not isinstance(rule, RuleWithIP):
+                others.append((index, rule))
+                continue
+            if self._first_ip is None:
+                self._first_ip = index
+            network = rule.condition
+            key = int(network.network_address) >> (network.max_prefixlen - network.prefixlen)
+            # Only the first rule for a network can match; any subsequent rule is unreachable.
+            tables[network.version].setdefault(network.prefixlen, {}).setdefault(key, index)
+        # Store each family's prefix lengths in ascending order, so a lookup can stop at the
+        # target's own prefix length.
+        self._tables = {version: tuple(sorted(table.items())) for version, table in tables.items()}
+        self._others = tuple(others)
+
+    def _first_containing(self, network: t.Union[IPv4Network, IPv6Network]) -> t.Optional[int]:
+        """Get the index of the first IP rule whose condition contains a network."""
+        address = int(network.network_address)
+        first = None
+        for length, networks in self._tables[network.version]:
+            if length > network.prefixlen:
+                break
+            index = networks.get(address >> (network.max_prefixlen - length))
+            if index is not None and (first is None or index < first):
+                first = index
+        return first
+
+    def match(self, target: StringOrArray, *, multiple: bool = False) -> RuleMatch:
+        """Get the rule that permits a target, or raise an error if no rule permits it."""
+        # Index of the IP rule that decides the outcome, unless a preceding rule does.
+        decisive = None
+        error = None
+        if self._first_ip is not None:
+            try:
+                value, network = ip_target(target)
+            except InputValidationError as err:
+                # The first IP rule raises this error, unless a preceding rule matches.
+                decisive, error = self._first_ip, err
+            else:
+                decisive = self._first_containing(network)
+
+        for index, rule in self._others:
+            if decisive is not None and index > decisive:
+                break
+            if rule.validate_target(target, multiple=multiple) is True:
+                return RuleMatch(index, rule, tuple(rule.commands))
+
+        if error is not None:
+            raise error
+        if decisive is not None:
+            rule = self.rules[decisive]
+            rule.decide(value, network)
+            return RuleMatch(decisive, rule, tuple(rule.commands))
+        raise InputValidationError(error="No matched validation rules", target=target)
+
+
+# Compiled rules, shared by every copy of a directive (such as copies loaded from Redis), for as
+# long as any copy is still in use.
+_engines: "weakref.WeakValueDictionary[str, RuleEngine]" = weakref.WeakValueDictionary()
+
+
 class Directive(HyperglassUniqueModel, unique_by=("id", "table_output")):
     """A directive contains commands that can be run on a device, as long as defined rules are met."""
 
     _hyperglass_builtin: bool = PrivateAttr(False)
+    _rules_key: t.Optional[str] = PrivateAttr(None)
+    _engine: t.Optional[RuleEngine] = PrivateAttr(None)
+    # Hash of the configuration this directive was validated from, if it was loaded from a file.
+    _source: t.Optional[str] = PrivateAttr(None)
 
     id: str
     name: str
@@ -270,7 +378,7 @@ class Directive(HyperglassUniqueModel, unique_by=("id", "table_output")):
     table_output: t.Optional[str] = None
     groups: t.List[str] = []
     multiple: bool = False
-    multiple_separator: str = " "
+    multiple_separator: t.Optional[str] = " "
 
     @field_validator("rules", mode="before")
     @classmethod
@@ -295,14 +403,40 @@ class Directive(HyperglassUniqueModel, unique_by=("id", "table_output")):
                 out_rules.append(rule)
         return out_rules
 
-    def validate_target(self, target: str) -> bool:
-        """Validate a target against all configured rules."""
+    @property
+    def engine(self) -> RuleEngine:
+        """Get this directive's compiled rules."""
+        if self._engine is None:
+            if self._rules_key is None:
+                self._rules_key = self._hash_rules()
+            engine = _engines.get(self._rules_key)
+            if engine is None:
+                engine = _engines[self._rules_key] = RuleEngine(self.rules)
+            self._engine = engine
+        return self._engine
+
+    def __getstate__(self) -> t.Dict[t.Any, t.Any]:
+        """Exclude compiled rules, which are shared again once unpickled."""
+        state = super().__getstate__()
+        private = state.get("__pydantic_private__")
+        if private is not None:
+            state["__pydantic_private__"] = {**private, "_engine": None}
+        return state
+
+    def _hash_rules(self) -> str:
+        """Identify this directive's rules by their content."""
+        digest = hashlib.sha256(self.id.encode())
         for rule in self.rules:
-            valid = rule.validate_target(target, multiple=self.multiple)
-            if valid is True:
-                return True
-            continue
-        raise InputValidationError(error="No matched validation rules", target=target)
+            digest.update(f"{type(rule).__name__}:{rule.model_dump_json()}".encode())
+        return digest.hexdigest()
+
+    def runs_per_target(self, target: StringOrArray) -> bool:
+        """Determine if commands are run separately for each of multiple targets."""
+        return self.multiple and self.multiple_separator is None and isinstance(target, list)
+
+    def validate_target(self, target: StringOrArray) -> RuleMatch:
+        """Get the rule that permits a target, or raise an error if no rule permits it."""
+        return self.engine.match(target, multiple=self.multiple)
 
     @property
     def field_type(self) -> t.Literal["text", "select", None]:
@@ -331,8 +465,12 @@ class Directive(HyperglassUniqueModel, unique_by=("id", "table_output")):
             return [str(f) for f in matching_plugins]
         return []
 
-    def frontend(self: "Directive") -> t.Dict[str, t.Any]:
-        """Prepare a representation of the directive for the UI."""
+    def frontend(self: "Directive", *, detail: bool = True) -> t.Dict[str, t.Any]:
+        """Prepare a representation of the directive for the UI.
+
+        Unless `detail` is set, the directive's info & options are excluded; the UI loads them
+        separately, once the directive is used.
+        """
 
         value = {
             "id": self.id,
@@ -340,9 +478,13 @@ class Directive(HyperglassUniqueModel, unique_by=("id", "table_output")):
             "field_type": self.field_type,
             "groups": self.groups,
             "description": self.field.description if self.field is not None else '',
-            "info": None,
         }
 
+        if not detail:
+            return value
+
+        value["info"] = None
+
         if self.info is not None:
             with self.info.open() as md:
                 value["info"] = md.read()
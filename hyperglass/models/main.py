@@ -308,15 +308,12 @@ class MultiModel(RootModel[MultiModelT]):
     def _merge_with(self, *items, unique_by: t.Optional[str] = None) -> Series[MultiModelT]:
         to_add = self._valid_items(*items)
         if unique_by is not None:
-            unique_by_values = {
-                getattr(obj, unique_by) for obj in (*self, *to_add) if hasattr(obj, unique_by)
-            }
-            unique_by_objects = {
-                v: o
-                for v in unique_by_values
-                for o in (*self, *to_add)
-                if getattr(o, unique_by) == v
-            }
+            # Items are kept in the order they're first seen; a later item with the same value
+            # replaces an earlier one.
+            unique_by_objects = {}
+            for obj in (*self, *to_add):
+                if hasattr(obj, unique_by):
+                    unique_by_objects[getattr(obj, unique_by)] = obj
             return tuple(unique_by_objects.values())
         return (*self.root, *to_add)
 
@@ -9,7 +9,7 @@ from pydantic import ConfigDict
 
 # Project
 from hyperglass.log import log
-from hyperglass.models.data import BGPRouteTable
+from hyperglass.models.data.compact import CompactRouteTable
 
 # Local
 from ..main import HyperglassModel
@@ -115,7 +115,7 @@ class AristaBGPTable(_AristaBase):
             return []
         return [int(p) for p in as_path.split() if p.isdecimal()]
 
-    def bgp_table(self: "AristaBGPTable") -> "BGPRouteTable":
+    def bgp_table(self: "AristaBGPTable") -> "CompactRouteTable":
         """Convert the Arista-formatted fields to standard parsed data model."""
         routes = []
         count = 0
@@ -156,7 +156,7 @@ class AristaBGPTable(_AristaBase):
                     }
                 )
 
-        serialized = BGPRouteTable(
+        serialized = CompactRouteTable.from_parsed(
             vrf=self.vrf,
             count=count,
             routes=routes,
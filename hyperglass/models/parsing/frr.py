@@ -9,7 +9,7 @@ from pydantic import ConfigDict, model_validator
 
 # Project
 from hyperglass.log import log
-from hyperglass.models.data import BGPRouteTable
+from hyperglass.models.data.compact import CompactRouteTable
 
 # Local
 from ..main import HyperglassModel
@@ -111,7 +111,7 @@ class FRRBGPTable(_FRRBase):
                 }
             )
 
-        serialized = BGPRouteTable(
+        serialized = CompactRouteTable.from_parsed(
             vrf=vrf,
             count=len(routes),
             routes=routes,
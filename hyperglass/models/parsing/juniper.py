@@ -9,7 +9,7 @@ from pydantic import ConfigDict, field_validator, model_validator
 # Project
 from hyperglass.log import log
 from hyperglass.util import deep_convert_keys
-from hyperglass.models.data.bgp_route import BGPRouteTable
+from hyperglass.models.data.compact import CompactRouteTable
 
 # Local
 from ..main import HyperglassModel
@@ -151,49 +151,60 @@ class JuniperRouteTable(JuniperBase):
         """Flatten & convert entry-count to integer."""
         return int(value.get("#text"))
 
-
-class JuniperBGPTable(JuniperBase):
-    """Validation model for route-table data."""
+    def routes(self) -> t.Generator[t.Dict[str, t.Any], None, None]:
+        """Convert each route entry to the standard parsed route fields."""
+        prefix = "/".join(str(i) for i in (self.rt_destination, self.rt_prefix_length))
+        for route in self.rt_entry:
+            yield {
+                "prefix": prefix,
+                "active": route.active_tag,
+                "age": route.age,
+                "weight": route.preference,
+                "med": route.metric,
+                "local_preference": route.local_preference,
+                "as_path": route.as_path,
+                "communities": route.communities,
+                "next_hop": route.next_hop,
+                "source_as": route.source_as,
+                "source_rid": route.source_rid,
+                "peer_rid": route.peer_rid,
+                "rpki_state": route.validation_state,
+            }
+
+
+class JuniperBGPTableSummary(JuniperBase):
+    """Validation model for route-table data, excluding routes."""
 
     table_name: str
     destination_count: int
     total_route_count: int
     active_route_count: int
     hidden_route_count: int
-    rt: t.List[JuniperRouteTable]
 
-    def bgp_table(self: "JuniperBGPTable") -> "BGPRouteTable":
-        """Convert the Juniper-specific fields to standard parsed data model."""
+    @property
+    def vrf(self) -> str:
+        """Get the VRF name from the table name, e.g. `inet.0` or `customer.inet.0`."""
         vrf_parts = self.table_name.split(".")
         if len(vrf_parts) == 2:
-            vrf = "default"
-        else:
-            vrf = vrf_parts[0]
+            return "default"
+        return vrf_parts[0]
+
 
+class JuniperBGPTable(JuniperBGPTableSummary):
+    """Validation model for route-table data."""
+
+    rt: t.List[JuniperRouteTable]
+
+    def bgp_table(self: "JuniperBGPTable") -> "CompactRouteTable":
+        """Convert the Juniper-specific fields to standard parsed data model."""
         routes = []
         count = 0
         for table in self.rt:
             count += table.rt_entry_count
-            prefix = "/".join(str(i) for i in (table.rt_destination, table.rt_prefix_length))
-            for route in table.rt_entry:
-                routes.append(
-                    {
-                        "prefix": prefix,
-                        "active": route.active_tag,
-                        "age": route.age,
-                        "weight": route.preference,
-                        "med": route.metric,
-                        "local_preference": route.local_preference,
-                        "as_path": route.as_path,
-                        "communities": route.communities,
-                        "next_hop": route.next_hop,
-                        "source_as": route.source_as,
-                        "source_rid": route.source_rid,
-                        "peer_rid": route.peer_rid,
-                        "rpki_state": route.validation_state,
-                    }
-                )
-
-        serialized = BGPRouteTable(vrf=vrf, count=count, routes=routes, winning_weight="low")
+            routes.extend(table.routes())
+
+        serialized = CompactRouteTable.from_parsed(
+            vrf=self.vrf, count=count, routes=routes, winning_weight="low"
+        )
         log.bind(platform="juniper", response=repr(serialized)).debug("Serialized response")
         return serialized
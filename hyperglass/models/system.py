@@ -41,6 +41,8 @@ class HyperglassSettings(BaseSettings):
     debug: bool = False
     dev_mode: bool = False
     disable_ui: bool = False
+    preload: bool = False
+    watch_config: bool = False
     app_path: DirectoryPath = _default_app_path
     redis_host: str = "localhost"
     redis_password: t.Optional[SecretStr] = None
@@ -50,6 +52,7 @@ class HyperglassSettings(BaseSettings):
     port: int = 8001
     ca_cert: t.Optional[FilePath] = None
     container: bool = False
+    admin_key: t.Optional[SecretStr] = None
 
     def __init__(self, **kwargs) -> None:
         """Create hyperglass Settings instance."""
@@ -78,6 +81,8 @@ class HyperglassSettings(BaseSettings):
                 "redis_dsn",
                 "host",
                 "port",
+                "preload",
+                "watch_config",
             )
         )
         for attr in params:
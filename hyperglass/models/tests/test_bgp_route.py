@@ -0,0 +1,234 @@
+"""Test parsed BGP route table construction."""
+
+# Third Party
+import pytest
+
+# Project
+from hyperglass.models.config.params import Params
+
+# Local
+from ..data import compact, bgp_route
+from ..data.bgp_route import BGPRouteTable
+
+ROUTE = {
+    "active": True,
+    "age": 3600,
+    "weight": 170,
+    "med": 0,
+    "local_preference": 100,
+    "next_hop": "192.0.2.1",
+    "source_as": 65001,
+    "source_rid": "192.0.2.1",
+    "peer_rid": "192.0.2.1",
+    "rpki_state": 1,
+}
+
+ROUTES = (
+    {
+        **ROUTE,
+        "prefix": "198.51.100.0/24",
+        "as_path": [65001, 65002],
+        "communities": ["65000:1", "65000:100", "3356:123"],
+    },
+    {
+        **ROUTE,
+        "prefix": "192.0.2.0/24",
+        "as_path": [],
+        "communities": ["65000:1", "174:21000", "target:65000:1"],
+    },
+    {**ROUTE, "prefix": "2001:db8::/32", "as_path": [65003], "communities": []},
+)
+
+
+@pytest.fixture
+def params(*, request, monkeypatch) -> Params:
+    """Use structured output configuration without global state."""
+    _params = Params(structured={"communities": request.param})
+    for module in (bgp_route, compact):
+        monkeypatch.setattr(module, "use_state", lambda attr: _params)
+    return _params
+
+
+@pytest.mark.parametrize(
+    "params",
+    (
+        {"mode": "deny", "items": []},
+        {"mode": "deny", "items": ["65000:1", "^3356:"]},
+        {"mode": "permit", "items": ["65000:1", "target:"]},
+    ),
+    indirect=True,
+)
+def test_from_parsed(params):
+    table = BGPRouteTable.from_parsed(
+        vrf="default", count=len(ROUTES), routes=ROUTES, winning_weight="low"
+    )
+    validated = BGPRouteTable(
+        vrf="default", count=len(ROUTES), routes=list(ROUTES), winning_weight="low"
+    )
+    assert table.model_dump() == validated.model_dump()
+    assert [r.prefix for r in table.routes] == ["192.0.2.0/24", "198.51.100.0/24", "2001:db8::/32"]
+
+
+def test_community_matcher():
+    # Standard Library
+    import re
+
+    # Project
+    from hyperglass.models.config.structured import CommunityMatcher
+
+    patterns = (
+        "65000:1",
+        "3356:",
+        "^174:2",
+        "65001:(10|20)$",
+        "(\\d+):\\1",
+        "(?i)target:",
+        "large:[0-9]+:[0-9]+:1",
+    )
+    communities = (
+        "65000:1",
+        "65000:100",
+        "65000:2",
+        "3356:123",
+        "174:21000",
+        "174:3",
+        "65001:10",
+        "65001:100",
+        "65002:65002",
+        "65002:65003",
+        "TARGET:65000:1",
+        "large:65000:1:1",
+        "large:65000:1:2",
+        "origin:65000:1",
+    )
+    matcher = CommunityMatcher(patterns)
+    for community in communities:
+        expected = any(re.match(p, community) for p in patterns)
+        assert matcher(community) is expected, f"Invalid match for {community!r}"
+
+    assert CommunityMatcher(())("65000:1") is False
+
+
+def test_invalid_community_pattern():
+    # Third Party
+    from pydantic import ValidationError
+
+    with pytest.raises(ValidationError):
+        Params(structured={"communities": {"mode": "deny", "items": ["65000:(1"]}})
+
+
+def test_local_rpki(tmp_path, monkeypatch):
+    path = tmp_path / "vrps.csv"
+    path.write_text("ASN,IP Prefix,Max Length,Trust Anchor\nAS13335,1.1.1.0/24,24,apnic\n")
+    params = Params(structured={"rpki": {"mode": "local", "vrp_file": path}})
+    for module in (bgp_route, compact):
+        monkeypatch.setattr(module, "use_state", lambda attr: params)
+
+    routes = (
+        {**ROUTE, "prefix": "1.1.1.0/24", "as_path": [65001, 13335], "communities": []},
+        {**ROUTE, "prefix": "1.0.0.0/24", "as_path": [65001, 13335], "communities": []},
+        {**ROUTE, "prefix": "1.1.1.0/24", "as_path": [65001, 65002], "communities": []},
+        # Non-global prefixes keep the router's state.
+        {**ROUTE, "prefix": "192.0.2.0/24", "as_path": [65001], "communities": []},
+    )
+    table = BGPRouteTable.from_parsed(
+        vrf="default", count=len(routes), routes=routes, winning_weight="low"
+    )
+    states = {(r.prefix, r.as_path[-1]): r.rpki_state for r in table.routes}
+    assert states == {
+        ("1.1.1.0/24", 13335): 1,
+        ("1.0.0.0/24", 13335): 2,
+        ("1.1.1.0/24", 65002): 0,
+        ("192.0.2.0/24", 65001): 1,
+    }
+
+
+def test_prefix_sort_key():
+    # Local
+    from ..data.bgp_route import prefix_sort_key
+
+    prefixes = ["2001:db8::/32", "10.0.0.0/8", "9.0.0.0/8", "10.0.0.0/16", "invalid", "10.0.0.0/8"]
+    assert sorted(prefixes, key=prefix_sort_key) == [
+        "9.0.0.0/8",
+        "10.0.0.0/8",
+        "10.0.0.0/8",
+        "10.0.0.0/16",
+        "2001:db8::/32",
+        "invalid",
+    ]
+
+
+@pytest.mark.parametrize("params", ({"mode": "deny", "items": []},), indirect=True)
+def test_merge(params):
+    def table(*prefixes: str) -> BGPRouteTable:
+        routes = [{**ROUTE, "prefix": p, "as_path": [], "communities": []} for p in prefixes]
+        return BGPRouteTable.from_parsed(
+            vrf="default", count=len(routes), routes=routes, winning_weight="low"
+        )
+
+    tables = (
+        table("10.0.0.0/8", "192.0.2.0/24", "2001:db8::/32"),
+        table("9.0.0.0/8", "100.64.0.0/10"),
+        table("2001:db8::/48", "10.0.0.0/8"),
+    )
+    merged = BGPRouteTable.merge(*tables)
+    assert merged.count == 7
+    assert [r.prefix for r in merged.routes] == [
+        "9.0.0.0/8",
+        "10.0.0.0/8",
+        "10.0.0.0/8",
+        "100.64.0.0/10",
+        "192.0.2.0/24",
+        "2001:db8::/32",
+        "2001:db8::/48",
+    ]
+    assert BGPRouteTable.merge(tables[0]) is tables[0]
+
+
+@pytest.mark.parametrize("params", ({"mode": "deny", "items": ["65000:1"]},), indirect=True)
+def test_compact_route_table(params, monkeypatch):
+    # Standard Library
+    import json
+
+    # Local
+    from ..data.compact import CompactRouteTable
+
+    table = CompactRouteTable.from_parsed(
+        vrf="default", count=len(ROUTES), routes=ROUTES, winning_weight="low"
+    )
+    validated = BGPRouteTable(
+        vrf="default", count=len(ROUTES), routes=list(ROUTES), winning_weight="low"
+    )
+    assert json.loads(table.export_json()) == json.loads(validated.export_json())
+    # Routes are encoded with their fields in the same order as `BGPRoute`.
+    assert compact.ExportedRoute.__struct_fields__ == compact.ROUTE_FIELDS
+    empty = CompactRouteTable(vrf="default", count=0, winning_weight="low")
+    assert json.loads(empty.export_json()) == empty.export_dict()
+    # Routes are encoded in chunks, which form a single list.
+    monkeypatch.setattr(compact, "EXPORT_CHUNK_SIZE", 2)
+    assert json.loads(table.export_json()) == json.loads(validated.export_json())
+    assert table.export_dict() == validated.export_dict()
+    assert table.to_model().model_dump() == validated.model_dump()
+
+    assert len(table.routes) == 3
+    assert table.routes[0].prefix == "192.0.2.0/24"
+    assert table.routes[-1].prefix == "2001:db8::/32"
+    assert table.routes[1].as_path == [65001, 65002]
+    assert table.routes[1].communities == ["3356:123"]
+    assert [r.prefix for r in table.routes[1:]] == ["198.51.100.0/24", "2001:db8::/32"]
+
+    other = CompactRouteTable.from_parsed(
+        vrf="default",
+        count=1,
+        routes=[{**ROUTES[0], "prefix": "10.0.0.0/8"}],
+        winning_weight="low",
+    )
+    merged = table + other
+    assert merged.count == 4
+    assert [r.prefix for r in merged.routes] == [
+        "10.0.0.0/8",
+        "192.0.2.0/24",
+        "198.51.100.0/24",
+        "2001:db8::/32",
+    ]
+    assert merged.routes[0].communities == ["3356:123"]
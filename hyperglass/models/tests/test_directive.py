@@ -0,0 +1,170 @@
+"""Test directive rule matching."""
+
+# Standard Library
+import gc
+import pickle
+import random
+import typing as t
+from ipaddress import ip_network
+
+# Third Party
+import pytest
+
+# Project
+from hyperglass.exceptions.private import InputValidationError
+
+# Local
+from ..directive import (
+    Directive,
+    _engines,
+    RuleWithIPv4,
+    RuleWithIPv6,
+    CommandTemplate,
+    RuleWithPattern,
+)
+
+
+def _directive(rules: t.List[t.Dict[str, t.Any]]) -> Directive:
+    return Directive(id="test", name="Test", rules=rules, field={"description": "Test"})
+
+
+def _evaluate(rules: t.Sequence[t.Any], target: t.Any) -> t.Tuple[str, t.Any]:
+    """Evaluate each rule in order, as rules were evaluated before being compiled."""
+    for index, rule in enumerate(rules):
+        try:
+            if rule.validate_target(target, multiple=False) is True:
+                return ("match", index)
+        except InputValidationError as err:
+            return ("error", err.kwargs["error"])
+    return ("error", "No matched validation rules")
+
+
+def _match(directive: Directive, target: t.Any) -> t.Tuple[str, t.Any]:
+    try:
+        return ("match", directive.validate_target(target).index)
+    except InputValidationError as err:
+        return ("error", err.kwargs["error"])
+
+
+def _random_rules(rng: random.Random) -> t.List[t.Dict[str, t.Any]]:
+    rules = []
+    for _ in range(rng.randint(1, 12)):
+        kind = rng.choice(("ipv4", "ipv4", "ipv6", "pattern"))
+        action = rng.choice(("permit", "permit", "deny"))
+        if kind == "ipv4":
+            length = rng.randint(0, 24)
+            network = ip_network(f"10.{rng.randint(0, 3)}.{rng.randint(0, 3)}.0/{length}", False)
+            ge = rng.randint(length, 32)
+            rules.append(
+                {
+                    "condition": str(network),
+                    "ge": ge,
+                    "le": rng.randint(ge, 32),
+                    "action": action,
+                    "command": f"v4 {{target}} {len(rules)}",
+                }
+            )
+        elif kind == "ipv6":
+            length = rng.randint(0, 64)
+            network = ip_network(f"2001:db8:{rng.randint(0, 3)}::/{length}", False)
+            rules.append({"condition": str(network), "action": action, "command": "v6 {target}"})
+        else:
+            condition = rng.choice(("*", r"^10\.", r"^65\d+$", "^2001"))
+            rules.append({"condition": condition, "action": action, "command": "p {target}"})
+    return rules
+
+
+def _random_target(rng: random.Random) -> t.Any:
+    kind = rng.randint(0, 5)
+    address = f"10.{rng.randint(0, 3)}.{rng.randint(0, 3)}.{rng.randint(0, 3)}"
+    if kind == 0:
+        return f"{address}/{rng.randint(8, 32)}"
+    if kind == 1:
+        return address
+    if kind == 2:
+        return f"2001:db8:{rng.randint(0, 3)}::{rng.randint(0, 3)}"
+    if kind == 3:
+        return f"65{rng.randint(0, 999)}"
+    if kind == 4:
+        return [f"65{rng.randint(0, 9)}" for _ in range(rng.randint(1, 3))]
+    return rng.choice(("10.0.0.0/33", "not-an-address", ["10.0.0.1", "10.0.0.2"]))
+
+
+def test_rule_engine_matches_ordered_evaluation():
+    rng = random.Random(4)
+    for _ in range(300):
+        directive = _directive(_random_rules(rng))
+        for _ in range(20):
+            target = _random_target(rng)
+            assert _match(directive, target) == _evaluate(directive.rules, target), target
+
+
+def test_rule_match():
+    directive = _directive(
+        [
+            {
+                "condition": r"^\d+:\d+$",
+                "command": ["show community {target}", "show more {target}"],
+            },
+            {"condition": "10.0.0.0/8", "le": 24, "command": "show route {target}"},
+            {"condition": "10.0.0.0/16", "action": "deny"},
+            {"condition": "2001:db8::/32", "command": "show route {target}"},
+        ]
+    )
+    assert isinstance(directive.rules[0], RuleWithPattern)
+    assert isinstance(directive.rules[1], RuleWithIPv4)
+    assert isinstance(directive.rules[3], RuleWithIPv6)
+
+    result = directive.validate_target("10.0.0.0/16")
+    assert result.index == 1
+    assert result.commands == ("show route {target}",)
+
+    # The first rule containing the target decides the outcome.
+    with pytest.raises(InputValidationError) as err:
+        directive.validate_target("10.0.0.1")
+    assert err.value.kwargs["error"].startswith("Prefix-length is not within range")
+
+    assert directive.validate_target("2001:db8::1").index == 3
+    assert directive.validate_target("65000:1").commands == (
+        "show community {target}",
+        "show more {target}",
+    )
+
+    # Directives with the same rules share compiled rules.
+    assert directive.copy().engine is directive.engine
+    assert pickle.loads(pickle.dumps(directive)).engine is directive.engine
+
+
+def test_engine_released():
+    directive = _directive([{"condition": "192.0.2.0/24", "command": "show route {target}"}])
+    assert directive.engine is not None
+    key = directive._rules_key
+    assert key in _engines
+
+    # Compiled rules are dropped once no directive uses them, such as after a config reload.
+    del directive
+    gc.collect()
+    assert key not in _engines
+
+
+def test_invalid_pattern():
+    with pytest.raises(ValueError):
+        RuleWithPattern(condition="(")
+
+
+def test_command_template():
+    attrs = {"source4": "{not-a-field}", "count": "1"}
+    template = CommandTemplate.compile("show route {target} {source4} {{literal}} {count:>3}", attrs)
+    assert template.mask is False
+    assert template.format("192.0.2.0/24", mask=None) == (
+        "show route 192.0.2.0/24 {not-a-field} {literal}   1"
+    )
+
+    # The mask is only computed for commands that use it.
+    masks = []
+    template = CommandTemplate.compile("show route {target} {mask}", {})
+    assert template.format("192.0.2.0", mask=lambda: masks.append(1) or "255.255.255.255")
+    assert masks == [1]
+
+    with pytest.raises(KeyError):
+        CommandTemplate.compile("show route {target} source {source6}", {"source4": "192.0.2.1"})
@@ -46,3 +46,5 @@ def test_multi_model():
     model.add(*ITEMS_3, unique_by="id")
     assert model.count == 6
     assert model["item1"].name == "Item New One"
+    # Items keep their original order when replaced.
+    assert [item.id for item in model] == ["item1", "item2", "item3", "item4", "item5", "item6"]
@@ -22,6 +22,11 @@ class UIDirective(HyperglassModel):
     field_type: t.Union[str, None]
     groups: t.List[str]
     description: str
+
+
+class UIDirectiveDetail(UIDirective):
+    """UI: Directive, including details loaded once a location is selected."""
+
     info: t.Optional[str] = None
     options: t.Optional[t.List[t.Dict[str, t.Any]]] = None
 
@@ -34,7 +39,8 @@ class UILocation(HyperglassModel):
     group: t.Optional[str] = None
     avatar: t.Optional[str] = None
     description: t.Optional[str] = None
-    directives: t.List[UIDirective] = []
+    # IDs of the location's directives, which are defined once in `UIParameters.directives`.
+    directives: t.List[str] = []
 
 
 class UIDevices(HyperglassModel):
@@ -59,6 +65,7 @@ class UIParameters(ParamsPublic, HyperglassModel):
     messages: Messages
     version: str
     devices: t.List[UIDevices] = []
+    directives: t.List[UIDirective] = []
     parsed_data_fields: t.Tuple[StructuredDataField, ...]
     content: UIContent
     developer_mode: bool
@@ -28,6 +28,11 @@ class HyperglassPlugin(BaseModel, ABC):
     common: bool = False
     ref: t.Optional[str] = None
     log: t.ClassVar["Logger"] = _logger
+    # If true, the plugin doesn't depend on other plugins of the same type, and may be called at
+    # the same time as other concurrent plugins.
+    concurrent: t.ClassVar[bool] = False
+    # If true, the plugin's synchronous methods are run in a thread rather than the event loop.
+    threaded: t.ClassVar[bool] = False
 
     @property
     def _signature(self) -> Signature:
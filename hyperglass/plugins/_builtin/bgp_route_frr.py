@@ -10,6 +10,7 @@ from pydantic import PrivateAttr, ValidationError
 # Project
 from hyperglass.log import log
 from hyperglass.exceptions.private import ParsingError
+from hyperglass.models.data.compact import CompactRouteTable
 from hyperglass.models.parsing.frr import FRRBGPTable
 
 # Local
@@ -26,7 +27,7 @@ if t.TYPE_CHECKING:
 
 def parse_frr(output: t.Sequence[str]) -> "OutputDataModel":
     """Parse a FRR BGP JSON response."""
-    result = None
+    tables = []
 
     _log = log.bind(plugin=BGPRoutePluginFrr.__name__)
 
@@ -37,12 +38,7 @@ def parse_frr(output: t.Sequence[str]) -> "OutputDataModel":
             _log.debug("Pre-parsed data", data=parsed)
 
             validated = FRRBGPTable(**parsed)
-            bgp_table = validated.bgp_table()
-
-            if result is None:
-                result = bgp_table
-            else:
-                result += bgp_table
+            tables.append(validated.bgp_table())
 
         except json.JSONDecodeError as err:
             _log.bind(error=str(err)).critical("Failed to decode JSON")
@@ -60,13 +56,16 @@ def parse_frr(output: t.Sequence[str]) -> "OutputDataModel":
             _log.critical(err)
             raise ParsingError(err.errors()) from err
 
-    return result
+    if len(tables) == 0:
+        return None
+    return CompactRouteTable.merge(*tables)
 
 
 class BGPRoutePluginFrr(OutputPlugin):
     """Coerce a FRR route table in JSON format to a standard BGP Table structure."""
 
     _hyperglass_builtin: bool = PrivateAttr(True)
+    cpu_bound = True
     platforms: t.Sequence[str] = ("frr",)
     directives: t.Sequence[str] = ("__hyperglass_frr_bgp_route_table__",)
 
@@ -1,25 +1,22 @@
 """Coerce a Juniper route table in XML format to a standard BGP Table structure."""
 
 # Standard Library
-import re
-from typing import TYPE_CHECKING, List, Sequence, Generator
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+from xml.parsers import expat
 
 # Third Party
-import xmltodict  # type: ignore
 from pydantic import PrivateAttr, ValidationError
 
 # Project
 from hyperglass.log import log
 from hyperglass.exceptions.private import ParsingError
-from hyperglass.models.parsing.juniper import JuniperBGPTable
+from hyperglass.models.data.compact import CompactRouteTable
+from hyperglass.models.parsing.juniper import JuniperRouteTable, JuniperBGPTableSummary
 
 # Local
 from .._output import OutputPlugin
 
 if TYPE_CHECKING:
-    # Standard Library
-    from collections import OrderedDict
-
     # Project
     from hyperglass.models.data import OutputDataModel
     from hyperglass.models.api.query import Query
@@ -28,81 +25,139 @@ if TYPE_CHECKING:
     from .._output import OutputType
 
 
-REMOVE_PATTERNS = (
-    # The XML response can a CLI banner appended to the end of the XML
-    # string. For example:
-    # ```
-    # <rpc-reply>
-    # ...
-    # <cli>
-    #   <banner>{master}</banner>
-    # </cli>
-    # </rpc-reply>
-    #
-    # {master} noqa: E800
-    # ```
-    #
-    # This pattern will remove anything inside braces, including the braces.
-    r"\{.+\}",
-)
-
-
-def clean_xml_output(output: str) -> str:
-    """Remove Juniper-specific patterns from output."""
-
-    def scrub(lines: List[str]) -> Generator[str, None, None]:
-        """Clean & remove each pattern from each line."""
-        for pattern in REMOVE_PATTERNS:
-            for line in lines:
-                # Remove the pattern & strip extra newlines
-                scrubbed = re.sub(pattern, "", line.strip())
-                # Only return non-empty and non-newline lines
-                if scrubbed and scrubbed != "\n":
-                    yield scrubbed
-
-    lines = scrub(output.splitlines())
-
-    return "\n".join(lines)
-
-
-def parse_juniper(output: Sequence[str]) -> "OutputDataModel":  # noqa: C901
+# Elements that are always parsed as lists, even if only one is present.
+FORCE_LIST = ("rt", "rt-entry", "community")
+
+
+class JuniperRouteStream:
+    """Incrementally parse a Juniper XML route response from expat events.
+
+    Only one `rt` element is held in memory at a time. Each is converted to a dict with the same
+    structure `xmltodict` produces, validated, and reduced to standard route fields before the
+    next is parsed.
+    """
+
+    def __init__(self) -> None:
+        """Set up parser state."""
+        self.tables: List[CompactRouteTable] = []
+        self.has_route_information = False
+        self.has_routes = False
+        self.complete = False
+        self._path: List[str] = []
+        self._frames: List[Dict[str, Any]] = []
+        self._summary: Dict[str, Any] = {}
+        self._table: Optional[CompactRouteTable] = None
+        self._count = 0
+
+    def parse(self, response: str) -> None:
+        """Parse a single XML response."""
+        parser = expat.ParserCreate()
+        parser.buffer_text = True
+        parser.StartElementHandler = self._start
+        parser.EndElementHandler = self._end
+        parser.CharacterDataHandler = self._data
+        try:
+            # Ignore any banner preceding the XML document.
+            parser.Parse(response[max(response.find("<"), 0) :], True)
+        except expat.ExpatError:
+            # The XML response can have a CLI banner appended to the end of the XML string, after
+            # the root element is closed. Only fail if the document itself is incomplete.
+            if not self.complete:
+                raise
+
+    def _start(self, name: str, attrs: Dict[str, str]) -> None:
+        parent = self._path[-1] if self._path else None
+        self._path.append(name)
+        if self._frames or parent == "route-table" or name == "xnm:error":
+            self._frames.append({"attrs": {f"@{k}": v for k, v in attrs.items()}, "text": []})
+        elif name == "route-information":
+            self.has_route_information = True
+        elif name == "route-table":
+            self._summary, self._count = {}, 0
+
+    def _data(self, data: str) -> None:
+        if self._frames:
+            self._frames[-1]["text"].append(data)
+
+    def _end(self, name: str) -> None:
+        self._path.pop()
+        if not self._path:
+            self.complete = True
+
+        if self._frames:
+            frame = self._frames.pop()
+            value = self._value(frame)
+            if self._frames:
+                self._add_child(self._frames[-1]["attrs"], name, value)
+            elif name == "rt":
+                self._add_routes(value)
+            elif name == "xnm:error":
+                if isinstance(value, Dict) and "message" in value:
+                    raise ParsingError('Error from device: "{error}"', error=value["message"])
+            else:
+                self._summary[name] = value
+
+        elif name == "route-table" and self._table is not None:
+            summary = JuniperBGPTableSummary(**self._summary)
+            table, self._table = self._table, None
+            table.vrf = summary.vrf
+            table.count = self._count
+            table.sort()
+            log.bind(platform="juniper", routes=len(table)).debug("Serialized response")
+            self.tables.append(table)
+
+    def _add_routes(self, value: Dict[str, Any]) -> None:
+        table = JuniperRouteTable(**value)
+        self.has_routes = True
+        self._count += table.rt_entry_count
+        if self._table is None:
+            # The VRF is set once the table's summary has been parsed.
+            self._table = CompactRouteTable(vrf="", count=0, winning_weight="low")
+        for route in table.routes():
+            self._table.append(route)
+
+    @staticmethod
+    def _value(frame: Dict[str, Any]) -> Any:
+        """Get an element's value, matching the structure produced by `xmltodict`."""
+        text = "".join(frame["text"]).strip() or None
+        value = frame["attrs"]
+        if not value:
+            return text
+        if text is not None:
+            value["#text"] = text
+        return value
+
+    @staticmethod
+    def _add_child(parent: Dict[str, Any], name: str, value: Any) -> None:
+        if name in FORCE_LIST:
+            parent.setdefault(name, []).append(value)
+        elif name in parent:
+            if not isinstance(parent[name], List):
+                parent[name] = [parent[name]]
+            parent[name].append(value)
+        else:
+            parent[name] = value
+
+
+def parse_juniper(output: Sequence[str]) -> "OutputDataModel":
     """Parse a Juniper BGP XML response."""
-    result = None
+    tables = []
 
     _log = log.bind(plugin=BGPRoutePluginJuniper.__name__)
     for response in output:
-        cleaned = clean_xml_output(response)
-
+        stream = JuniperRouteStream()
         try:
-            parsed: "OrderedDict" = xmltodict.parse(
-                cleaned, force_list=("rt", "rt-entry", "community")
-            )
-            if "rpc-reply" in parsed.keys():
-                if "xnm:error" in parsed["rpc-reply"]:
-                    if "message" in parsed["rpc-reply"]["xnm:error"]:
-                        err = parsed["rpc-reply"]["xnm:error"]["message"]
-                        raise ParsingError('Error from device: "{}"', err)
-
-                parsed_base = parsed["rpc-reply"]["route-information"]
-            elif "route-information" in parsed.keys():
-                parsed_base = parsed["route-information"]
+            stream.parse(response)
 
-            if "route-table" not in parsed_base:
-                return result
+            if not stream.has_route_information:
+                raise KeyError("route-information")
 
-            if "rt" not in parsed_base["route-table"]:
-                return result
+            if not stream.has_routes:
+                break
 
-            parsed = parsed_base["route-table"]
-            validated = JuniperBGPTable(**parsed)
-            bgp_table = validated.bgp_table()
-
-            if result is None:
-                result = bgp_table
-            else:
-                result += bgp_table
+            tables.extend(stream.tables)
 
-        except xmltodict.expat.ExpatError as err:
+        except expat.ExpatError as err:
             _log.bind(error=str(err)).critical("Failed to decode XML")
             raise ParsingError("Error parsing response data") from err
 
@@ -114,13 +169,16 @@ def parse_juniper(output: Sequence[str]) -> "OutputDataModel":  # noqa: C901
             _log.critical(err)
             raise ParsingError(err) from err
 
-    return result
+    if len(tables) == 0:
+        return None
+    return CompactRouteTable.merge(*tables)
 
 
 class BGPRoutePluginJuniper(OutputPlugin):
     """Coerce a Juniper route table in XML format to a standard BGP Table structure."""
 
     _hyperglass_builtin: bool = PrivateAttr(True)
+    cpu_bound = True
     platforms: Sequence[str] = ("juniper",)
     directives: Sequence[str] = (
         "__hyperglass_juniper_bgp_route_table__",
@@ -0,0 +1,121 @@
+"""Run CPU-bound output plugins in a pool of worker processes.
+
+Parsing large device responses can take long enough to stall every other request handled by the
+same process. When `structured.parsing.workers` is set, output plugins marked as `cpu_bound` are
+run in a process pool instead. Route tables are returned from worker processes as columnar table
+data (`CompactRouteTable`), rather than as pickled model instances.
+"""
+
+# Standard Library
+import typing as t
+import asyncio
+import multiprocessing
+from inspect import iscoroutinefunction
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Project
+from hyperglass.log import log
+from hyperglass.state import use_state
+from hyperglass.exceptions.private import ParsingError
+from hyperglass.models.data.compact import BGPRouteTable, CompactRouteTable
+
+if t.TYPE_CHECKING:
+    # Project
+    from hyperglass.models.api.query import Query
+
+    # Local
+    from ._output import OutputType, OutputPlugin
+
+__all__ = ("use_parse_pool", "shutdown_parse_pool", "process_in_pool")
+
+# Result kinds returned from worker processes.
+TABLE = "table"
+MODEL = "model"
+OUTPUT = "output"
+
+_pool: t.Optional[ProcessPoolExecutor] = None
+
+
+def _initialize() -> None:
+    """Import parsers and load configuration before a worker process receives any output."""
+    # Project
+    from hyperglass.plugins import _builtin  # noqa: F401
+
+    use_state("params")
+
+
+def use_parse_pool() -> t.Optional[ProcessPoolExecutor]:
+    """Get this process's parse worker pool, or `None` if parse workers aren't enabled."""
+    global _pool
+    workers = use_state("params").structured.parsing.workers
+    if workers == 0:
+        return None
+    if _pool is None:
+        # Worker processes are spawned rather than forked, so they don't inherit the event loop,
+        # threads, or open connections of the process that created them.
+        _pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialize,
+        )
+        log.bind(workers=workers).debug("Started parse workers")
+    return _pool
+
+
+def shutdown_parse_pool() -> None:
+    """Stop this process's parse workers, if any are running."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _process(
+    plugins: t.Tuple["OutputPlugin", ...], output: "OutputType", query: "Query"
+) -> t.Tuple[str, t.Any]:
+    """Run plugins in a worker process."""
+    result = output
+    for plugin in plugins:
+        if iscoroutinefunction(plugin.process):
+            result = asyncio.run(plugin.process(output=result, query=query))
+        else:
+            result = plugin.process(output=result, query=query)
+        if result is False:
+            break
+    if isinstance(result, CompactRouteTable):
+        return (TABLE, result)
+    if isinstance(result, BGPRouteTable):
+        return (MODEL, CompactRouteTable.from_model(result))
+    return (OUTPUT, result)
+
+
+async def process_in_pool(
+    plugins: t.Sequence["OutputPlugin"],
+    *,
+    output: "OutputType",
+    query: "Query",
+    pool: ProcessPoolExecutor,
+    timeout: float,
+) -> "OutputType":
+    """Run plugins, in order, in a worker process."""
+    _log = log.bind(plugins=[p.name for p in plugins], timeout=timeout)
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(pool, _process, tuple(plugins), output, query)
+    try:
+        kind, result = await asyncio.wait_for(future, timeout=timeout)
+    except asyncio.TimeoutError as err:
+        # A worker process can't be interrupted, so it completes the work and discards the result.
+        _log.error("Output plugins timed out in parse worker")
+        raise ParsingError(
+            "Parsing output timed out after {timeout} seconds", timeout=timeout
+        ) from err
+    except BrokenProcessPool as err:
+        # A worker process exited unexpectedly; start a new pool for subsequent requests.
+        _log.bind(error=str(err)).error("Parse worker failed")
+        shutdown_parse_pool()
+        raise ParsingError("Error parsing response data") from err
+
+    if kind == MODEL:
+        return result.to_model()
+    return result
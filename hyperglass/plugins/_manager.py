@@ -2,7 +2,9 @@
 
 # Standard Library
 import typing as t
-from inspect import isclass
+import asyncio
+from inspect import isclass, iscoroutinefunction
+from itertools import groupby
 
 # Project
 from hyperglass.log import log
@@ -13,6 +15,8 @@ from hyperglass.exceptions.private import PluginError, InputValidationError
 from ._base import PluginType, HyperglassPlugin
 from ._input import InputPlugin, InputPluginTransformReturn, InputPluginValidationReturn
 from ._output import OutputType, OutputPlugin
+from ._executor import use_parse_pool, process_in_pool
+from ._registry import PluginRegistry, use_registry
 
 if t.TYPE_CHECKING:
     # Project
@@ -22,17 +26,55 @@ if t.TYPE_CHECKING:
 PluginT = t.TypeVar("PluginT", bound=HyperglassPlugin)
 
 
+async def call_plugin(
+    plugin: HyperglassPlugin, method: str, *args: t.Any, **kwargs: t.Any
+) -> t.Any:
+    """Call a plugin method, which may be a coroutine function.
+
+    Synchronous methods of plugins marked as `threaded` are run in a thread, so they don't block
+    the event loop.
+    """
+    func = getattr(plugin, method)
+    if iscoroutinefunction(func):
+        return await func(*args, **kwargs)
+    if plugin.threaded:
+        return await asyncio.to_thread(func, *args, **kwargs)
+    return func(*args, **kwargs)
+
+
+async def call_plugins(
+    plugins: t.Sequence[PluginT], method: str, *args: t.Any, **kwargs: t.Any
+) -> t.AsyncGenerator[t.Tuple[PluginT, t.Any], None]:
+    """Call the same method of multiple plugins, and get each plugin's result in order.
+
+    Consecutive plugins marked as `concurrent` are called at the same time.
+    """
+    for concurrent, group in groupby(plugins, key=lambda p: p.concurrent):
+        group = tuple(group)
+        if concurrent and len(group) > 1:
+            results = await asyncio.gather(
+                *(call_plugin(plugin, method, *args, **kwargs) for plugin in group)
+            )
+            for plugin, result in zip(group, results):
+                yield plugin, result
+            continue
+        for plugin in group:
+            yield plugin, await call_plugin(plugin, method, *args, **kwargs)
+
+
 class PluginManager(t.Generic[PluginT]):
     """Manage all plugins."""
 
     _type: PluginType
     _state: "HyperglassState"
+    _registry: PluginRegistry[PluginT]
     _index: int = 0
     _cache_key: str
 
     def __init__(self: "PluginManager") -> None:
         """Initialize plugin manager."""
         self._state = use_state()
+        self._registry = use_registry(self._type)
         self._cache_key = f"hyperglass.plugins.{self._type}"
 
     def __init_subclass__(cls: "PluginManager", **kwargs: PluginType) -> None:
@@ -58,20 +100,11 @@ class PluginManager(t.Generic[PluginT]):
 
     def plugins(self: "PluginManager", *, builtins: bool = True) -> t.List[PluginT]:
         """Get all plugins, with built-in plugins last."""
-        plugins = self._state.plugins(self._type)
+        plugins = self._registry.plugins()
 
         if builtins is False:
-            plugins = [p for p in plugins if p._hyperglass_builtin is False]
-
-        # Sort plugins by their name attribute, which is the name of the class by default.
-        sorted_by_name = sorted(plugins, key=lambda p: str(p))
-
-        # Sort with built-in plugins last.
-        return sorted(
-            sorted_by_name,
-            key=lambda p: -1 if p._hyperglass_builtin else 1,
-            reverse=True,
-        )
+            return [p for p in plugins if p._hyperglass_builtin is False]
+        return list(plugins)
 
     @property
     def name(self: PluginT) -> str:
@@ -94,13 +127,14 @@ class PluginManager(t.Generic[PluginT]):
         """Remove all plugins."""
         self._index = 0
         self._state.reset_plugins(self._type)
+        self._registry.invalidate()
 
     def unregister(self: "PluginManager", plugin: PluginT) -> None:
         """Remove a plugin from currently active plugins."""
         if isclass(plugin):
             if issubclass(plugin, HyperglassPlugin):
                 self._state.remove_plugin(self._type, plugin)
-
+                self._registry.invalidate()
                 return
         raise PluginError("Plugin '{}' is not a valid hyperglass plugin", repr(plugin))
 
@@ -111,6 +145,7 @@ class PluginManager(t.Generic[PluginT]):
             if issubclass(plugin, HyperglassPlugin):
                 instance = plugin(*args, **kwargs)
                 self._state.add_plugin(self._type, instance)
+                self._registry.invalidate()
                 _log = log.bind(type=self._type, name=instance.name)
                 if instance._hyperglass_builtin is True:
                     _log.debug("Registered built-in plugin")
@@ -129,25 +164,28 @@ class PluginManager(t.Generic[PluginT]):
 class InputPluginManager(PluginManager[InputPlugin], type="input"):
     """Manage Input Validation Plugins."""
 
-    def _gather_plugins(
-        self: "InputPluginManager", query: "Query"
-    ) -> t.Generator[InputPlugin, None, None]:
-        for plugin in self.plugins(builtins=True):
-            if plugin.directives and query.directive.id in plugin.directives:
-                yield plugin
-            if plugin.ref in query.directive.plugins:
-                yield plugin
-            if plugin.common is True:
-                yield plugin
-
-    def validate(self: "InputPluginManager", query: "Query") -> InputPluginValidationReturn:
+    def _gather_plugins(self: "InputPluginManager", query: "Query") -> t.Tuple[InputPlugin, ...]:
+        """Get the plugins that apply to a query's directive, each only once."""
+        directive = query.directive
+
+        def resolve(plugins: t.Tuple[InputPlugin, ...]) -> t.Generator[InputPlugin, None, None]:
+            for plugin in plugins:
+                if (
+                    (plugin.directives and directive.id in plugin.directives)
+                    or plugin.ref in directive.plugins
+                    or plugin.common is True
+                ):
+                    yield plugin
+
+        return self._registry.chain((directive.id, tuple(directive.plugins)), resolve)
+
+    async def validate(self: "InputPluginManager", query: "Query") -> InputPluginValidationReturn:
         """Execute all input validation plugins.
 
         If any plugin returns `False`, execution is halted.
         """
         result = None
-        for plugin in self._gather_plugins(query):
-            result = plugin.validate(query)
+        async for plugin, result in call_plugins(self._gather_plugins(query), "validate", query):
             result_test = "valid" if result is True else "invalid" if result is False else "none"
             log.bind(name=plugin.name, result=result_test).debug("Input Plugin Validation")
             if result is False:
@@ -158,11 +196,18 @@ class InputPluginManager(PluginManager[InputPlugin], type="input"):
                 return result
         return result
 
-    def transform(self: "InputPluginManager", *, query: "Query") -> InputPluginTransformReturn:
-        """Execute all input transformation plugins."""
+    async def transform(
+        self: "InputPluginManager", *, query: "Query"
+    ) -> InputPluginTransformReturn:
+        """Execute all input transformation plugins.
+
+        Each plugin transforms the original query target; the last plugin's result is used.
+        """
         result = query.query_target
-        for plugin in self._gather_plugins(query):
-            result = plugin.transform(query=query.summary())
+        summary = query.summary()
+        async for plugin, result in call_plugins(
+            self._gather_plugins(query), "transform", query=summary
+        ):
             log.bind(name=plugin.name, result=repr(result)).debug("Input Plugin Transform")
         return result
 
@@ -170,24 +215,59 @@ class InputPluginManager(PluginManager[InputPlugin], type="input"):
 class OutputPluginManager(PluginManager[OutputPlugin], type="output"):
     """Manage Output Processing Plugins."""
 
-    def execute(self: "OutputPluginManager", *, output: OutputType, query: "Query") -> OutputType:
+    def _gather_plugins(self: "OutputPluginManager", query: "Query") -> t.Tuple[OutputPlugin, ...]:
+        """Get the plugins that apply to a query's device platform & directive, each only once.
+
+        Plugins associated with the directive & platform run first, followed by common plugins.
+        """
+        platform, directive_id = query.device.platform, query.directive.id
+
+        def resolve(plugins: t.Tuple[OutputPlugin, ...]) -> t.Tuple[OutputPlugin, ...]:
+            return (
+                *(p for p in plugins if directive_id in p.directives and platform in p.platforms),
+                *(p for p in plugins if p.common is True),
+            )
+
+        return self._registry.chain((platform, directive_id), resolve)
+
+    async def execute(
+        self: "OutputPluginManager", *, output: OutputType, query: "Query"
+    ) -> OutputType:
         """Execute all output parsing plugins.
 
-        The result of each plugin is passed to the next plugin.
+        The result of each plugin is passed to the next plugin, so output plugins are always run
+        one at a time. If parse workers are enabled, consecutive CPU-bound plugins are run
+        together in a worker process.
         """
         result = output
-        directives = (
-            plugin
-            for plugin in self.plugins()
-            if query.directive.id in plugin.directives and query.device.platform in plugin.platforms
-        )
-        common = (plugin for plugin in self.plugins() if plugin.common is True)
-        for plugin in (*directives, *common):
-            log.bind(plugin=plugin.name, value=result).debug("Output Plugin Starting Value")
-            result = plugin.process(output=result, query=query)
-            log.bind(plugin=plugin.name, value=result).debug("Output Plugin Ending Value")
-
-            if result is False:
-                return result
-            # Pass the result of each plugin to the next plugin.
+        pool = use_parse_pool()
+
+        for cpu_bound, group in groupby(
+            self._gather_plugins(query), key=lambda p: pool is not None and p.cpu_bound
+        ):
+            plugins = tuple(group)
+            if cpu_bound:
+                log.bind(plugins=[p.name for p in plugins]).debug("Output Plugins Starting")
+                result = await process_in_pool(
+                    plugins,
+                    output=result,
+                    query=query,
+                    pool=pool,
+                    timeout=use_state("params").structured.parsing.timeout,
+                )
+                log.bind(plugins=[p.name for p in plugins], value=result).debug(
+                    "Output Plugins Ending Value"
+                )
+                if result is False:
+                    return result
+                continue
+
+            for plugin in plugins:
+                log.bind(plugin=plugin.name, value=result).debug("Output Plugin Starting Value")
+                result = await call_plugin(plugin, "process", output=result, query=query)
+                log.bind(plugin=plugin.name, value=result).debug("Output Plugin Ending Value")
+
+                if result is False:
+                    return result
+                # Pass the result of each plugin to the next plugin.
         return result
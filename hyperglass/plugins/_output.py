@@ -1,7 +1,7 @@
 """Device output plugins."""
 
 # Standard Library
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Union, ClassVar
 
 # Project
 from hyperglass.log import log
@@ -22,6 +22,9 @@ class OutputPlugin(HyperglassPlugin, DirectivePlugin, PlatformPlugin):
     """Plugin to interact with device command output."""
 
     _type = "output"
+    # If true, and parse workers are enabled, the plugin is run in a worker process. Plugins and
+    # their output must be picklable.
+    cpu_bound: ClassVar[bool] = False
 
     def process(self, *, output: OutputType, query: "Query") -> OutputType:
         """Process or manipulate output from a device."""
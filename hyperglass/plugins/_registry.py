@@ -0,0 +1,99 @@
+"""Process-local plugin registry."""
+
+# Standard Library
+import time
+import typing as t
+import threading
+from functools import lru_cache
+
+# Project
+from hyperglass.state import use_state
+
+# Local
+from ._base import PluginType, HyperglassPlugin
+
+__all__ = ("PluginRegistry", "use_registry")
+
+PluginT = t.TypeVar("PluginT", bound=HyperglassPlugin)
+ChainKey = t.Tuple[t.Hashable, ...]
+
+# Minimum number of seconds between checks for plugins registered by other processes.
+CHECK_INTERVAL = 1
+
+
+def _sort(plugins: t.Iterable[PluginT]) -> t.Tuple[PluginT, ...]:
+    """Sort plugins by name, with built-in plugins last."""
+    # Sort plugins by their name attribute, which is the name of the class by default.
+    sorted_by_name = sorted(plugins, key=lambda p: str(p))
+    return tuple(
+        sorted(sorted_by_name, key=lambda p: -1 if p._hyperglass_builtin else 1, reverse=True)
+    )
+
+
+class PluginRegistry(t.Generic[PluginT]):
+    """Plugins of one type, held in process memory.
+
+    Plugins are registered in Redis so every hyperglass process uses the same set of plugins.
+    Redis also holds a version number, which is incremented whenever plugins are registered or
+    removed; each process loads plugins from Redis only when the version changes. Resolved plugin
+    chains are cached until then.
+    """
+
+    _type: PluginType
+    # Plugins and the chains resolved from them, replaced together.
+    _current: t.Tuple[t.Tuple[PluginT, ...], t.Dict[ChainKey, t.Tuple[PluginT, ...]]]
+    _version: t.Optional[int]
+    _checked: float
+
+    def __init__(self, _type: PluginType) -> None:
+        """Create an empty registry."""
+        self._type = _type
+        self._current = ((), {})
+        self._version = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> None:
+        """Load plugins from Redis if they've changed since they were last loaded."""
+        if time.monotonic() - self._checked < CHECK_INTERVAL:
+            return
+        with self._lock:
+            state = use_state()
+            version = state.plugins_version(self._type)
+            if version != self._version:
+                self._current = (_sort(state.plugins(self._type)), {})
+                self._version = version
+            self._checked = time.monotonic()
+
+    def invalidate(self) -> None:
+        """Reload plugins on next use."""
+        self._checked = 0.0
+        self._version = None
+
+    def plugins(self) -> t.Tuple[PluginT, ...]:
+        """Get all plugins, with built-in plugins last."""
+        self._refresh()
+        plugins, _ = self._current
+        return plugins
+
+    def chain(
+        self,
+        key: ChainKey,
+        resolve: t.Callable[[t.Tuple[PluginT, ...]], t.Iterable[PluginT]],
+    ) -> t.Tuple[PluginT, ...]:
+        """Get the ordered plugins that apply to `key`, resolving them only once.
+
+        Plugins are deduplicated, preserving the order in which they're first resolved.
+        """
+        self._refresh()
+        plugins, chains = self._current
+        chain = chains.get(key)
+        if chain is None:
+            chain = chains[key] = tuple(dict.fromkeys(resolve(plugins)))
+        return chain
+
+
+@lru_cache
+def use_registry(_type: PluginType) -> PluginRegistry:
+    """Get the plugin registry for a plugin type, shared by the whole process."""
+    return PluginRegistry(_type)
@@ -1,7 +1,52 @@
+# Third Party
+import pytest
+
 # Project
+from hyperglass.state import use_state
+from hyperglass.models.directive import Directives
+from hyperglass.models.config.params import Params
 from hyperglass.models.config.devices import Device
 
+# Local
+from .._registry import use_registry
+from .._manager import InputPluginManager, OutputPluginManager
+
 
 class MockDevice(Device):
     def has_directives(self, *_: str) -> bool:
         return True
+
+
+@pytest.fixture
+def managers():
+    """Provide plugin managers with no registered plugins, and restore state afterwards."""
+    state = use_state()
+    saved_params = state.cache.get("params")
+    state.cache.set("params", Params())
+    saved = {_type: state.plugins(_type) for _type in ("input", "output")}
+    input_manager, output_manager = InputPluginManager(), OutputPluginManager()
+    for manager in (input_manager, output_manager):
+        manager.reset()
+    yield input_manager, output_manager
+    for _type, plugins in saved.items():
+        state._set_plugins(_type, plugins)
+        use_registry(_type).invalidate()
+    if saved_params is None:
+        state.cache.delete("params")
+    else:
+        state.cache.set("params", saved_params)
+
+
+@pytest.fixture(scope="module")
+def config_state():
+    """Seed configuration state, shared with worker processes, and restore it afterwards."""
+    state = use_state()
+    saved = {key: state.cache.get(key) for key in ("params", "directives")}
+    state.cache.set("params", Params())
+    state.cache.set("directives", Directives())
+    yield state
+    for key, value in saved.items():
+        if value is None:
+            state.cache.delete(key)
+        else:
+            state.cache.set(key, value)
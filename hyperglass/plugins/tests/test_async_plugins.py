@@ -0,0 +1,99 @@
+"""Asynchronous Plugin Tests."""
+
+# Standard Library
+import time
+import typing as t
+import asyncio
+import threading
+from types import SimpleNamespace
+
+# Third Party
+import pytest
+
+# Project
+from hyperglass.exceptions.private import InputValidationError
+
+# Local
+from .._input import InputPlugin
+from .._output import OutputPlugin
+from ._fixtures import managers  # noqa: F401
+
+DELAY = 0.2
+
+
+class SlowValidation(InputPlugin):
+    common: bool = True
+    concurrent = True
+
+    async def validate(self, query):
+        await asyncio.sleep(DELAY)
+        return None
+
+
+class OtherSlowValidation(InputPlugin):
+    common: bool = True
+    concurrent = True
+    failure_reason: t.Optional[str] = "other"
+
+    async def validate(self, query):
+        await asyncio.sleep(DELAY)
+        return query.query_target != "invalid"
+
+
+class ThreadedTransform(InputPlugin):
+    common: bool = True
+    threaded = True
+
+    def transform(self, query):
+        assert threading.current_thread() is not threading.main_thread()
+        return query.query_target.upper()
+
+
+class AsyncOutput(OutputPlugin):
+    common: bool = True
+
+    async def process(self, *, output, query):
+        await asyncio.sleep(0)
+        return tuple(f"{o}!" for o in output)
+
+
+class SyncOutput(OutputPlugin):
+    common: bool = True
+
+    def process(self, *, output, query):
+        return tuple(f"{o}?" for o in output)
+
+
+def _query(target: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        query_target=target,
+        device=SimpleNamespace(platform="juniper"),
+        directive=SimpleNamespace(id="bgp_route", plugins=[]),
+        summary=lambda: SimpleNamespace(query_target=target),
+    )
+
+
+def test_input_plugins(managers):  # noqa: F811
+    input_manager, _ = managers
+    for plugin in (SlowValidation, OtherSlowValidation, ThreadedTransform):
+        input_manager.register(plugin)
+
+    start = time.perf_counter()
+    assert asyncio.run(input_manager.validate(_query("valid"))) is True
+    # Concurrent plugins are run at the same time.
+    assert time.perf_counter() - start < DELAY * 2
+
+    with pytest.raises(InputValidationError):
+        asyncio.run(input_manager.validate(_query("invalid")))
+
+    assert asyncio.run(input_manager.transform(query=_query("target"))) == "TARGET"
+
+
+def test_output_plugins(managers):  # noqa: F811
+    _, output_manager = managers
+    for plugin in (AsyncOutput, SyncOutput):
+        output_manager.register(plugin)
+
+    result = asyncio.run(output_manager.execute(output=("output",), query=_query("target")))
+    # Each plugin's result is passed to the next plugin, in order of plugin name.
+    assert result == ("output!?",)
@@ -9,7 +9,7 @@ import pytest
 
 # Project
 from hyperglass.models.config.devices import Device
-from hyperglass.models.data.bgp_route import BGPRouteTable
+from hyperglass.models.data.compact import CompactRouteTable
 
 # Local
 from ._fixtures import MockDevice
@@ -43,7 +43,7 @@ def _tester(sample: str):
     query = type("Query", (), {"device": device})
 
     result = plugin.process(output=(sample,), query=query)
-    assert isinstance(result, BGPRouteTable), "Invalid parsed result"
+    assert isinstance(result, CompactRouteTable), "Invalid parsed result"
     assert hasattr(result, "count"), "BGP Table missing count"
     assert result.count > 0, "BGP Table count is 0"
 
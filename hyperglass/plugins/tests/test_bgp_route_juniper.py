@@ -8,7 +8,7 @@ from pathlib import Path
 import pytest
 
 # Project
-from hyperglass.models.data.bgp_route import BGPRouteTable
+from hyperglass.models.data.compact import CompactRouteTable
 
 # Local
 from ._fixtures import MockDevice
@@ -44,7 +44,7 @@ def _tester(sample: str):
     query = type("Query", (), {"device": device})
 
     result = plugin.process(output=(sample,), query=query)
-    assert isinstance(result, BGPRouteTable), "Invalid parsed result"
+    assert isinstance(result, CompactRouteTable), "Invalid parsed result"
     assert hasattr(result, "count"), "BGP Table missing count"
     assert result.count > 0, "BGP Table count is 0"
 
@@ -68,3 +68,39 @@ def test_juniper_bgp_route_aspath():
     with AS_PATH.open("r") as file:
         sample = file.read()
     return _tester(sample)
+
+
+def test_juniper_route_stream():
+    # Third Party
+    import xmltodict
+
+    # Local
+    from .._builtin.bgp_route_juniper import FORCE_LIST, JuniperRouteStream
+
+    with AS_PATH.open("r") as file:
+        sample = file.read()
+
+    parsed = xmltodict.parse(sample, force_list=FORCE_LIST)
+    expected = parsed["rpc-reply"]["route-information"]["route-table"]["rt"]
+
+    streamed = []
+    stream = JuniperRouteStream()
+    stream._add_routes = streamed.append
+    # Trailing CLI banners should be ignored once the document is complete.
+    stream.parse(sample + "\n{master}\n")
+
+    assert stream.has_route_information
+    assert streamed == expected
+    assert stream._summary["table-name"] == "inet.0"
+
+
+def test_juniper_route_stream_error():
+    # Project
+    from hyperglass.exceptions.private import ParsingError
+
+    # Local
+    from .._builtin.bgp_route_juniper import JuniperRouteStream
+
+    sample = "<rpc-reply><xnm:error><message>syntax error</message></xnm:error></rpc-reply>"
+    with pytest.raises(ParsingError):
+        JuniperRouteStream().parse(sample)
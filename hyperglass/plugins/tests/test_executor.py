@@ -0,0 +1,105 @@
+"""Parse Worker Tests."""
+
+# flake8: noqa
+# Standard Library
+import time
+import asyncio
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+# Third Party
+import pytest
+
+# Project
+from hyperglass.exceptions.private import ParsingError
+from hyperglass.models.data.compact import CompactRouteTable
+
+# Local
+from ._fixtures import MockDevice, config_state
+from .._output import OutputPlugin
+from .._executor import process_in_pool
+from .._builtin.bgp_route_frr import BGPRoutePluginFrr
+
+SAMPLE = Path(__file__).parent.parent.parent.parent / ".samples" / "frr_bgp_route.json"
+
+
+class MockQuery:
+    """Picklable stand-in for a query."""
+
+    def __init__(self, device: MockDevice) -> None:
+        self.device = device
+
+
+class SlowPlugin(OutputPlugin):
+    cpu_bound = True
+
+    def process(self, *, output, query):
+        time.sleep(1)
+        return output
+
+
+class ErrorPlugin(OutputPlugin):
+    cpu_bound = True
+
+    def process(self, *, output, query):
+        raise ParsingError('Error from device: "{error}"', error="bad")
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        yield pool
+
+
+def _query() -> MockQuery:
+    device = MockDevice(
+        name="Test Device",
+        address="127.0.0.1",
+        group="Test Network",
+        credential={"username": "", "password": ""},
+        platform="frr",
+        structured_output=True,
+        directives=["__hyperglass_frr_bgp_route_table__"],
+        attrs={"source4": "192.0.2.1", "source6": "2001:db8::1"},
+    )
+    return MockQuery(device)
+
+
+def test_process_in_pool(pool, config_state):  # noqa: F811
+    plugin = BGPRoutePluginFrr()
+    query = _query()
+    output = (SAMPLE.read_text(),)
+
+    result = asyncio.run(
+        process_in_pool((plugin,), output=output, query=query, pool=pool, timeout=30)
+    )
+    assert isinstance(result, CompactRouteTable)
+
+    # Route age is relative to the time the output is parsed.
+    def routes(table: CompactRouteTable):
+        return [{k: v for k, v in route.items() if k != "age"} for route in table._rows()]
+
+    assert routes(result) == routes(plugin.process(output=output, query=query))
+
+
+def test_process_in_pool_timeout(pool, config_state):  # noqa: F811
+    with pytest.raises(ParsingError):
+        asyncio.run(
+            process_in_pool((SlowPlugin(),), output=("",), query=_query(), pool=pool, timeout=0.1)
+        )
+
+
+def test_process_in_pool_error(pool, config_state):  # noqa: F811
+    # Errors formatted from keyword arguments are raised as they were in the worker process.
+    with pytest.raises(ParsingError, match='Error from device: "bad"'):
+        asyncio.run(
+            process_in_pool((ErrorPlugin(),), output=("",), query=_query(), pool=pool, timeout=30)
+        )
+
+    # The pool still works after a worker raises an error.
+    output = (SAMPLE.read_text(),)
+    result = asyncio.run(
+        process_in_pool((BGPRoutePluginFrr(),), output=output, query=_query(), pool=pool, timeout=30)
+    )
+    assert isinstance(result, CompactRouteTable)
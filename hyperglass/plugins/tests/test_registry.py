@@ -0,0 +1,63 @@
+"""Plugin Registry Tests."""
+
+# Standard Library
+import typing as t
+from types import SimpleNamespace
+
+# Project
+from hyperglass.state import use_state
+
+# Local
+from .. import _registry
+from .._input import InputPlugin
+from .._output import OutputPlugin
+from ._fixtures import managers  # noqa: F401
+
+
+class DirectiveOutput(OutputPlugin):
+    platforms: t.Sequence[str] = ("juniper",)
+    directives: t.Sequence[str] = ("bgp_route",)
+
+
+class OtherPlatformOutput(OutputPlugin):
+    platforms: t.Sequence[str] = ("arista_eos",)
+    directives: t.Sequence[str] = ("bgp_route",)
+
+
+class CommonOutput(OutputPlugin):
+    common: bool = True
+
+
+class CommonDirectiveOutput(OutputPlugin):
+    common: bool = True
+    platforms: t.Sequence[str] = ("juniper",)
+    directives: t.Sequence[str] = ("bgp_route",)
+
+
+class AllInput(InputPlugin):
+    common: bool = True
+    ref: t.Optional[str] = "all_input"
+    directives: t.Sequence[str] = ("bgp_route",)
+
+
+def test_plugin_chains(managers, monkeypatch):  # noqa: F811
+    input_manager, output_manager = managers
+    for plugin in (DirectiveOutput, OtherPlatformOutput, CommonOutput, CommonDirectiveOutput):
+        output_manager.register(plugin)
+    input_manager.register(AllInput)
+
+    query = SimpleNamespace(
+        device=SimpleNamespace(platform="juniper"),
+        directive=SimpleNamespace(id="bgp_route", plugins=["all_input"]),
+    )
+    chain = output_manager._gather_plugins(query)
+    assert [p.name for p in chain] == ["CommonDirectiveOutput", "DirectiveOutput", "CommonOutput"]
+    # Chains are resolved once.
+    assert output_manager._gather_plugins(query) is chain
+    assert [p.name for p in input_manager._gather_plugins(query)] == ["AllInput"]
+
+    # Plugins removed by another process are picked up once the registry checks for changes.
+    monkeypatch.setattr(_registry, "CHECK_INTERVAL", 0)
+    use_state().remove_plugin("output", CommonOutput())
+    chain = output_manager._gather_plugins(query)
+    assert [p.name for p in chain] == ["CommonDirectiveOutput", "DirectiveOutput"]
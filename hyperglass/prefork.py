@@ -0,0 +1,229 @@
+"""Preload application state and fork uvicorn workers that share it."""
+
+# Standard Library
+import gc
+import os
+import signal
+import typing as t
+import threading
+
+# Third Party
+import uvicorn
+
+# Project
+from hyperglass.log import log
+
+if t.TYPE_CHECKING:
+    # Standard Library
+    from socket import socket
+    from types import FrameType
+
+    # Third Party
+    from litestar import Litestar
+
+    # Local
+    from .configuration.reload import ConfigReloader
+
+__all__ = ("preload", "PreforkServer")
+
+HANDLED_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+
+# Worker index of the configuration reloader process.
+RELOADER = -1
+
+
+def preload() -> "Litestar":
+    """Import the application and load immutable state into the current process.
+
+    Everything loaded here is inherited by forked workers, and shared with them copy-on-write.
+    """
+    # Project
+    from hyperglass.state import use_state
+    from hyperglass.util import resolve_hostnames, run_coroutine_in_new_thread
+
+    # Importing the API builds the application, its models, and all execution drivers.
+    from hyperglass.api import app
+
+    # Warm the per-process state cache so workers don't each unpickle the same objects.
+    for attr in ("params", "devices", "directives", "ui_params"):
+        use_state(attr)
+
+    # Resolve device hostnames, so workers inherit the cached results rather than each resolving
+    # them on their first connection to each device.
+    params = use_state("params")
+    hostnames = [device._target for device in use_state("devices")]
+    resolver = params.dns.resolver()
+    run_coroutine_in_new_thread(lambda: resolve_hostnames(*hostnames, resolver=resolver))
+
+    rpki = params.structured.rpki
+    if rpki.mode == "local":
+        # Project
+        from hyperglass.external.vrp import use_vrps
+
+        use_vrps(rpki.vrp_file).table()
+
+    # Move everything loaded so far out of the garbage collector's tracked generations. Otherwise,
+    # each collection in a worker touches (and therefore copies) every page of preloaded objects.
+    gc.collect()
+    gc.freeze()
+
+    return app
+
+
+class PreforkServer:
+    """Fork uvicorn workers from a process with preloaded state, and supervise them.
+
+    Workers may be forked again at any time, so the supervising process never runs any threads.
+    Configuration is reloaded in a separate process, also supervised, which `SIGHUP` is forwarded to.
+    """
+
+    config: uvicorn.Config
+    workers: t.Dict[int, int]
+    socket: t.Optional["socket"]
+    should_exit: threading.Event
+    reloader: t.Optional["ConfigReloader"]
+    watch_config: bool
+
+    def __init__(
+        self,
+        config: uvicorn.Config,
+        *,
+        graceful_timeout: int = 10,
+        reloader: t.Optional["ConfigReloader"] = None,
+        watch_config: bool = False,
+    ) -> None:
+        """Set up supervisor with a uvicorn configuration."""
+        self.config = config
+        self.graceful_timeout = graceful_timeout
+        self.workers = {}
+        self.socket = None
+        self.should_exit = threading.Event()
+        self.reloader = reloader
+        self.watch_config = watch_config
+
+    def signal_handler(self, sig: int, frame: t.Optional["FrameType"]) -> None:
+        """Stop supervising workers when a handled signal is received."""
+        self.should_exit.set()
+
+    def reload_handler(self, sig: int, frame: t.Optional["FrameType"]) -> None:
+        """Forward a configuration reload request to the reloader process."""
+        for pid, index in self.workers.items():
+            if index == RELOADER:
+                os.kill(pid, signal.SIGHUP)
+
+    def spawn_reloader(self) -> int:
+        """Fork a process that reloads configuration when requested, in background threads."""
+        pid = os.fork()
+        if pid != 0:
+            self.workers[pid] = RELOADER
+            return pid
+
+        # Reloader process.
+        for sig in HANDLED_SIGNALS:
+            signal.signal(sig, signal.SIG_DFL)
+        signal.signal(signal.SIGHUP, self.reloader.request)
+        if self.socket is not None:
+            self.socket.close()
+        exit_code = 0
+        try:
+            self.reloader.start(watch=self.watch_config)
+            while True:
+                signal.pause()
+        except BaseException as err:
+            log.bind(pid=os.getpid(), error=str(err)).critical("Configuration reloader failed")
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def spawn(self, index: int) -> int:
+        """Fork a worker process and run a uvicorn server in it."""
+        if index == RELOADER:
+            return self.spawn_reloader()
+        pid = os.fork()
+        if pid != 0:
+            self.workers[pid] = index
+            return pid
+
+        # Worker process.
+        for sig in HANDLED_SIGNALS:
+            signal.signal(sig, signal.SIG_DFL)
+        # Configuration is reloaded by the supervising process only.
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        exit_code = 0
+        try:
+            uvicorn.Server(config=self.config).run(sockets=[self.socket])
+        except BaseException as err:
+            log.bind(pid=os.getpid(), error=str(err)).critical("Worker failed")
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def reap(self) -> None:
+        """Collect exited workers and replace them."""
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            index = self.workers.pop(pid, None)
+            if index is None or self.should_exit.is_set():
+                continue
+            log.bind(pid=pid, exit_code=os.waitstatus_to_exitcode(status)).warning(
+                "Worker exited unexpectedly, restarting"
+            )
+            self.spawn(index)
+
+    def run(self) -> None:
+        """Bind the listening socket, fork workers, and supervise them until stopped."""
+        # Load the ASGI application & middleware once, prior to forking.
+        self.config.load()
+        self.socket = self.config.bind_socket()
+
+        for sig in HANDLED_SIGNALS:
+            signal.signal(sig, self.signal_handler)
+        signal.signal(signal.SIGHUP, self.reload_handler)
+
+        for index in range(self.config.workers):
+            self.spawn(index)
+
+        if self.reloader is not None:
+            self.spawn_reloader()
+
+        log.bind(pid=os.getpid(), workers=list(self.workers)).debug("Started preloaded workers")
+
+        while not self.should_exit.wait(1):
+            self.reap()
+
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        """Stop all workers, and kill any that don't stop within the graceful timeout."""
+        for pid in self.workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+        timer = threading.Timer(self.graceful_timeout, self.kill)
+        timer.start()
+        try:
+            for pid in tuple(self.workers):
+                try:
+                    os.waitpid(pid, 0)
+                except ChildProcessError:
+                    pass
+                self.workers.pop(pid, None)
+        finally:
+            timer.cancel()
+            if self.socket is not None:
+                self.socket.close()
+
+    def kill(self) -> None:
+        """Forcibly stop any remaining workers."""
+        for pid in tuple(self.workers):
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
@@ -1,10 +1,12 @@
 """hyperglass global state management."""
 
 # Local
+from .cache import QueryCache
 from .hooks import use_state
 from .store import HyperglassState
 
 __all__ = (
     "use_state",
     "HyperglassState",
+    "QueryCache",
 )
@@ -0,0 +1,311 @@
+"""Query response cache with secondary indexes."""
+
+# Standard Library
+import time
+import pickle
+import typing as t
+import hashlib
+from ipaddress import ip_network
+
+# Project
+from hyperglass.util import repr_from_attrs
+
+if t.TYPE_CHECKING:
+    # Third Party
+    from redis import Redis
+
+    # Project
+    from hyperglass.models.api.query import Query
+
+# Maximum number of expired entries removed from indexes each time an entry is cached.
+SWEEP_LIMIT = 100
+
+CacheEntryMeta = t.TypedDict(
+    "CacheEntryMeta",
+    {"key": str, "device": str, "directive": str, "target": str, "bytes": int, "hits": int},
+)
+CacheStats = t.TypedDict(
+    "CacheStats",
+    {
+        "keys": int,
+        "bytes": int,
+        "hits": int,
+        "misses": int,
+        "hit_ratio": float,
+        "top_by_size": t.List[CacheEntryMeta],
+        "top_by_hits": t.List[CacheEntryMeta],
+    },
+)
+
+
+def _target_matches(target: str, search: str) -> bool:
+    """Determine if a cached query target falls within a target search value.
+
+    If the search value is an IP prefix, any cached IP target contained within it matches.
+    Otherwise, cached targets are matched by string prefix.
+    """
+    try:
+        search_net = ip_network(search, strict=False)
+    except ValueError:
+        return target.startswith(search)
+
+    try:
+        target_net = ip_network(target, strict=False)
+    except ValueError:
+        return False
+
+    if target_net.version != search_net.version:
+        return False
+    return target_net.subnet_of(search_net)
+
+
+class QueryCache:
+    """Cache query responses and maintain index sets by device, directive, and target.
+
+    Each cached response is stored as a Redis hash containing the response `output`, its
+    `timestamp`, and the device, directive, & target that produced it. Every entry is added to
+    per-device and per-directive index sets so entries can be listed and evicted without scanning
+    the entire keyspace. Only entries expire on their own, so entries' expiration times are also
+    indexed, and each time an entry is cached, some expired entries are removed from all indexes.
+
+    If `generation` is set, it names a Redis hash of configuration generation hashes. The
+    generation of a query's device, directive, and structured output configuration is included in
+    its cache key, so a configuration change only invalidates the entries it affects.
+    """
+
+    instance: "Redis"
+    namespace: str
+    generation: t.Optional[str]
+
+    def __init__(
+        self, instance: "Redis", namespace: str, generation: t.Optional[str] = None
+    ) -> None:
+        """Set up query cache with a Redis instance."""
+        self.instance = instance
+        self.namespace = namespace
+        self.generation = generation
+
+    def __repr__(self) -> str:
+        """Represent query cache by namespace."""
+        return repr_from_attrs(self, ("namespace",))
+
+    def _name(self, *parts: str) -> str:
+        return ":".join((self.namespace, *parts))
+
+    @property
+    def _all(self) -> str:
+        return self._name("index", "all")
+
+    @property
+    def _hits(self) -> str:
+        return self._name("index", "hits")
+
+    @property
+    def _stats(self) -> str:
+        return self._name("stats")
+
+    @property
+    def _expires(self) -> str:
+        return self._name("index", "expires")
+
+    @property
+    def _owners(self) -> str:
+        return self._name("index", "owners")
+
+    def _device_index(self, device: str) -> str:
+        return self._name("index", "device", device)
+
+    def _directive_index(self, directive: str) -> str:
+        return self._name("index", "directive", directive)
+
+    def key(self, query: "Query") -> str:
+        """Get the cache key for a query, including the generation of its configuration."""
+        if self.generation is None:
+            return self._name("entry", query.digest())
+
+        generation = self.instance.hmget(
+            self.generation,
+            "structured",
+            f"device:{query.device.id}",
+            f"directive:{query.directive.id}",
+        )
+        digest = hashlib.sha256(query.digest().encode())
+        for part in generation:
+            digest.update(b"\x1f" + (part or b""))
+        return self._name("entry", digest.hexdigest())
+
+    def get(self, query: "Query", *, timeout: int) -> t.Optional[t.Tuple[t.Any, t.Any]]:
+        """Get a cached output & timestamp, if any, and reset the entry's expiration."""
+        key = self.key(query)
+        output, timestamp = self.instance.hmget(key, "output", "timestamp")
+        if output is None:
+            self.instance.hincrby(self._stats, "misses", 1)
+            return None
+
+        with self.instance.pipeline() as pipeline:
+            pipeline.expire(key, timeout)
+            pipeline.zadd(self._expires, {key: time.time() + timeout}, xx=True)
+            pipeline.hincrby(self._stats, "hits", 1)
+            pipeline.zincrby(self._hits, 1, key)
+            pipeline.execute()
+
+        return pickle.loads(output), pickle.loads(timestamp)  # noqa: S301
+
+    def set(self, query: "Query", *, output: t.Any, timestamp: t.Any, timeout: int) -> str:
+        """Cache a query's output and add it to all indexes."""
+        key = self.key(query)
+        target = query.query_target
+        if isinstance(target, (t.List, t.Tuple)):
+            target = ",".join(target)
+
+        with self.instance.pipeline() as pipeline:
+            pipeline.hset(
+                key,
+                mapping={
+                    "output": pickle.dumps(output),
+                    "timestamp": pickle.dumps(timestamp),
+                    "device": query.device.id,
+                    "directive": query.directive.id,
+                    "target": str(target),
+                },
+            )
+            pipeline.expire(key, timeout)
+            pipeline.zadd(self._expires, {key: time.time() + timeout})
+            pipeline.sadd(self._all, key)
+            pipeline.sadd(self._device_index(query.device.id), key)
+            pipeline.sadd(self._directive_index(query.directive.id), key)
+            pipeline.zadd(self._hits, {key: 0}, nx=True)
+            pipeline.hset(self._owners, key, f"{query.device.id}\x1f{query.directive.id}")
+            pipeline.execute()
+        self._sweep()
+        return key
+
+    def _sweep(self) -> None:
+        """Remove a limited number of expired entries from indexes."""
+        due = self.instance.zrangebyscore(
+            self._expires, "-inf", time.time(), start=0, num=SWEEP_LIMIT
+        )
+        if due:
+            self._prune(due)
+
+    def _prune(self, keys: t.Sequence[bytes]) -> t.List[str]:
+        """Remove expired entries from indexes and return only keys that still exist."""
+        keys = [k.decode() if isinstance(k, bytes) else k for k in keys]
+        with self.instance.pipeline() as pipeline:
+            for key in keys:
+                pipeline.exists(key)
+            exists = pipeline.execute()
+
+        live = [k for k, e in zip(keys, exists) if e]
+        expired = [k for k, e in zip(keys, exists) if not e]
+        if expired:
+            self._remove_from_indexes(*expired)
+        return live
+
+    def _remove_from_indexes(self, *keys: str) -> None:
+        # Index ownership is stored separately from each entry so that expired entries, whose
+        # hashes no longer exist, can still be removed from their device & directive indexes.
+        owners = self.instance.hmget(self._owners, *keys)
+        with self.instance.pipeline() as pipeline:
+            pipeline.srem(self._all, *keys)
+            pipeline.zrem(self._hits, *keys)
+            pipeline.zrem(self._expires, *keys)
+            pipeline.hdel(self._owners, *keys)
+            for key, owner in zip(keys, owners):
+                if owner is None:
+                    continue
+                device, directive = owner.decode().split("\x1f", 1)
+                pipeline.srem(self._device_index(device), key)
+                pipeline.srem(self._directive_index(directive), key)
+            pipeline.execute()
+
+    def _metas(self, *keys: str) -> t.List[CacheEntryMeta]:
+        """Get metadata for each cache key."""
+        with self.instance.pipeline() as pipeline:
+            for key in keys:
+                pipeline.hmget(key, "device", "directive", "target")
+                pipeline.hstrlen(key, "output")
+                pipeline.zscore(self._hits, key)
+            results = pipeline.execute()
+
+        metas = []
+        for index, key in enumerate(keys):
+            fields, size, hits = results[index * 3 : index * 3 + 3]
+            device, directive, target = (f.decode() if f is not None else "" for f in fields)
+            metas.append(
+                {
+                    "key": key,
+                    "device": device,
+                    "directive": directive,
+                    "target": target,
+                    "bytes": size or 0,
+                    "hits": int(hits or 0),
+                }
+            )
+        return metas
+
+    def keys(
+        self,
+        *,
+        device: t.Optional[str] = None,
+        directive: t.Optional[str] = None,
+        target: t.Optional[str] = None,
+    ) -> t.List[str]:
+        """Get all live cache keys, optionally filtered by device, directive, and/or target."""
+        sets = []
+        if device is not None:
+            sets.append(self._device_index(device))
+        if directive is not None:
+            sets.append(self._directive_index(directive))
+        if not sets:
+            sets.append(self._all)
+
+        keys = self._prune(list(self.instance.sinter(*sets)))
+
+        if target is not None:
+            keys = [m["key"] for m in self._metas(*keys) if _target_matches(m["target"], target)]
+        return sorted(keys)
+
+    def entries(self, **filters: t.Optional[str]) -> t.List[CacheEntryMeta]:
+        """Get metadata for all live cache entries matching filters."""
+        keys = self.keys(**filters)
+        if not keys:
+            return []
+        return self._metas(*keys)
+
+    def evict(
+        self,
+        *,
+        device: t.Optional[str] = None,
+        directive: t.Optional[str] = None,
+        target: t.Optional[str] = None,
+    ) -> int:
+        """Evict all cache entries matching filters and return the number of evicted entries."""
+        keys = self.keys(device=device, directive=directive, target=target)
+        if not keys:
+            return 0
+        self._remove_from_indexes(*keys)
+        self.instance.delete(*keys)
+        return len(keys)
+
+    def clear(self) -> int:
+        """Evict all cache entries and reset statistics."""
+        count = self.evict()
+        index_keys = list(self.instance.scan_iter(match=self._name("index", "*")))
+        self.instance.delete(self._stats, *index_keys)
+        return count
+
+    def stats(self, *, top: int = 10) -> CacheStats:
+        """Get cache statistics, including the largest and most-hit entries."""
+        hits, misses = (int(v or 0) for v in self.instance.hmget(self._stats, "hits", "misses"))
+        entries = self.entries()
+        lookups = hits + misses
+        return {
+            "keys": len(entries),
+            "bytes": sum(e["bytes"] for e in entries),
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "top_by_size": sorted(entries, key=lambda e: e["bytes"], reverse=True)[:top],
+            "top_by_hits": sorted(entries, key=lambda e: e["hits"], reverse=True)[:top],
+        }
@@ -1,10 +1,15 @@
 """Hooks for accessing hyperglass global state."""
 
 # Standard Library
+import time
 import typing as t
 from functools import lru_cache
 
+# Third Party
+from redis.exceptions import RedisError
+
 # Project
+from hyperglass.log import log
 from hyperglass.exceptions.private import StateError
 
 # Local
@@ -19,23 +24,59 @@ if t.TYPE_CHECKING:
     from hyperglass.models.config.devices import Devices
 
     # Local
+    from .cache import QueryCache
     from .redis import RedisManager
 
 
+# Minimum number of seconds between checks for replaced configuration state.
+CHECK_INTERVAL = 1
+
+
 @lru_cache
-def _use_state(attr: t.Optional[str] = None) -> "HyperglassState":
+def _state() -> "HyperglassState":
+    return HyperglassState(settings=Settings)
+
+
+class _Version:
+    """Configuration version last seen by this process."""
+
+    value: int = 0
+    checked: float = float("-inf")
+
+
+def _config_version() -> int:
+    """Get the current configuration version, checking for a new version at most once per interval.
+
+    Configuration objects are cached by version, so once configuration state is replaced (for
+    example, when configuration is reloaded), each process uses the new state within
+    `CHECK_INTERVAL` seconds.
+    """
+    now = time.monotonic()
+    if now - _Version.checked >= CHECK_INTERVAL:
+        _Version.checked = now
+        try:
+            _Version.value = _state().config_version()
+        except RedisError as err:
+            # Keep using the current configuration until Redis is reachable again.
+            log.bind(error=str(err)).warning("Failed to check configuration version")
+    return _Version.value
+
+
+@lru_cache(maxsize=32)
+def _use_state(attr: t.Optional[str] = None, version: int = 0) -> "HyperglassState":
     """Get hyperglass state by property.
 
     Implemented separately due to typing issues related to lru_cache described here:
     https://github.com/python/mypy/issues/8356
     https://github.com/python/mypy/issues/9112
     """
+    state = _state()
     if attr is None:
-        return HyperglassState(settings=Settings)
+        return state
     if attr in ("cache", "redis"):
-        return HyperglassState(settings=Settings).cache
+        return state.cache
     if attr in HyperglassState.properties():
-        return getattr(HyperglassState(settings=Settings), attr)
+        return getattr(state, attr)
     raise StateError("'{attr}' does not exist on HyperglassState", attr=attr)
 
 
@@ -59,6 +100,16 @@ def use_state(attr: t.Literal["cache", "redis"]) -> "RedisManager":
     """Directly access hyperglass Redis cache manager."""
 
 
+@t.overload
+def use_state(attr: t.Literal["external_cache"]) -> "RedisManager":
+    """Access the hyperglass Redis manager for externally sourced data."""
+
+
+@t.overload
+def use_state(attr: t.Literal["query_cache"]) -> "QueryCache":
+    """Access the hyperglass query response cache."""
+
+
 @t.overload
 def use_state(attr: t.Literal["directives"]) -> "Directives":
     """Access all hyperglass directives."""
@@ -74,4 +125,6 @@ def use_state(attr=None) -> "HyperglassState":
 
 def use_state(attr: t.Optional[str] = None) -> "HyperglassState":
     """Access global hyperglass state."""
-    return _use_state(attr)
+    if attr is None or attr in ("cache", "redis"):
+        return _use_state(attr)
+    return _use_state(attr, _config_version())
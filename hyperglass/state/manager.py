@@ -20,12 +20,15 @@ if t.TYPE_CHECKING:
 class StateManager:
     """Global State Manager.
 
-    Maintains configuration objects in Redis cache and accesses them as needed.
+    Maintains configuration objects in Redis cache and accesses them as needed. Configuration
+    state and cached data are kept in separate namespaces, so that configuration state may be
+    reset (for example, on startup) without discarding cached data.
     """
 
     settings: "HyperglassSettings"
     redis: RedisManager
     _namespace: str = "hyperglass.state"
+    _cache_namespace: str = "hyperglass.cache"
 
     def __init__(self, *, settings: "HyperglassSettings") -> None:
         """Set up Redis connection and add configuration objects."""
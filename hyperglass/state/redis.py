@@ -124,6 +124,17 @@ class RedisManager:
             return pickle.loads(value)  # noqa
         return None
 
+    def get_map_items(self, key: str, items: t.Sequence[str]) -> t.Dict[str, t.Any]:
+        """Get multiple values from a Redis hash map, omitting items that don't exist."""
+        if len(items) == 0:
+            return {}
+        values = self.instance.hmget(self.key(key), items)
+        return {
+            item: pickle.loads(value)  # noqa
+            for item, value in zip(items, values)
+            if isinstance(value, bytes)
+        }
+
     def set_map_item(self, key: str, item: str, value: t.Any) -> None:
         """Add a value to a hash map (dict)."""
         name = self.key(key)
@@ -1,9 +1,12 @@
 """Primary state container."""
 
 # Standard Library
+import pickle
 import typing as t
 
 # Local
+from .cache import QueryCache
+from .redis import RedisManager
 from .manager import StateManager
 
 if t.TYPE_CHECKING:
@@ -14,9 +17,6 @@ if t.TYPE_CHECKING:
     from hyperglass.models.config.params import Params
     from hyperglass.models.config.devices import Devices
 
-    # Local
-    from .manager import RedisManager
-
 
 PluginT = t.TypeVar("PluginT", bound="HyperglassPlugin")
 
@@ -24,20 +24,25 @@ PluginT = t.TypeVar("PluginT", bound="HyperglassPlugin")
 class HyperglassState(StateManager):
     """Primary hyperglass state container."""
 
+    def _set_plugins(self, _type: str, plugins: t.List["HyperglassPlugin"]) -> None:
+        """Replace plugins of `_type`, and notify all processes that they've changed."""
+        self.redis.set(("plugins", _type), plugins)
+        self.redis.instance.incr(self.redis.key(("plugins", _type, "version")))
+
     def add_plugin(self, _type: str, plugin: "HyperglassPlugin") -> None:
         """Add a plugin to its list by type."""
         current = self.plugins(_type)
-        self.redis.set(("plugins", _type), list({*current, plugin}))
+        self._set_plugins(_type, list({*current, plugin}))
 
     def remove_plugin(self, _type: str, plugin: "HyperglassPlugin") -> None:
         """Remove a plugin from its list by type."""
         current = self.plugins(_type)
         plugins = {p for p in current if p != plugin}
-        self.redis.set(("plugins", _type), list(plugins))
+        self._set_plugins(_type, list(plugins))
 
     def reset_plugins(self, _type: str) -> None:
         """Remove all plugins of `_type`."""
-        self.redis.set(("plugins", _type), [])
+        self._set_plugins(_type, [])
 
     def add_directive(self, *directives: t.Union["Directive", t.Dict[str, t.Any]]) -> None:
         """Add a directive."""
@@ -45,15 +50,100 @@ class HyperglassState(StateManager):
         current.add(*directives, unique_by="id")
         self.redis.set("directives", current)
 
+    def set_generation(self, generation: t.Dict[str, str]) -> None:
+        """Replace the configuration generation hashes."""
+        name = self.redis.key("generation")
+        with self.redis.instance.pipeline() as pipeline:
+            pipeline.delete(name)
+            pipeline.hset(name, mapping=generation)
+            pipeline.execute()
+
+    def set_config(
+        self,
+        *,
+        params: "Params",
+        directives: "Directives",
+        devices: "Devices",
+        ui_params: "UIParameters",
+        generation: t.Dict[str, str],
+    ) -> int:
+        """Replace all configuration state at once, and notify all processes that it's changed.
+
+        Returns the new configuration version.
+        """
+        name = self.redis.key("generation")
+        # Redis pipelines are transactions by default, so no process sees a partial change.
+        with self.redis.instance.pipeline() as pipeline:
+            for key, value in (
+                ("params", params),
+                ("directives", directives),
+                ("devices", devices),
+                ("ui_params", ui_params),
+            ):
+                pipeline.set(self.redis.key(key), pickle.dumps(value))
+            pipeline.delete(name)
+            pipeline.hset(name, mapping=generation)
+            pipeline.incr(self.redis.key(("config", "version")))
+            *_, version = pipeline.execute()
+        return version
+
+    def _delete_namespace(self, namespace: str, *, keep: t.Collection[str] = ()) -> None:
+        keys = []
+        for key in self.redis.instance.scan_iter(match=f"{namespace}.*", count=1000):
+            if (key.decode() if isinstance(key, bytes) else key) in keep:
+                continue
+            keys.append(key)
+            if len(keys) == 1000:
+                self.redis.instance.delete(*keys)
+                keys = []
+        if keys:
+            self.redis.instance.delete(*keys)
+
     def clear(self) -> None:
-        """Delete all cache keys."""
-        self.redis.instance.flushdb(asynchronous=True)
+        """Delete all configuration state keys, leaving cached data intact.
+
+        Version counters are kept, so versions only ever increase, and no process mistakes new
+        configuration (or plugins) for a version it's already seen.
+        """
+        versions = (
+            self.redis.key(("config", "version")),
+            *(self.redis.key(("plugins", _type, "version")) for _type in ("input", "output")),
+        )
+        self._delete_namespace(self._namespace, keep=versions)
+
+    def clear_cache(self) -> None:
+        """Delete all cached query responses and external data."""
+        self._delete_namespace(self._cache_namespace)
 
     @property
     def cache(self) -> "RedisManager":
         """Get the redis manager instance."""
         return self.redis
 
+    @property
+    def external_cache(self) -> "RedisManager":
+        """Get a redis manager for data cached from external sources, such as RPKI state."""
+        return RedisManager(
+            instance=self.redis.instance, namespace=f"{self._cache_namespace}.external"
+        )
+
+    @property
+    def query_cache(self) -> "QueryCache":
+        """Get the query response cache."""
+        return QueryCache(
+            instance=self.redis.instance,
+            namespace=f"{self._cache_namespace}.query",
+            generation=self.redis.key("generation"),
+        )
+
+    @property
+    def generation(self) -> t.Dict[str, str]:
+        """Configuration generation hashes, by configuration component."""
+        return {
+            k.decode(): v.decode()
+            for k, v in self.redis.instance.hgetall(self.redis.key("generation")).items()
+        }
+
     @property
     def params(self) -> "Params":
         """Get hyperglass configuration parameters (`hyperglass.yaml`)."""
@@ -77,3 +167,11 @@ class HyperglassState(StateManager):
     def plugins(self, _type: str) -> t.List[PluginT]:
         """Get plugins by type."""
         return self.redis.get(("plugins", _type), raise_if_none=False, value_if_none=[])
+
+    def config_version(self) -> int:
+        """Get the number of times configuration state has been replaced."""
+        return int(self.redis.instance.get(self.redis.key(("config", "version"))) or 0)
+
+    def plugins_version(self, _type: str) -> int:
+        """Get the number of times plugins of `_type` have changed."""
+        return int(self.redis.instance.get(self.redis.key(("plugins", _type, "version"))) or 0)
@@ -0,0 +1,159 @@
+"""Test query cache indexing and eviction."""
+
+# Standard Library
+import typing as t
+
+# Third Party
+import pytest
+
+# Project
+from hyperglass.settings import Settings
+
+# Local
+from ..cache import QueryCache, _target_matches
+from ..hooks import use_state
+from ..store import HyperglassState
+
+TARGET_CHECKS = (
+    ("192.0.2.0/24", "192.0.2.0/23", True),
+    ("192.0.2.1", "192.0.2.0/24", True),
+    ("198.51.100.0/24", "192.0.2.0/24", False),
+    ("2001:db8::/48", "2001:db8::/32", True),
+    ("2001:db8::/48", "192.0.2.0/24", False),
+    ("65000:1", "65000", True),
+    ("65000:1", "65001", False),
+    ("_65000_", "192.0.2.0/24", False),
+)
+
+
+def _query(device: str, directive: str, target: str) -> t.Any:
+    return type(
+        "Query",
+        (),
+        {
+            "device": type("Device", (), {"id": device}),
+            "directive": type("Directive", (), {"id": directive}),
+            "query_target": target,
+            "digest": lambda self: f"{device}-{directive}-{target}",
+        },
+    )()
+
+
+@pytest.fixture
+def query_cache() -> t.Generator[QueryCache, None, None]:
+    state = use_state()
+    _cache = QueryCache(instance=state.redis.instance, namespace="hyperglass.test.query")
+    yield _cache
+    _cache.clear()
+
+
+def test_query_cache_sweep(query_cache: QueryCache):
+    expired = [_query("router1", "bgp_route", f"192.0.2.{i}") for i in range(3)]
+    keys = [query_cache.set(q, output="output", timestamp="t", timeout=60) for q in expired]
+    # Expire entries, as Redis would once their timeout elapses.
+    query_cache.instance.delete(*keys)
+    query_cache.instance.zadd(query_cache._expires, {key: 0 for key in keys})
+
+    live = _query("router2", "ping", "198.51.100.1")
+    live = query_cache.set(live, output="output", timestamp="t", timeout=60)
+
+    # Caching an entry removes expired entries from every index.
+    assert {k.decode() for k in query_cache.instance.smembers(query_cache._all)} == {live}
+    assert not query_cache.instance.exists(query_cache._device_index("router1"))
+    assert query_cache.instance.hkeys(query_cache._owners) == [live.encode()]
+    assert query_cache.instance.zrange(query_cache._hits, 0, -1) == [live.encode()]
+    assert query_cache.instance.zrange(query_cache._expires, 0, -1) == [live.encode()]
+
+
+def test_target_matches():
+    for target, search, expected in TARGET_CHECKS:
+        assert _target_matches(target, search) is expected, f"{target!r} in {search!r}"
+
+
+def test_query_cache_evict(query_cache: QueryCache):
+    queries = (
+        _query("router1", "bgp_route", "192.0.2.0/24"),
+        _query("router1", "ping", "198.51.100.1"),
+        _query("router2", "bgp_route", "192.0.2.0/25"),
+    )
+    for query in queries:
+        query_cache.set(query, output="output", timestamp="timestamp", timeout=60)
+
+    assert query_cache.get(queries[0], timeout=60) == ("output", "timestamp")
+    assert query_cache.get(_query("router3", "ping", "192.0.2.1"), timeout=60) is None
+
+    assert len(query_cache.keys()) == 3
+    assert len(query_cache.keys(device="router1")) == 2
+    assert len(query_cache.keys(directive="bgp_route")) == 2
+    assert len(query_cache.keys(device="router1", directive="bgp_route")) == 1
+    assert len(query_cache.keys(target="192.0.2.0/24")) == 2
+
+    stats = query_cache.stats()
+    assert stats["keys"] == 3
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+    assert stats["top_by_hits"][0]["key"] == query_cache.key(queries[0])
+
+    assert query_cache.evict(target="192.0.2.0/24") == 2
+    assert query_cache.keys() == [query_cache.key(queries[1])]
+    assert query_cache.keys(device="router2") == []
+
+    assert query_cache.evict(device="router1") == 1
+    assert query_cache.stats()["keys"] == 0
+
+
+def test_query_cache_expired(query_cache: QueryCache):
+    query = _query("router1", "bgp_route", "192.0.2.0/24")
+    key = query_cache.set(query, output="output", timestamp="timestamp", timeout=60)
+    query_cache.instance.delete(key)
+    assert query_cache.keys(device="router1") == []
+    assert query_cache.instance.scard(query_cache._device_index("router1")) == 0
+
+
+def test_query_cache_generation(query_cache: QueryCache):
+    generation = "hyperglass.test.generation"
+    query_cache.generation = generation
+    query = _query("router1", "bgp_route", "192.0.2.0/24")
+    other = _query("router2", "bgp_route", "192.0.2.0/24")
+    query_cache.instance.hset(
+        generation, mapping={"device:router1": "1", "device:router2": "1", "structured": "1"}
+    )
+    try:
+        query_cache.set(query, output="output", timestamp="timestamp", timeout=60)
+        query_cache.set(other, output="output", timestamp="timestamp", timeout=60)
+
+        # Changing one device's generation only invalidates that device's entries.
+        query_cache.instance.hset(generation, "device:router1", "2")
+        assert query_cache.get(query, timeout=60) is None
+        assert query_cache.get(other, timeout=60) == ("output", "timestamp")
+    finally:
+        query_cache.instance.delete(generation)
+
+
+def test_clear_preserves_cache(isolated_state: HyperglassState):
+    state = isolated_state
+    shared = HyperglassState(settings=Settings)
+    shared.redis.set("test_clear_shared", True)
+    query = _query("router1", "bgp_route", "192.0.2.0/24")
+    state.query_cache.set(query, output="output", timestamp="timestamp", timeout=60)
+    state.redis.set("test_clear", True)
+    try:
+        state.clear()
+        assert state.redis.get("test_clear") is None
+        assert shared.redis.get("test_clear_shared") is True
+        assert state.query_cache.get(query, timeout=60) == ("output", "timestamp")
+    finally:
+        shared.redis.delete("test_clear_shared")
+
+
+def test_clear_preserves_versions(isolated_state: HyperglassState):
+    state = isolated_state
+    state._set_plugins("output", [])
+    state.redis.instance.incr(state.redis.key(("config", "version")))
+    config_version, plugins_version = state.config_version(), state.plugins_version("output")
+    state.clear()
+    assert state.plugins("output") == []
+    # Versions continue from where they were, rather than starting over.
+    assert state.config_version() == config_version
+    assert state.plugins_version("output") == plugins_version
@@ -14,7 +14,7 @@ import {
 } from '~/components';
 import { useConfig } from '~/context';
 import { FormRow } from '~/elements';
-import { useDevice, useFormState, useGreeting, useStrf } from '~/hooks';
+import { useDevice, useDirectiveDetail, useFormState, useGreeting, useStrf } from '~/hooks';
 import { Directive, isQueryField, isString } from '~/types';
 import { isFQDN } from '~/util';
 
@@ -26,6 +26,7 @@ export const LookingGlassForm = (): JSX.Element => {
   const greetingReady = useGreeting(s => s.greetingReady);
 
   const getDevice = useDevice();
+  const detail = useDirectiveDetail();
   const strF = useStrf();
   const setLoading = useFormState(s => s.setLoading);
   const setStatus = useFormState(s => s.setStatus);
@@ -195,8 +196,8 @@ export const LookingGlassForm = (): JSX.Element => {
                   <DirectiveInfoModal
                     name="queryType"
                     title={directive.name ?? null}
-                    item={directive.info ?? null}
-                    visible={selections.queryType !== null && directive.info !== null}
+                    item={detail?.info ?? null}
+                    visible={selections.queryType !== null && (detail?.info ?? null) !== null}
                   />
                 )
               }
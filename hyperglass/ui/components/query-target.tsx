@@ -3,14 +3,14 @@ import { useMemo } from 'react';
 import { components } from 'react-select';
 import { Select } from '~/components';
 import { isSingleValue } from '~/components/select';
-import { useDirective, useFormState } from '~/hooks';
+import { useDirective, useDirectiveDetail, useFormState } from '~/hooks';
 import { isSelectDirective } from '~/types';
 import { UserIP } from './user-ip';
 
 import { type UseFormRegister, useForm } from 'react-hook-form';
 import type { GroupBase, OptionProps } from 'react-select';
 import type { SelectOnChange } from '~/components/select';
-import type { Directive, FormData, OnChangeArgs, SingleOption } from '~/types';
+import type { DirectiveDetail, FormData, OnChangeArgs, SingleOption } from '~/types';
 
 type OptionWithDescription = SingleOption<{ description: string | null }>;
 
@@ -21,7 +21,7 @@ interface QueryTargetProps {
   register: UseFormRegister<FormData>;
 }
 
-function buildOptions(directive: Nullable<Directive>): OptionWithDescription[] {
+function buildOptions(directive: Nullable<DirectiveDetail>): OptionWithDescription[] {
   if (directive !== null && isSelectDirective(directive)) {
     return directive.options.map(o => ({
       value: o.value,
@@ -52,9 +52,10 @@ export const QueryTarget = (props: QueryTargetProps): JSX.Element => {
   const setTarget = useFormState(s => s.setTarget);
   const queryTarget = useFormState(s => s.form.queryTarget);
   const directive = useDirective();
+  const detail = useDirectiveDetail();
 
-  const options = useMemo(() => buildOptions(directive), [directive]);
-  const isSelect = useMemo(() => directive !== null && isSelectDirective(directive), [directive]);
+  const options = useMemo(() => buildOptions(detail), [detail]);
+  const isSelect = directive !== null && directive.fieldType === 'select';
 
   function handleInputChange(e: React.ChangeEvent<HTMLInputElement>): void {
     setTarget({ display: e.target.value });
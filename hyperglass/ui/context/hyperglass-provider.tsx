@@ -1,9 +1,10 @@
 import { ChakraProvider, localStorageManager } from '@chakra-ui/react';
-import { QueryClient, QueryClientProvider } from '@tanstack/react-query';
+import { QueryClient, QueryClientProvider, useQuery } from '@tanstack/react-query';
 import { createContext, useContext, useMemo } from 'react';
-import { makeTheme } from '~/util';
+import { getHyperglassConfig, makeTheme } from '~/util';
 
 import type { Config } from '~/types';
+import type { ConfigLoadError } from '~/util';
 
 interface HyperglassProviderProps {
   config: Config;
@@ -14,17 +15,34 @@ export const HyperglassContext = createContext<Config>({} as Config);
 
 export const queryClient = new QueryClient();
 
+/**
+ * Provide the current configuration. Configuration can be reloaded while hyperglass is running, so
+ * the configuration the UI was built with is replaced by the current configuration once loaded.
+ */
+const CurrentConfig = (props: HyperglassProviderProps): JSX.Element => {
+  const { config, children } = props;
+  const { data = config } = useQuery<Config, ConfigLoadError>({
+    queryKey: ['hyperglass-ui-config'],
+    queryFn: () => getHyperglassConfig(),
+    initialData: config,
+    refetchOnWindowFocus: true,
+    refetchInterval: 60000,
+    cacheTime: Infinity,
+  });
+  return <HyperglassContext.Provider value={data}>{children}</HyperglassContext.Provider>;
+};
+
 export const HyperglassProvider = (props: HyperglassProviderProps): JSX.Element => {
   const { config, children } = props;
-  const value = useMemo(() => config, []); // eslint-disable-line react-hooks/exhaustive-deps
-  const theme = useMemo(() => makeTheme(value.web.theme, value.web.theme.defaultColorMode), []); // eslint-disable-line react-hooks/exhaustive-deps
+  // The theme is only built once; theme changes are applied when the UI is rebuilt.
+  const theme = useMemo(() => makeTheme(config.web.theme, config.web.theme.defaultColorMode), []); // eslint-disable-line react-hooks/exhaustive-deps
 
   return (
-    <HyperglassContext.Provider value={value}>
-      <ChakraProvider theme={theme} colorModeManager={localStorageManager} resetCSS>
-        <QueryClientProvider client={queryClient}>{children}</QueryClientProvider>
-      </ChakraProvider>
-    </HyperglassContext.Provider>
+    <ChakraProvider theme={theme} colorModeManager={localStorageManager} resetCSS>
+      <QueryClientProvider client={queryClient}>
+        <CurrentConfig config={config}>{children}</CurrentConfig>
+      </QueryClientProvider>
+    </ChakraProvider>
   );
 };
 
@@ -3,6 +3,7 @@ export * from './use-asn-detail';
 export * from './use-boolean-value';
 export * from './use-device';
 export * from './use-directive';
+export * from './use-directive-detail';
 export * from './use-dns-query';
 export * from './use-form-state';
 export * from './use-greeting';
@@ -4,7 +4,7 @@ import '@testing-library/jest-dom';
 import { useDevice } from './use-device';
 import { HyperglassContext } from '~/context';
 
-import type { DeviceGroup, Config } from '~/types';
+import type { DeviceGroup, Directive, Config } from '~/types';
 
 interface TestComponentProps {
   deviceId: string;
@@ -13,25 +13,37 @@ interface TestComponentProps {
 const DEVICES = [
   {
     group: 'Test Group',
-    locations: [{ id: 'test1', name: 'Test 1' }],
+    locations: [{ id: 'test1', name: 'Test 1', directives: ['test'] }],
   },
 ] as DeviceGroup[];
 
+const DIRECTIVES = [
+  { id: 'test', name: 'Test Directive', fieldType: 'text', description: '', groups: [] },
+] as Directive[];
+
 const TestComponent = (props: TestComponentProps): JSX.Element => {
   const { deviceId } = props;
   const getDevice = useDevice();
   const device = getDevice(deviceId);
 
-  return <div>{device?.name}</div>;
+  return (
+    <div>
+      <span>{device?.name}</span>
+      <span>{device?.directives.map(directive => directive.name).join(', ')}</span>
+    </div>
+  );
 };
 
 describe('useDevice Hook', () => {
   it('should get the device by ID', () => {
     const { queryByText } = render(
-      <HyperglassContext.Provider value={{ devices: DEVICES } as unknown as Config}>
+      <HyperglassContext.Provider
+        value={{ devices: DEVICES, directives: DIRECTIVES } as unknown as Config}
+      >
         <TestComponent deviceId="test1" />
       </HyperglassContext.Provider>,
     );
     expect(queryByText('Test 1')).toBeInTheDocument();
+    expect(queryByText('Test Directive')).toBeInTheDocument();
   });
 });
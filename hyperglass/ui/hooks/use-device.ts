@@ -1,7 +1,7 @@
 import { useCallback, useMemo } from 'react';
 import { useConfig } from '~/context';
 
-import type { Device } from '~/types';
+import type { Device, Directive } from '~/types';
 
 export type UseDeviceReturn = (
   /** Device's ID, e.g. the device.name field.*/
@@ -12,9 +12,20 @@ export type UseDeviceReturn = (
  * Get a device's configuration from the global configuration context based on its name.
  */
 export function useDevice(): UseDeviceReturn {
-  const { devices } = useConfig();
+  const { devices, directives } = useConfig();
 
-  const locations = useMemo<Device[]>(() => devices.flatMap(group => group.locations), [devices]);
+  // Locations reference their directives by ID, so resolve each ID to its directive.
+  const locations = useMemo<Device[]>(() => {
+    const byId = new Map(directives.map(directive => [directive.id, directive]));
+    return devices.flatMap(group =>
+      group.locations.map(location => ({
+        ...location,
+        directives: location.directives
+          .map(id => byId.get(id))
+          .filter((directive): directive is Directive => typeof directive !== 'undefined'),
+      })),
+    );
+  }, [devices, directives]);
 
   function getDevice(id: string): Nullable<Device> {
     return locations.find(device => device.id === id) ?? null;
@@ -0,0 +1,48 @@
+import { useQuery } from '@tanstack/react-query';
+import { useConfig } from '~/context';
+import { fetchWithTimeout } from '~/util';
+import { useFormState } from './use-form-state';
+
+import type { QueryFunction, QueryFunctionContext } from '@tanstack/react-query';
+import type { DirectiveDetail } from '~/types';
+
+type DirectiveDetailKey = [string];
+
+/**
+ * Get the selected directive's details (info & select options), which aren't included in the UI
+ * configuration. Details are fetched once per location, as directives are shared by all
+ * locations that use them; a directive's details are the same for each location.
+ */
+export function useDirectiveDetail(): Nullable<DirectiveDetail> {
+  const { requestTimeout } = useConfig();
+  const { queryLocation, queryType } = useFormState(({ form }) => form);
+  const [location = ''] = queryLocation;
+
+  const query: QueryFunction<DirectiveDetail[], DirectiveDetailKey> = async (
+    ctx: QueryFunctionContext<DirectiveDetailKey>,
+  ): Promise<DirectiveDetail[]> => {
+    const [url] = ctx.queryKey;
+    const res = await fetchWithTimeout(
+      url,
+      { method: 'GET', mode: 'cors' },
+      requestTimeout * 1000,
+      new AbortController(),
+    );
+    if (!res.ok) {
+      throw new Error(res.statusText);
+    }
+    return await res.json();
+  };
+
+  const { data } = useQuery<DirectiveDetail[], Error, DirectiveDetail[], DirectiveDetailKey>({
+    queryKey: [`/api/devices/${encodeURIComponent(location)}/directives`],
+    queryFn: query,
+    enabled: location !== '',
+    refetchOnWindowFocus: false,
+    refetchInterval: false,
+    refetchOnMount: false,
+    cacheTime: Infinity,
+  });
+
+  return data?.find(directive => directive.id === queryType) ?? null;
+}
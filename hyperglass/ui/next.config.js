@@ -18,6 +18,11 @@ if (process.env.NODE_ENV === 'production') {
 if (process.env.NODE_ENV === 'development') {
   nextConfig.rewrites = async () => [
     { source: '/api/query', destination: `${process.env.HYPERGLASS_URL}api/query` },
+    {
+      source: '/api/devices/:path*',
+      destination: `${process.env.HYPERGLASS_URL}api/devices/:path*`,
+    },
+    { source: '/api/ui/props', destination: `${process.env.HYPERGLASS_URL}api/ui/props` },
     { source: '/images/:image*', destination: `${process.env.HYPERGLASS_URL}images/:image*` },
   ];
 }
@@ -99,13 +99,12 @@ interface _Web {
   highlight: _Highlight[];
 }
 
-type _DirectiveBase = {
+type _Directive = {
   id: string;
   name: string;
   field_type: 'text' | 'select' | null | string;
   description: string;
   groups: string[];
-  info: string | null;
 };
 
 type _DirectiveOption = {
@@ -114,21 +113,33 @@ type _DirectiveOption = {
   description: string | null;
 };
 
-type _DirectiveSelect = _DirectiveBase & {
+/**
+ * Directive details, loaded from `/api/devices/{id}/directives` once a location is selected.
+ */
+type _DirectiveDetailBase = _Directive & {
+  info: string | null;
+};
+
+type _DirectiveSelect = _DirectiveDetailBase & {
   options: _DirectiveOption[];
 };
 
-type _Directive = _DirectiveBase | _DirectiveSelect;
+type _DirectiveDetail = _DirectiveDetailBase | _DirectiveSelect;
 
-interface _Device {
+interface _Location {
   id: string;
   name: string;
   group: string | null;
   avatar: string | null;
-  directives: _Directive[];
+  /** IDs of the location's directives, which are defined once in `directives`. */
+  directives: string[];
   description: string | null;
 }
 
+interface _Device extends Omit<_Location, 'directives'> {
+  directives: _Directive[];
+}
+
 interface _Content {
   credit: string;
   greeting: string;
@@ -143,7 +154,7 @@ type _Config = _ConfigDeep & _ConfigShallow;
 
 interface _DeviceGroup {
   group: string | null;
-  locations: _Device[];
+  locations: _Location[];
 }
 
 interface _ConfigDeep {
@@ -151,6 +162,7 @@ interface _ConfigDeep {
   web: _Web;
   messages: _Messages;
   devices: _DeviceGroup[];
+  directives: _Directive[];
   content: _Content;
 }
 
@@ -177,7 +189,9 @@ export type ThemeConfig = CamelCasedProperties<_ThemeConfig>;
 export type Content = CamelCasedProperties<_Content>;
 export type Device = CamelCasedPropertiesDeep<_Device>;
 export type DeviceGroup = CamelCasedPropertiesDeep<_DeviceGroup>;
+export type DeviceLocation = CamelCasedPropertiesDeep<_Location>;
 export type Directive = CamelCasedPropertiesDeep<_Directive>;
+export type DirectiveDetail = CamelCasedPropertiesDeep<_DirectiveDetail>;
 export type DirectiveSelect = CamelCasedPropertiesDeep<_DirectiveSelect>;
 export type DirectiveOption = CamelCasedPropertiesDeep<_DirectiveOption>;
 export type Text = CamelCasedProperties<_Text>;
@@ -39,6 +39,9 @@ export declare global {
     count: number;
     routes: Route[];
     winning_weight: 'high' | 'low';
+    total?: number;
+    offset?: number;
+    limit?: number | null;
   };
 
   type QueryResponse = {
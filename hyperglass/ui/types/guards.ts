@@ -1,5 +1,5 @@
 import type { FormData, StringTableData, StringQueryResponse } from './data';
-import type { DirectiveSelect, Directive, Link, Menu } from './config';
+import type { DirectiveSelect, DirectiveDetail, Link, Menu } from './config';
 
 export function isString(a: unknown): a is string {
   return typeof a === 'string';
@@ -35,8 +35,8 @@ export function isQueryField(field: string): field is keyof FormData {
 /**
  * Determine if a directive is a select directive.
  */
-export function isSelectDirective(directive: Directive): directive is DirectiveSelect {
-  return directive.fieldType === 'select';
+export function isSelectDirective(directive: DirectiveDetail): directive is DirectiveSelect {
+  return directive.fieldType === 'select' && 'options' in directive;
 }
 
 export function isLink(item: Link | Menu): item is Link {
@@ -4,7 +4,7 @@ import { isObject } from '~/types';
 import type { Config } from '~/types';
 
 export class ConfigLoadError extends Error {
-  public url: string = '/ui/props/';
+  public url: string = '/api/ui/props';
   public detail?: string;
   public baseMessage: string;
 
@@ -27,10 +27,10 @@ export class ConfigLoadError extends Error {
 export async function getHyperglassConfig(url?: QueryFunctionContext | string): Promise<Config> {
   let mode: RequestInit['mode'];
 
-  let fetchUrl = '/ui/props/';
+  let fetchUrl = '/api/ui/props';
 
   if (typeof url === 'string') {
-    fetchUrl = `${url.replace(/(^\/)|(\/$)/g, '')}/ui/props`;
+    fetchUrl = `${url.replace(/(^\/)|(\/$)/g, '')}/api/ui/props`;
   }
 
   if (process.env.NODE_ENV === 'production') {
@@ -17,7 +17,7 @@ from .tools import (
     run_coroutine_in_new_thread,
 )
 from .typing import is_type, is_series
-from .validation import get_driver, resolve_hostname, validate_platform
+from .validation import get_driver, resolve_hostname, resolve_hostnames, validate_platform
 from .system_info import cpu_count, check_python, get_system_info, get_node_version
 
 __all__ = (
@@ -42,6 +42,7 @@ __all__ = (
     "parse_exception",
     "repr_from_attrs",
     "resolve_hostname",
+    "resolve_hostnames",
     "run_coroutine_in_new_thread",
     "snake_to_camel",
     "split_on_uppercase",
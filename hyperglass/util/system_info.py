@@ -6,10 +6,6 @@ import sys
 import typing as t
 import platform
 
-# Third Party
-import psutil as _psutil
-from cpuinfo import get_cpu_info as _get_cpu_info  # type: ignore
-
 # Project
 from hyperglass.constants import __version__
 
@@ -18,6 +14,10 @@ SystemData = t.Dict[str, t.Tuple[t.Union[str, int], str]]
 
 def _cpu() -> SystemData:
     """Construct CPU Information."""
+    # Third Party
+    import psutil as _psutil
+    from cpuinfo import get_cpu_info as _get_cpu_info  # type: ignore
+
     cpu_info = _get_cpu_info()
     brand = cpu_info.get("brand_raw", "")
     cores_logical = _psutil.cpu_count()
@@ -29,6 +29,9 @@ def _cpu() -> SystemData:
 
 def _memory() -> SystemData:
     """Construct RAM Information."""
+    # Third Party
+    import psutil as _psutil
+
     mem_info = _psutil.virtual_memory()
     total_gb = round(mem_info.total / 1e9, 2)
     usage_percent = mem_info.percent
@@ -37,6 +40,9 @@ def _memory() -> SystemData:
 
 def _disk() -> SystemData:
     """Construct Disk Information."""
+    # Third Party
+    import psutil as _psutil
+
     disk_info = _psutil.disk_usage("/")
     total_gb = round(disk_info.total / 1e9, 2)
     usage_percent = disk_info.percent
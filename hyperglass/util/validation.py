@@ -3,9 +3,6 @@
 # Standard Library
 import typing as t
 
-# Third Party
-from netmiko.ssh_dispatcher import CLASS_MAPPER  # type: ignore
-
 # Project
 from hyperglass.constants import DRIVER_MAP
 
@@ -13,9 +10,14 @@ if t.TYPE_CHECKING:
     # Standard Library
     from ipaddress import IPv4Address, IPv6Address
 
+    # Project
+    from hyperglass.external.dns import Resolver
+
 
 def validate_platform(_type: str) -> t.Tuple[bool, t.Union[None, str]]:
     """Validate device type is supported."""
+    # Third Party
+    from netmiko.ssh_dispatcher import CLASS_MAPPER  # type: ignore
 
     all_device_types = {*DRIVER_MAP.keys(), *CLASS_MAPPER.keys()}
 
@@ -73,3 +75,29 @@ def resolve_hostname(
 
     yield ip4
     yield ip6
+
+
+async def resolve_hostnames(
+    *hostnames: str, resolver: t.Optional["Resolver"] = None
+) -> t.Dict[str, t.Optional[bool]]:
+    """Determine if each hostname is resolvable via DNS/hostfile, resolving them concurrently.
+
+    Whether a hostname is resolvable is `None` (unknown) if its lookup timed out. Results are
+    cached by the resolver, so later lookups of the same hostnames, such as when connecting to
+    devices, don't need to resolve them again.
+    """
+    # Standard Library
+    import asyncio
+
+    # Project
+    from hyperglass.log import log
+    from hyperglass.external.dns import use_resolver
+
+    resolver = resolver or use_resolver()
+    unique = tuple(dict.fromkeys(hostnames))
+    log.bind(hostnames=len(unique)).debug("Resolving hostnames")
+    results = await asyncio.gather(*(resolver.lookup(hostname) for hostname in unique))
+    return {
+        hostname: None if addresses is None else len(addresses) > 0
+        for hostname, addresses in zip(unique, results)
+    }